@@ -0,0 +1,131 @@
+# Set-based soft-delete cascades
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import inspect, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import ONETOMANY
+
+# Which children follow a parent is read from the models themselves: every
+# one-to-many relationship() whose cascade includes "delete" is an edge. A child
+# is soft-deleted through its IsDeleted flag, or IsActive for rows that are
+# deactivated rather than deleted (team memberships). Children without either
+# flag are left alone, but their own children are still followed.
+#
+# Each edge costs one UPDATE ... WHERE ParentId IN (SELECT ...) no matter how
+# many rows it touches, and the whole cascade commits once. Self-referencing
+# edges (subtasks) are walked one tree level at a time: the level's ids are read
+# and then marked, and ids already seen are skipped, so a ParentTaskId loop
+# ends instead of recursing forever.
+
+SOFT_DELETE_FLAGS = (("IsDeleted", True), ("IsActive", False))
+CASCADE_ID_CHUNK_SIZE = 1000
+
+cascadeEdgeCache: Dict[type, List[Tuple[type, object]]] = {}
+
+
+def SoftDeleteFlag(model) -> Optional[Tuple[object, bool]]:
+    """The column that marks a row of this model as deleted, and its deleted value"""
+    columns = model.__table__.c
+    for name, deletedValue in SOFT_DELETE_FLAGS:
+        if name in columns:
+            return columns[name], deletedValue
+    return None
+
+
+def CascadeEdges(model) -> List[Tuple[type, object]]:
+    """(child model, foreign key column) for every delete-cascading child relationship"""
+    if model not in cascadeEdgeCache:
+        edges = []
+        for relation in inspect(model).relationships:
+            if relation.direction is not ONETOMANY or not relation.cascade.delete or relation.secondary is not None:
+                continue
+            pairs = relation.local_remote_pairs
+            if len(pairs) != 1:
+                raise ValueError(f"{model.__name__}.{relation.key}: only single-column keys can cascade")
+            edges.append((relation.mapper.class_, pairs[0][1]))
+        cascadeEdgeCache[model] = edges
+    return cascadeEdgeCache[model]
+
+
+def PrimaryKey(model):
+    keys = inspect(model).primary_key
+    if len(keys) != 1:
+        raise ValueError(f"{model.__name__}: only single-column primary keys can cascade")
+    return keys[0]
+
+
+def Chunked(ids: List[str], size: int = CASCADE_ID_CHUNK_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def MarkDeleted(db: Session, model, condition, counts: Dict[str, int], now: datetime) -> None:
+    flag = SoftDeleteFlag(model)
+    if flag is None:
+        return
+    column, deletedValue = flag
+    values = {column.name: deletedValue}
+    if "DeletedAt" in model.__table__.c:
+        values["DeletedAt"] = now
+
+    result = db.execute(
+        update(model.__table__)
+        .where(condition, or_(column == (not deletedValue), column.is_(None)))
+        .values(**values)
+    )
+    counts[model.__tablename__] = counts.get(model.__tablename__, 0) + result.rowcount
+
+
+def CascadeChildren(db: Session, model, parentIds, counts: Dict[str, int], now: datetime,
+                    followSelf: bool = True) -> None:
+    for child, foreignKey in CascadeEdges(model):
+        if child is model:
+            if followSelf:
+                CascadeTree(db, child, foreignKey, parentIds, counts, now)
+        else:
+            condition = foreignKey.in_(parentIds)
+            MarkDeleted(db, child, condition, counts, now)
+            CascadeChildren(db, child, select(PrimaryKey(child)).where(condition), counts, now)
+
+
+def CascadeTree(db: Session, model, foreignKey, rootIds, counts: Dict[str, int], now: datetime) -> None:
+    """Follow a self-referencing edge down every level below `rootIds`"""
+    key = PrimaryKey(model)
+    seen = set(db.execute(select(key).where(key.in_(rootIds))).scalars())
+    level = list(seen)
+    while level:
+        children = []
+        for chunk in Chunked(level):
+            for childId in db.execute(select(key).where(foreignKey.in_(chunk))).scalars():
+                if childId not in seen:
+                    seen.add(childId)
+                    children.append(childId)
+        for chunk in Chunked(children):
+            MarkDeleted(db, model, key.in_(chunk), counts, now)
+            # The loop goes on to deeper levels itself
+            CascadeChildren(db, model, chunk, counts, now, followSelf=False)
+        level = children
+
+
+def SoftDeleteCascade(db: Session, model, ids: Iterable[str], commit: bool = True) -> Dict[str, int]:
+    """Soft-delete rows of `model` and everything that cascades from them in one transaction.
+
+    Returns how many rows were newly marked, per table.
+    """
+    ids = [str(rowId) for rowId in ids]
+    counts: Dict[str, int] = {}
+    if not ids:
+        return counts
+
+    now = datetime.utcnow()
+    key = PrimaryKey(model)
+    try:
+        MarkDeleted(db, model, key.in_(ids), counts, now)
+        CascadeChildren(db, model, select(key).where(key.in_(ids)), counts, now)
+        if commit:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return counts
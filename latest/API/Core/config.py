@@ -1,4 +1,5 @@
 import os
+import posixpath
 from sqlalchemy.engine.url import URL
 
 DATABASE_CONFIG_SERVER = {
@@ -11,4 +12,56 @@ DATABASE_CONFIG_SERVER = {
 }
 
 DATABASE_URL = URL.create(**DATABASE_CONFIG_SERVER)
-print(DATABASE_URL)
\ No newline at end of file
+print(DATABASE_URL)
+
+# Attachment storage
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sftp")  # "sftp" or "local"
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "uploads")
+
+SFTP_CONFIG = {
+    "hostname": os.getenv("SFTP_HOST", "clabsql.clamv.constructor.university"),
+    "port": int(os.getenv("SFTP_PORT", "22")),
+    "username": os.getenv("SFTP_USERNAME"),  # Credentials come from the environment only
+    "password": os.getenv("SFTP_PASSWORD"),
+    "remoteDir": os.getenv("SFTP_REMOTE_DIR", "/home/mabaszada/public_html"),
+}
+# Attachments get a directory of their own, next to the web root rather than inside it,
+# so files are only reachable through signed /files links; nothing else in it is swept
+SFTP_CONFIG["attachmentDir"] = os.getenv(
+    "SFTP_ATTACHMENT_DIR", posixpath.join(posixpath.dirname(SFTP_CONFIG["remoteDir"].rstrip("/")), "attachments")
+)
+SFTP_POOL_SIZE = int(os.getenv("SFTP_POOL_SIZE", "4"))
+SFTP_KEEPALIVE_SECONDS = int(os.getenv("SFTP_KEEPALIVE_SECONDS", "30"))
+
+# Async upload pipeline
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "temp_uploads")
+UPLOAD_MAX_ATTEMPTS = int(os.getenv("UPLOAD_MAX_ATTEMPTS", "5"))
+UPLOAD_RETRY_BASE_SECONDS = float(os.getenv("UPLOAD_RETRY_BASE_SECONDS", "2"))
+UPLOAD_WORKER_COUNT = int(os.getenv("UPLOAD_WORKER_COUNT", "2"))
+
+# Storage garbage collection
+ATTACHMENT_PURGE_GRACE_DAYS = int(os.getenv("ATTACHMENT_PURGE_GRACE_DAYS", "7"))  # Soft-deleted files kept this long
+STORAGE_GC_GRACE_SECONDS = int(os.getenv("STORAGE_GC_GRACE_SECONDS", str(24 * 60 * 60)))  # Unreferenced files younger than this are kept
+STORAGE_GC_BATCH_SIZE = int(os.getenv("STORAGE_GC_BATCH_SIZE", "500"))
+
+# Attachment storage quotas in bytes; 0 means unlimited
+PROJECT_STORAGE_QUOTA_BYTES = int(os.getenv("PROJECT_STORAGE_QUOTA_BYTES", "0"))
+USER_STORAGE_QUOTA_BYTES = int(os.getenv("USER_STORAGE_QUOTA_BYTES", "0"))
+
+# Signed download links, verified by the /files route without a database lookup.
+# Required: the app refuses to start without it, since a known secret lets anyone forge links
+DOWNLOAD_URL_SECRET = os.getenv("DOWNLOAD_URL_SECRET")
+DOWNLOAD_URL_TTL_SECONDS = int(os.getenv("DOWNLOAD_URL_TTL_SECONDS", "300"))
+DOWNLOAD_URL_BASE = os.getenv("DOWNLOAD_URL_BASE")  # Public origin for links; defaults to the request's
+
+# Per-project risk summaries are cached in each worker and dropped on risk writes
+RISK_SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("RISK_SUMMARY_CACHE_TTL_SECONDS", "300"))
+
+# Monte Carlo cost exposure simulation, run in a separate process pool
+RISK_SIMULATION_SCENARIOS = int(os.getenv("RISK_SIMULATION_SCENARIOS", "100000"))
+RISK_SIMULATION_MAX_SCENARIOS = int(os.getenv("RISK_SIMULATION_MAX_SCENARIOS", "1000000"))
+RISK_SIMULATION_WORKERS = int(os.getenv("RISK_SIMULATION_WORKERS", "2"))
+
+# Resource utilization matrix
+RESOURCE_UTILIZATION_BUCKET_DAYS = int(os.getenv("RESOURCE_UTILIZATION_BUCKET_DAYS", "7"))
+RESOURCE_UTILIZATION_MAX_BUCKETS = int(os.getenv("RESOURCE_UTILIZATION_MAX_BUCKETS", "520"))
@@ -0,0 +1,63 @@
+# Signed, expiring download links
+import base64
+import hashlib
+import hmac
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import quote, urlencode
+
+from fastapi import HTTPException, status
+
+from Core.config import DOWNLOAD_URL_SECRET, DOWNLOAD_URL_TTL_SECONDS
+
+# A link names the stored file and carries its download name, type and expiry,
+# signed with HMAC-SHA256. The /files route (or a proxy holding the same
+# secret) checks the signature and the clock only; it never reads the database.
+# Links cannot be revoked before they expire, so the TTL is kept short.
+
+
+def SignDownload(fileKey: str, expires: int, fileName: str, fileType: Optional[str],
+                 secret: str = DOWNLOAD_URL_SECRET) -> str:
+    if not secret:
+        raise RuntimeError("DOWNLOAD_URL_SECRET is not set")
+    message = "\n".join([fileKey, str(expires), fileName, fileType or ""])
+    digest = hmac.new(secret.encode(), message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def CreateDownloadLink(
+    baseUrl: str,
+    fileKey: str,
+    fileName: str,
+    fileType: Optional[str],
+    ttlSeconds: int = DOWNLOAD_URL_TTL_SECONDS,
+    secret: str = DOWNLOAD_URL_SECRET,
+    now: Optional[float] = None
+) -> Dict:
+    """Signed URL for /files/{fileKey} that stops working after ttlSeconds"""
+    expires = int(now or time.time()) + ttlSeconds
+    params = {
+        "expires": expires,
+        "name": fileName,
+        "type": fileType or "",
+        "sig": SignDownload(fileKey, expires, fileName, fileType, secret),
+    }
+    url = f"{baseUrl.rstrip('/')}/files/{quote(fileKey)}?{urlencode(params)}"
+    return {"download_url": url, "expires_at": datetime.utcfromtimestamp(expires)}
+
+
+def VerifyDownloadLink(
+    fileKey: str,
+    expires: int,
+    fileName: str,
+    fileType: Optional[str],
+    signature: str,
+    secret: str = DOWNLOAD_URL_SECRET,
+    now: Optional[float] = None
+) -> None:
+    expected = SignDownload(fileKey, expires, fileName, fileType, secret)
+    if not hmac.compare_digest(expected, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid download link.")
+    if expires < (now or time.time()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Download link expired.")
@@ -0,0 +1,418 @@
+# Attachment storage backends
+import errno
+import logging
+import os
+import posixpath
+import queue
+import re
+import shutil
+import stat
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import BinaryIO, Dict, Iterator, Optional
+
+import paramiko
+
+from Core.config import (
+    STORAGE_BACKEND, LOCAL_STORAGE_DIR, SFTP_CONFIG, SFTP_POOL_SIZE, SFTP_KEEPALIVE_SECONDS, UPLOAD_SPOOL_DIR
+)
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class StorageBackend(ABC):
+    """Where attachment bytes live. Save streams `stream` under `fileName`
+    and returns the stored path."""
+
+    name = "base"
+
+    @abstractmethod
+    def Save(self, stream: BinaryIO, fileName: str) -> str:
+        ...
+
+    @abstractmethod
+    def PathFor(self, fileName: str) -> str:
+        """Where Save puts a file of this name"""
+
+    @abstractmethod
+    def Stream(self, path: str) -> Iterator[bytes]:
+        """Open a stored file and return an iterator over its bytes.
+        Raises FileNotFoundError up front if the file is missing."""
+
+    @abstractmethod
+    def Delete(self, path: str) -> None:
+        ...
+
+    @abstractmethod
+    def ListFiles(self) -> Iterator[Dict]:
+        """Yield Path, Size and ModifiedAt (epoch seconds) of every stored file"""
+
+    def MoveFromLegacy(self, fileName: str) -> bool:
+        """Move a file saved before attachments had their own directory; True if moved"""
+        return False
+
+    def Close(self) -> None:
+        pass
+
+
+class LocalStorageBackend(StorageBackend):
+    """Stores files in a local directory; used for tests and development"""
+
+    name = "local"
+
+    def __init__(self, rootDir: str = LOCAL_STORAGE_DIR):
+        self.rootDir = rootDir
+        os.makedirs(rootDir, exist_ok=True)
+
+    def PathFor(self, fileName: str) -> str:
+        return os.path.join(self.rootDir, os.path.basename(fileName))
+
+    def Save(self, stream: BinaryIO, fileName: str) -> str:
+        path = self.PathFor(fileName)
+        tempPath = path + ".part"
+        try:
+            with open(tempPath, "wb") as target:
+                shutil.copyfileobj(stream, target, COPY_CHUNK_SIZE)
+            os.replace(tempPath, path)
+        except BaseException:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            raise
+        return path
+
+    def Stream(self, path: str) -> Iterator[bytes]:
+        source = open(path, "rb")
+
+        def Chunks():
+            with source:
+                while True:
+                    chunk = source.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        return Chunks()
+
+    def Delete(self, path: str) -> None:
+        if os.path.exists(path):
+            os.remove(path)
+
+    def ListFiles(self) -> Iterator[Dict]:
+        with os.scandir(self.rootDir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    info = entry.stat()
+                    yield {"Path": entry.path, "Size": info.st_size, "ModifiedAt": info.st_mtime}
+
+
+class SftpStorageBackend(StorageBackend):
+    """Stores files on the SFTP server over a small pool of persistent sessions.
+
+    Opening a Transport costs a TCP connect, SSH handshake and authentication,
+    so sessions are kept open with keepalives and reused across uploads.
+    A session that has dropped is replaced on checkout.
+    """
+
+    name = "sftp"
+
+    def __init__(self, config: Dict = SFTP_CONFIG, poolSize: int = SFTP_POOL_SIZE):
+        self.config = config
+        self.remoteDir = config["remoteDir"]
+        self.attachmentDir = config["attachmentDir"]
+        self.attachmentDirReady = False
+        self.pool: "queue.LifoQueue[Optional[paramiko.SFTPClient]]" = queue.LifoQueue(maxsize=poolSize)
+        # Slots start empty and are connected lazily on first use
+        for _ in range(poolSize):
+            self.pool.put(None)
+
+    def Connect(self) -> paramiko.SFTPClient:
+        if not self.config.get("username") or not self.config.get("password"):
+            raise RuntimeError("SFTP_USERNAME and SFTP_PASSWORD must be set for the sftp storage backend")
+        transport = paramiko.Transport((self.config["hostname"], self.config["port"]))
+        transport.set_keepalive(SFTP_KEEPALIVE_SECONDS)
+        transport.connect(username=self.config["username"], password=self.config["password"])
+        return paramiko.SFTPClient.from_transport(transport)
+
+    def Checkout(self) -> paramiko.SFTPClient:
+        client = self.pool.get()
+        if client is None or not client.get_channel().get_transport().is_active():
+            if client is not None:
+                self.Discard(client)
+            try:
+                client = self.Connect()
+            except BaseException:
+                self.pool.put(None)
+                raise
+        return client
+
+    def Checkin(self, client: Optional[paramiko.SFTPClient]) -> None:
+        self.pool.put(client)
+
+    def Discard(self, client: paramiko.SFTPClient) -> None:
+        try:
+            transport = client.get_channel().get_transport()
+            client.close()
+            transport.close()
+        except Exception:
+            pass
+
+    def PathFor(self, fileName: str) -> str:
+        return posixpath.join(self.attachmentDir, os.path.basename(fileName))
+
+    def LegacyPathFor(self, fileName: str) -> str:
+        """Where files uploaded before attachments had their own directory live"""
+        return posixpath.join(self.remoteDir, os.path.basename(fileName))
+
+    def EnsureAttachmentDir(self, client: paramiko.SFTPClient) -> None:
+        if self.attachmentDirReady:
+            return
+        try:
+            client.stat(self.attachmentDir)
+        except IOError:
+            client.mkdir(self.attachmentDir)
+        self.attachmentDirReady = True
+
+    def MoveFromLegacy(self, fileName: str) -> bool:
+        legacyPath = self.LegacyPathFor(fileName)
+        targetPath = self.PathFor(fileName)
+        client = self.Checkout()
+        try:
+            self.EnsureAttachmentDir(client)
+            try:
+                client.stat(legacyPath)
+            except IOError:
+                return False
+            try:
+                client.stat(targetPath)
+                # Already copied over; the web-root copy must not stay public
+                client.remove(legacyPath)
+            except IOError:
+                client.rename(legacyPath, targetPath)
+            return True
+        except (paramiko.SSHException, EOFError):
+            self.Discard(client)
+            client = None
+            raise
+        finally:
+            self.Checkin(client)
+
+    def Save(self, stream: BinaryIO, fileName: str) -> str:
+        remotePath = self.PathFor(fileName)
+        client = self.Checkout()
+        try:
+            self.EnsureAttachmentDir(client)
+            # putfo streams from the file object in chunks; nothing is buffered whole
+            client.putfo(stream, remotePath, confirm=True)
+        except (paramiko.SSHException, EOFError, OSError):
+            # The session may be broken; drop it so the slot reconnects next time
+            self.Discard(client)
+            client = None
+            raise
+        finally:
+            self.Checkin(client)
+        return remotePath
+
+    def Stream(self, path: str) -> Iterator[bytes]:
+        client = self.Checkout()
+        try:
+            try:
+                source = client.open(path, "rb")
+            except IOError:
+                legacyPath = self.LegacyPathFor(path)
+                if posixpath.dirname(path) != self.attachmentDir or legacyPath == path:
+                    raise
+                source = client.open(legacyPath, "rb")
+            source.prefetch()
+        except IOError as e:
+            self.Checkin(client)
+            raise FileNotFoundError(path) from e
+        except (paramiko.SSHException, EOFError):
+            self.Discard(client)
+            self.Checkin(None)
+            raise
+
+        def Chunks():
+            # The session stays checked out until the download finishes or is abandoned
+            healthy = True
+            try:
+                while True:
+                    chunk = source.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+            except (paramiko.SSHException, EOFError, OSError):
+                healthy = False
+                raise
+            finally:
+                try:
+                    source.close()
+                except Exception:
+                    healthy = False
+                if healthy:
+                    self.Checkin(client)
+                else:
+                    self.Discard(client)
+                    self.Checkin(None)
+
+        return Chunks()
+
+    def Delete(self, path: str) -> None:
+        client = self.Checkout()
+        try:
+            client.remove(path)
+        except IOError:
+            pass
+        finally:
+            self.Checkin(client)
+
+    def ListFiles(self) -> Iterator[Dict]:
+        client = self.Checkout()
+        try:
+            # listdir_attr fetches names and attributes in one round trip per batch
+            entries = client.listdir_attr(self.attachmentDir)
+        except IOError as e:
+            if e.errno == errno.ENOENT:
+                # Nothing has been uploaded into the attachment directory yet
+                return
+            self.Discard(client)
+            client = None
+            raise
+        except (paramiko.SSHException, EOFError):
+            self.Discard(client)
+            client = None
+            raise
+        finally:
+            self.Checkin(client)
+        for entry in entries:
+            if stat.S_ISREG(entry.st_mode or 0):
+                yield {
+                    "Path": self.PathFor(entry.filename),
+                    "Size": entry.st_size or 0,
+                    "ModifiedAt": entry.st_mtime or 0,
+                }
+
+    def Close(self) -> None:
+        while not self.pool.empty():
+            client = self.pool.get_nowait()
+            if client is not None:
+                self.Discard(client)
+
+
+class UploadMetrics:
+    """Keeps timings of recent uploads for monitoring"""
+
+    def __init__(self, maxEntries: int = 500):
+        self.entries = deque(maxlen=maxEntries)
+        self.lock = threading.Lock()
+
+    def Record(self, backend: str, fileName: str, sizeBytes: int, seconds: float, succeeded: bool) -> None:
+        entry = {
+            "Backend": backend,
+            "FileName": fileName,
+            "SizeBytes": sizeBytes,
+            "Seconds": round(seconds, 4),
+            "Succeeded": succeeded,
+            "RecordedAt": time.time(),
+        }
+        with self.lock:
+            self.entries.append(entry)
+        logger.debug("Upload to %s of %s: %d bytes in %.3fs, succeeded=%s", backend, fileName, sizeBytes, seconds, succeeded)
+
+    def Summary(self) -> Dict:
+        with self.lock:
+            entries = list(self.entries)
+        succeeded = [entry for entry in entries if entry["Succeeded"]]
+        durations = sorted(entry["Seconds"] for entry in succeeded)
+        totalBytes = sum(entry["SizeBytes"] for entry in succeeded)
+        totalSeconds = sum(durations)
+        return {
+            "Uploads": len(entries),
+            "Failures": len(entries) - len(succeeded),
+            "AvgSeconds": round(totalSeconds / len(durations), 4) if durations else 0.0,
+            "P95Seconds": durations[int(0.95 * (len(durations) - 1))] if durations else 0.0,
+            "AvgMegabytesPerSecond": round(totalBytes / totalSeconds / (1024 * 1024), 3) if totalSeconds else 0.0,
+            "Recent": entries[-20:],
+        }
+
+
+class CountingReader:
+    """Wraps a file object and counts the bytes read through it"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.bytesRead = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.bytesRead += len(chunk)
+        return chunk
+
+
+def SaveWithMetrics(backend: StorageBackend, stream: BinaryIO, fileName: str) -> Dict:
+    """Save through a backend, recording how long it took. Returns path and size."""
+    reader = CountingReader(stream)
+    started = time.perf_counter()
+    try:
+        path = backend.Save(reader, fileName)
+    except Exception:
+        uploadMetrics.Record(backend.name, fileName, reader.bytesRead, time.perf_counter() - started, False)
+        raise
+    uploadMetrics.Record(backend.name, fileName, reader.bytesRead, time.perf_counter() - started, True)
+    return {"Path": path, "Size": reader.bytesRead}
+
+
+def PublicPath(path: str) -> str:
+    """The form of a stored path kept in Attachment.FilePath"""
+    return path.replace("/home/mabaszada/", "/")
+
+
+def AttachmentStorageKey(attachmentId: str, fileName: Optional[str]) -> str:
+    """Name an attachment is stored under: its Id, so uploads with the same
+    name never overwrite each other, plus the extension of the uploaded name"""
+    extension = os.path.splitext(fileName or "")[1].lower()
+    if not re.fullmatch(r"\.[a-z0-9]{1,10}", extension):
+        extension = ""
+    return attachmentId + extension
+
+
+def StorageKey(filePath: Optional[str]) -> Optional[str]:
+    """Name a stored file goes by in the backend; None for links to files stored elsewhere"""
+    if not filePath or filePath.startswith(("http://", "https://")):
+        return None
+    return os.path.basename(filePath) or None
+
+
+def SpoolPath(attachmentId: str, spoolDir: str = UPLOAD_SPOOL_DIR) -> str:
+    return os.path.join(spoolDir, attachmentId)
+
+
+def SpoolUpload(stream: BinaryIO, attachmentId: str, spoolDir: str = UPLOAD_SPOOL_DIR) -> int:
+    """Write the upload to the local spool in chunks; returns its size"""
+    os.makedirs(spoolDir, exist_ok=True)
+    path = SpoolPath(attachmentId, spoolDir)
+    tempPath = path + ".part"
+    try:
+        with open(tempPath, "wb") as target:
+            shutil.copyfileobj(stream, target, COPY_CHUNK_SIZE)
+        os.replace(tempPath, path)
+    except BaseException:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
+    return os.path.getsize(path)
+
+
+def CreateStorageBackend(kind: str = STORAGE_BACKEND) -> StorageBackend:
+    if kind == "local":
+        return LocalStorageBackend()
+    if kind == "sftp":
+        return SftpStorageBackend()
+    raise ValueError(f"Unknown storage backend '{kind}'")
+
+
+uploadMetrics = UploadMetrics()
+storageBackend = CreateStorageBackend()
@@ -0,0 +1,62 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from Db.session import Base
+from Models.Attachment import AttachmentUploadStatus
+
+# Columns added to tables that already existed before them. create_all only
+# creates missing tables, so these are added here on startup. Each column is
+# built from its model definition, so type and default match a fresh table.
+ADDED_COLUMNS = [
+    ("Attachment", "UploadStatus"),
+    ("Attachment", "UploadAttempts"),
+    ("Attachment", "UploadError"),
+    ("Attachment", "DeletedAt"),
+]
+
+# Values for rows that existed before the column did
+BACKFILLS = {
+    ("Attachment", "UploadStatus"): AttachmentUploadStatus.AVAILABLE.name,
+    ("Attachment", "UploadAttempts"): 0,
+}
+
+
+def AddColumnSql(engine: Engine, tableName: str, columnName: str) -> str:
+    column = Base.metadata.tables[tableName].c[columnName]
+    preparer = engine.dialect.identifier_preparer
+    sql = (
+        f"ALTER TABLE {preparer.quote(tableName)} ADD COLUMN {preparer.quote(columnName)} "
+        f"{column.type.compile(dialect=engine.dialect)}"
+    )
+    if column.server_default is not None:
+        sql += f" DEFAULT '{column.server_default.arg}'"
+    if not column.nullable:
+        sql += " NOT NULL"
+    return sql
+
+
+def UpgradeSchema(engine: Engine) -> list:
+    """Add any missing columns to existing tables; safe to run on every start.
+    Returns the columns that were added."""
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as connection:
+        for tableName, columnName in ADDED_COLUMNS:
+            if not inspector.has_table(tableName):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(tableName)}
+            if columnName in existing:
+                continue
+            connection.execute(text(AddColumnSql(engine, tableName, columnName)))
+            added.append(f"{tableName}.{columnName}")
+
+        preparer = engine.dialect.identifier_preparer
+        for (tableName, columnName), value in BACKFILLS.items():
+            if not inspector.has_table(tableName):
+                continue
+            column = preparer.quote(columnName)
+            connection.execute(
+                text(f"UPDATE {preparer.quote(tableName)} SET {column} = :value WHERE {column} IS NULL"),
+                {"value": value}
+            )
+    return added
@@ -13,6 +13,11 @@ class AttachmentEntityType(str, enum.Enum):
     SCHEDULE = "Schedule"
     COST = "Cost"
 
+class AttachmentUploadStatus(str, enum.Enum):
+    PENDING = "Pending"      # Bytes accepted locally, waiting to be pushed to storage
+    AVAILABLE = "Available"
+    FAILED = "Failed"
+
 class Attachment(Base):
     __tablename__ = "Attachment"
 
@@ -26,7 +31,16 @@ class Attachment(Base):
     FilePath = Column(String(500), nullable=False)
     OwnerId = Column(String(36), ForeignKey("User.Id"), nullable=False)
     IsDeleted = Column(Boolean, default=False)
+    DeletedAt = Column(DateTime)  # Stored file is purged once this is older than the grace period
     UploadedAt = Column(DateTime, default=datetime.utcnow)
+    UploadStatus = Column(
+        SqlEnum(AttachmentUploadStatus),
+        nullable=False,
+        default=AttachmentUploadStatus.AVAILABLE,
+        server_default=AttachmentUploadStatus.AVAILABLE.name
+    )
+    UploadAttempts = Column(Integer, default=0)
+    UploadError = Column(String(500))
 
 
     Project = relationship("Project", back_populates="Attachments")
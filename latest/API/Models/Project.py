@@ -33,6 +33,7 @@ class Project(Base):
     Attachments = relationship("Attachment", back_populates="Project")
     Resources = relationship("Resource", back_populates="Project", cascade="all, delete-orphan")
     ResourcePlans = relationship("ResourcePlan", back_populates="Project", cascade="all, delete-orphan")
+    Risks = relationship("Risk", cascade="all, delete-orphan")
 
     # Predefined status values
     STATUS_NOT_STARTED = "Not Started"
@@ -4,6 +4,7 @@ from .Team import *
 from .Task import *
 from .TeamMember import *
 from .Attachment import *
+from .StorageUsage import *
 from .Notification import *
 from .ProjectStakeholder import *
 from .ProjectScope import *
@@ -17,6 +18,7 @@ __all__ = [
     'Team',
     'Task',
     'Attachment',
+    'StorageUsage',
     'Notification',
     'ProjectStakeholder',
     'ProjectScope',
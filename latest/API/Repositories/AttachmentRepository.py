@@ -1,11 +1,16 @@
 from sqlalchemy.orm import Session
 from fastapi import UploadFile
 
-from Models.Attachment import Attachment, AttachmentEntityType
+from Models.Attachment import Attachment, AttachmentEntityType, AttachmentUploadStatus
 from Schemas.AttachmentSchema import AttachmentCreateSchema
 from typing import List, Optional
-import paramiko
+from datetime import datetime
 import os
+import uuid
+
+from Core.storage import SpoolUpload, SpoolPath
+from Core.signing import CreateDownloadLink
+from Repositories.StorageUsageRepository import ChargeUsage, ReleaseUsage
 
 
 def AddAttachment(db: Session, attachmentData: AttachmentCreateSchema) -> Attachment:
@@ -19,8 +24,14 @@ def AddAttachment(db: Session, attachmentData: AttachmentCreateSchema) -> Attach
         OwnerId=attachmentData.OwnerId,
         ProjectId=attachmentData.ProjectId  # ✅ Include this field
     )
-    db.add(newAttachment)
-    db.commit()
+    try:
+        db.add(newAttachment)
+        # Charged like an upload, so deleting it later releases only what was added
+        ChargeUsage(db, attachmentData.ProjectId, attachmentData.OwnerId, attachmentData.FileSize or 0)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     db.refresh(newAttachment)
     return newAttachment
 
@@ -30,7 +41,10 @@ def SoftDeleteAttachment(db: Session, attachmentId: str) -> bool:
     if not attachment:
         return False
 
+    if not attachment.IsDeleted and attachment.UploadStatus != AttachmentUploadStatus.FAILED:
+        ReleaseUsage(db, attachment.ProjectId, attachment.OwnerId, attachment.FileSize or 0)
     attachment.IsDeleted = True
+    attachment.DeletedAt = datetime.utcnow()
     db.commit()
     return True
 
@@ -58,27 +72,6 @@ def GetAttachmentsByEntityType(db: Session, projectId: str, entityType: Attachme
         Attachment.IsDeleted == False
     ).all()
 
-def UploadToUniServer(localFilePath: str, remoteFileName: str):
-    hostname = "clabsql.clamv.constructor.university"
-    username = "mabaszada"
-    remoteDir = "/home/mabaszada/public_html"
-    
-    # Optional: use SSH key or password
-    password = "YU3TIV" 
-
-    transport = paramiko.Transport((hostname, 22))
-    transport.connect(username=username, password=password)
-
-    sftp = paramiko.SFTPClient.from_transport(transport)
-    remotePath = os.path.join(remoteDir, remoteFileName)
-    
-    sftp.put(localFilePath, remotePath)
-    
-    sftp.close()
-    transport.close()
-
-    return remotePath  
-
 def FileUpload(
     db: Session,
     file: UploadFile,
@@ -87,39 +80,44 @@ def FileUpload(
     projectId: str,
     currentUser: str
 ):
-    tempLocalPath = os.path.join("temp_uploads", file.filename)
-    os.makedirs("temp_uploads", exist_ok=True)
-
-    with open(tempLocalPath, "wb") as buffer:
-        buffer.write(file.file.read())
-
-    # Upload remotely
-    remotePath = UploadToUniServer(tempLocalPath, file.filename)
-
-    fileSize = os.path.getsize(tempLocalPath)
-    os.remove(tempLocalPath)
+    # Accept the bytes locally; the upload worker pushes them to storage later
+    attachmentId = str(uuid.uuid4())
+    fileSize = SpoolUpload(file.file, attachmentId)
 
     attachmentData = Attachment(
+        Id=attachmentId,
         FileName=file.filename,
         FileType=file.content_type,
         FileSize=fileSize,
-        FilePath=remotePath.replace("/home/mabaszada/", "/"),
+        FilePath=SpoolPath(attachmentId),
         EntityType=entityType,
         EntityId=entityId,
         OwnerId=currentUser,
-        ProjectId=projectId
+        ProjectId=projectId,
+        UploadStatus=AttachmentUploadStatus.PENDING,
+        UploadAttempts=0
     )
 
-    db.add(attachmentData)
-    db.commit()
+    try:
+        db.add(attachmentData)
+        # Raises 413 when the upload does not fit; rolled back below
+        ChargeUsage(db, projectId, currentUser, fileSize)
+        db.commit()
+    except Exception:
+        db.rollback()
+        os.remove(SpoolPath(attachmentId))
+        raise
     db.refresh(attachmentData)
     return attachmentData
 
-def DownloadAttachment(attachment: Attachment) -> dict:
+def DownloadAttachment(attachment: Attachment, baseUrl: str) -> dict:
     if attachment.FilePath.startswith("http://") or attachment.FilePath.startswith("https://"):
-        baseUrl = attachment.FilePath
-        return f"{baseUrl}"
-    else:
-        baseUrl = f"http://clabsql.clamv.constructor.university/~mabaszada/"
-        fileName = os.path.basename(attachment.FilePath)
-        return f"{baseUrl}/{fileName}"
+        return {"download_url": attachment.FilePath, "expires_at": None}
+
+    # Short-lived signed link served by the /files route
+    return CreateDownloadLink(
+        baseUrl,
+        os.path.basename(attachment.FilePath),
+        attachment.FileName,
+        attachment.FileType
+    )
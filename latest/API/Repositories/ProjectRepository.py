@@ -2,6 +2,7 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from Core.cascade import SoftDeleteCascade
 from Schemas.ProjectSchema import ProjectCreate
 from Models import Project, User, Team, TeamMember, ProjectStakeholder, ProjectScope
 from Models.ProjectMember import ProjectMember
@@ -55,49 +56,9 @@ def AddMemberToProject(db: Session, projectId: UUID, memberId: UUID):
     return member
 
 def SoftDeleteProject(db: Session, projectId: UUID, userId: UUID):
-    # Step 1: Soft delete the project itself
-    db.query(Project).filter(Project.Id == str(projectId)).update(
-        {"IsDeleted": True}, synchronize_session=False
-    )
-
-    # Step 2: Soft delete project members
-    db.query(ProjectMember).filter(
-        ProjectMember.ProjectId == str(projectId)
-    ).update({"IsDeleted": True}, synchronize_session=False)
-
-    # Step 3: Get all team IDs for this project
-    team_ids = db.query(Team.Id).filter(
-        Team.ProjectId == str(projectId)
-    ).all()
-    team_ids = [tid[0] for tid in team_ids]
-
-    # Step 4: Soft delete teams
-    db.query(Team).filter(
-        Team.ProjectId == str(projectId)
-    ).update({"IsDeleted": True}, synchronize_session=False)
-
-    # Step 5: Soft delete team members
-    if team_ids:
-        db.query(TeamMember).filter(
-            TeamMember.TeamId.in_(team_ids)
-        ).update({"IsActive": False}, synchronize_session=False)
-
-    # Step 6: Soft delete tasks under this project
-    db.query(Task).filter(
-        Task.ProjectId == str(projectId)
-    ).update({"IsDeleted": True}, synchronize_session=False)
-
-    # Step 7: Soft delete stakeholders
-    db.query(ProjectStakeholder).filter(
-        ProjectStakeholder.ProjectId == str(projectId)
-    ).update({"IsDeleted": True}, synchronize_session=False)
-
-    # Step 8: Soft delete scope
-    db.query(ProjectScope).filter(
-        ProjectScope.ProjectId == str(projectId)
-    ).update({"IsDeleted": True}, synchronize_session=False)
-
-    db.commit()
+    # Tasks, teams and their memberships, members, resources, plans and risks
+    # follow the project through the relationship cascades on the models
+    SoftDeleteCascade(db, Project, [str(projectId)])
     return {"message": "Project and all related data soft-deleted successfully"}
 
 def SoftDeleteProjectMember(db: Session, projectId: UUID, memberId: UUID):
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
+from Core.cascade import SoftDeleteCascade
 from Models.Resource import Resource
 from Models.ActivityResource import ActivityResource
 from Models.ResourcePlan import ResourcePlan
+from Models.Task import Task
 from Schemas.ResourceSchema import (
     ResourceBase, ResourceUpdate,
     ActivityResourceBase, ActivityResourceUpdate,
@@ -46,14 +48,8 @@ def SoftDeleteResource(db: Session, resourceId: str):
     if not resource:
         return None
 
-    resource.IsDeleted = True
-    db.commit()
-
-    # Cascade soft delete ActivityResources
-    activities = db.query(ActivityResource).filter(ActivityResource.ResourceId == resourceId, ActivityResource.IsDeleted == False).all()
-    for activity in activities:
-        activity.IsDeleted = True
-    db.commit()
+    # Also soft deletes the resource's activity assignments
+    SoftDeleteCascade(db, Resource, [resourceId])
 
     return resource
 
@@ -111,6 +107,28 @@ def GetActivityResourceById(db: Session, assignmentId: str):
 def GetAllActivityResourcesByTaskId(db: Session, activityId: str):
     return db.query(ActivityResource).filter(ActivityResource.TaskId == activityId, ActivityResource.IsDeleted == False).all()
 
+def GetProjectAssignmentWindows(db: Session, projectId: str):
+    """Every live assignment of an open task in the project, with the task's dates"""
+    return db.query(
+        ActivityResource.ResourceId,
+        ActivityResource.Quantity,
+        Task.Id.label("TaskId"),
+        Task.Title,
+        Task.Priority,
+        Task.CreatedAt,
+        Task.Deadline
+    ).join(
+        Task, Task.Id == ActivityResource.TaskId
+    ).join(
+        Resource, Resource.Id == ActivityResource.ResourceId
+    ).filter(
+        Task.ProjectId == projectId,
+        Task.IsDeleted == False,
+        Task.Completed.isnot(True),
+        ActivityResource.IsDeleted == False,
+        Resource.IsDeleted == False
+    ).all()
+
 # -----------------------------
 # ResourcePlan CRUD
 
@@ -1,3 +1,4 @@
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 from Models.Risk import Risk
 from Models.RiskAnalysis import RiskAnalysis
@@ -57,6 +58,52 @@ def GetRiskById(db: Session, riskId: str):
 def GetAllRisks(db: Session, projectId: str):
     return db.query(Risk).filter(Risk.ProjectId == projectId, Risk.IsDeleted == False).all()
 
+# The heatmap is a 5x5 grid: Probability (0-1) and Impact (1-10) each fall into five bands
+HEATMAP_BANDS = 5
+
+def ProbabilityBand():
+    step = 1.0 / HEATMAP_BANDS
+    return case(
+        *[(Risk.Probability < step * band, band) for band in range(1, HEATMAP_BANDS)],
+        else_=HEATMAP_BANDS
+    )
+
+def ImpactBand():
+    impact = func.coalesce(Risk.Impact, 1)
+    return case(
+        *[(impact <= band * 10 // HEATMAP_BANDS, band) for band in range(1, HEATMAP_BANDS)],
+        else_=HEATMAP_BANDS
+    )
+
+def GetRiskSummary(db: Session, projectId: str):
+    liveRisks = (Risk.ProjectId == projectId, Risk.IsDeleted == False)
+
+    probabilityBand = ProbabilityBand().label("ProbabilityBand")
+    impactBand = ImpactBand().label("ImpactBand")
+    heatmap = db.query(
+        probabilityBand, impactBand, func.count(Risk.Id), func.coalesce(func.sum(Risk.Severity), 0)
+    ).filter(*liveRisks).group_by(probabilityBand, impactBand).all()
+
+    byCategory = db.query(Risk.Category, func.count(Risk.Id)).filter(*liveRisks).group_by(Risk.Category).all()
+    byStatus = db.query(Risk.Status, func.count(Risk.Id)).filter(*liveRisks).group_by(Risk.Status).all()
+
+    expectedValue, analysisCount = db.query(
+        func.coalesce(func.sum(RiskAnalysis.ExpectedValue), 0), func.count(RiskAnalysis.Id)
+    ).join(Risk, Risk.Id == RiskAnalysis.RiskId).filter(*liveRisks, RiskAnalysis.IsDeleted == False).one()
+
+    return {
+        "ProjectId": projectId,
+        "TotalRisks": sum(count for _, count in byCategory),
+        "Heatmap": [
+            {"ProbabilityBand": pBand, "ImpactBand": iBand, "Count": count, "TotalSeverity": float(severity)}
+            for pBand, iBand, count, severity in heatmap
+        ],
+        "ByCategory": {category: count for category, count in byCategory},
+        "ByStatus": {riskStatus or "Unknown": count for riskStatus, count in byStatus},
+        "TotalExpectedValue": float(expectedValue),
+        "AnalysisCount": analysisCount,
+    }
+
 
 # -----------------------------
 # RiskAnalysis CRUD
@@ -0,0 +1,145 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from Core.config import PROJECT_STORAGE_QUOTA_BYTES, USER_STORAGE_QUOTA_BYTES
+from Models.Attachment import Attachment, AttachmentUploadStatus
+from Models.StorageUsage import StorageUsage
+
+# Usage is kept as running totals so reading it is a primary-key lookup.
+# Attachments are charged when they are accepted and released when they are
+# soft-deleted or their upload fails for good.
+PROJECT_SCOPE = "Project"
+USER_SCOPE = "User"
+
+
+def QuotaFor(scopeType: str) -> int:
+    return PROJECT_STORAGE_QUOTA_BYTES if scopeType == PROJECT_SCOPE else USER_STORAGE_QUOTA_BYTES
+
+
+def Scopes(projectId: Optional[str], userId: Optional[str]) -> List[Tuple[str, str]]:
+    scopes = []
+    if projectId:
+        scopes.append((PROJECT_SCOPE, projectId))
+    if userId:
+        scopes.append((USER_SCOPE, userId))
+    return scopes
+
+
+def QuotaExceeded(scopeType: str, quota: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"{scopeType} storage quota of {quota} bytes exceeded."
+    )
+
+
+def GetUsage(db: Session, scopeType: str, scopeId: str) -> Dict:
+    usage = db.query(StorageUsage.Bytes, StorageUsage.Files).filter(
+        StorageUsage.ScopeType == scopeType,
+        StorageUsage.ScopeId == scopeId
+    ).first()
+    bytesUsed, filesUsed = (usage.Bytes, usage.Files) if usage else (0, 0)
+    quota = QuotaFor(scopeType)
+    return {
+        "ScopeType": scopeType,
+        "ScopeId": scopeId,
+        "Bytes": bytesUsed,
+        "Files": filesUsed,
+        "QuotaBytes": quota or None,
+        "RemainingBytes": max(quota - bytesUsed, 0) if quota else None,
+    }
+
+
+def CheckQuota(db: Session, projectId: Optional[str], userId: Optional[str], size: int) -> None:
+    """Early rejection before any bytes are accepted; ChargeUsage is the real check"""
+    for scopeType, scopeId in Scopes(projectId, userId):
+        quota = QuotaFor(scopeType)
+        if quota and GetUsage(db, scopeType, scopeId)["Bytes"] + size > quota:
+            raise QuotaExceeded(scopeType, quota)
+
+
+def EnsureUsageRow(db: Session, scopeType: str, scopeId: str) -> None:
+    exists = db.query(StorageUsage.ScopeId).filter(
+        StorageUsage.ScopeType == scopeType,
+        StorageUsage.ScopeId == scopeId
+    ).first()
+    if exists:
+        return
+    try:
+        with db.begin_nested():
+            db.add(StorageUsage(ScopeType=scopeType, ScopeId=scopeId, Bytes=0, Files=0))
+    except IntegrityError:
+        pass
+
+
+def ChargeUsage(db: Session, projectId: Optional[str], userId: Optional[str], size: int, files: int = 1) -> None:
+    """Add an attachment to the counters, raising 413 if a quota would be exceeded.
+
+    Each counter moves with one conditional UPDATE, so concurrent uploads
+    cannot overshoot a quota together. Not committed; a rollback undoes it.
+    """
+    for scopeType, scopeId in Scopes(projectId, userId):
+        EnsureUsageRow(db, scopeType, scopeId)
+        query = db.query(StorageUsage).filter(
+            StorageUsage.ScopeType == scopeType,
+            StorageUsage.ScopeId == scopeId
+        )
+        quota = QuotaFor(scopeType)
+        if quota and size > 0:
+            query = query.filter(StorageUsage.Bytes + size <= quota)
+        updated = query.update({
+            StorageUsage.Bytes: StorageUsage.Bytes + size,
+            StorageUsage.Files: StorageUsage.Files + files,
+            StorageUsage.UpdatedAt: datetime.utcnow()
+        }, synchronize_session=False)
+        if not updated:
+            raise QuotaExceeded(scopeType, quota)
+
+
+def ReleaseUsage(db: Session, projectId: Optional[str], userId: Optional[str], size: int, files: int = 1) -> None:
+    for scopeType, scopeId in Scopes(projectId, userId):
+        db.query(StorageUsage).filter(
+            StorageUsage.ScopeType == scopeType,
+            StorageUsage.ScopeId == scopeId
+        ).update({
+            StorageUsage.Bytes: StorageUsage.Bytes - size,
+            StorageUsage.Files: StorageUsage.Files - files,
+            StorageUsage.UpdatedAt: datetime.utcnow()
+        }, synchronize_session=False)
+
+
+def RepairUsage(db: Session) -> int:
+    """Recompute every counter from the Attachment table; returns how many were wrong.
+    Uploads accepted while this runs can be miscounted, so run it when quiet."""
+    charged = db.query(Attachment).filter(
+        Attachment.IsDeleted == False,
+        Attachment.UploadStatus != AttachmentUploadStatus.FAILED
+    )
+    actual = {}
+    for scopeType, column in ((PROJECT_SCOPE, Attachment.ProjectId), (USER_SCOPE, Attachment.OwnerId)):
+        totals = charged.with_entities(
+            column, func.coalesce(func.sum(Attachment.FileSize), 0), func.count(Attachment.Id)
+        ).group_by(column).all()
+        for scopeId, totalBytes, totalFiles in totals:
+            actual[(scopeType, scopeId)] = (int(totalBytes), totalFiles)
+
+    rows = {(row.ScopeType, row.ScopeId): row for row in db.query(StorageUsage).all()}
+    fixed = 0
+    for key in set(actual) | set(rows):
+        expectedBytes, expectedFiles = actual.get(key, (0, 0))
+        row = rows.get(key)
+        if row and row.Bytes == expectedBytes and row.Files == expectedFiles:
+            continue
+        fixed += 1
+        if not row:
+            row = StorageUsage(ScopeType=key[0], ScopeId=key[1])
+            db.add(row)
+        row.Bytes = expectedBytes
+        row.Files = expectedFiles
+        row.UpdatedAt = datetime.utcnow()
+    db.commit()
+    return fixed
@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import List
 
 from Dependencies.db import GetDb
-from Schemas.AttachmentSchema import AttachmentCreateSchema, AttachmentResponseSchema
+from Schemas.AttachmentSchema import (
+    AttachmentCreateSchema, AttachmentResponseSchema, AttachmentUploadStatusSchema, StorageUsageSchema
+)
 from Models.Attachment import AttachmentEntityType
 from Services import AttachmentService
 from Dependencies.auth import GetCurrentUser
+from Core.config import DOWNLOAD_URL_BASE
 
 router = APIRouter(prefix="/attachments", tags=["Attachments"])
 UPLOAD_DIR = "/home/mabaszada/public_html"
 
-@router.post("/upload", response_model=AttachmentResponseSchema, status_code=status.HTTP_201_CREATED)
+@router.post("/upload", response_model=AttachmentUploadStatusSchema, status_code=status.HTTP_202_ACCEPTED)
 def UploadAttachment(
     file: UploadFile = File(...),
     entityType: AttachmentEntityType = Form(...),
@@ -29,6 +32,35 @@ def UploadAttachment(
         currentUser=currentUser.Id
     )
 
+@router.get("/upload/{attachmentId}/status", response_model=AttachmentUploadStatusSchema)
+def GetUploadStatus(
+    attachmentId: str,
+    db: Session = Depends(GetDb),
+    currentUser: str = Depends(GetCurrentUser)
+):
+    return AttachmentService.GetUploadStatus(db, attachmentId, currentUser.Id)
+
+@router.get("/metrics/uploads")
+def GetUploadMetrics(
+    currentUser: str = Depends(GetCurrentUser)
+):
+    return AttachmentService.GetUploadMetrics()
+
+@router.get("/usage/me", response_model=StorageUsageSchema)
+def GetMyStorageUsage(
+    db: Session = Depends(GetDb),
+    currentUser: str = Depends(GetCurrentUser)
+):
+    return AttachmentService.GetUserStorageUsage(db, currentUser.Id)
+
+@router.get("/usage/project/{projectId}", response_model=StorageUsageSchema)
+def GetProjectStorageUsage(
+    projectId: str,
+    db: Session = Depends(GetDb),
+    currentUser: str = Depends(GetCurrentUser)
+):
+    return AttachmentService.GetProjectStorageUsage(db, projectId, currentUser.Id)
+
 @router.post("/", response_model=AttachmentResponseSchema, status_code=status.HTTP_201_CREATED)
 def AddAttachment(
     attachment: AttachmentCreateSchema,
@@ -81,7 +113,9 @@ def GetAttachmentsByEntityType(
 @router.get("/download/{attachmentId}")
 def DownloadAttachment(
     attachmentId: str,
+    request: Request,
     db: Session = Depends(GetDb),
     currentUser: str = Depends(GetCurrentUser)
 ):
-    return AttachmentService.DownloadAttachment(db, attachmentId)
+    baseUrl = DOWNLOAD_URL_BASE or str(request.base_url)
+    return AttachmentService.DownloadAttachment(db, attachmentId, currentUser.Id, baseUrl)
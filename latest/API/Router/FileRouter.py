@@ -0,0 +1,40 @@
+import os
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from Core.signing import VerifyDownloadLink
+from Core.storage import storageBackend
+
+# Serves signed download links. No auth or database dependency on purpose:
+# the signature is the permission, so downloads stay off the ORM path.
+router = APIRouter(prefix="/files", tags=["Files"])
+
+@router.get("/{fileKey}")
+def DownloadFile(
+    fileKey: str,
+    expires: int = Query(...),
+    name: str = Query(...),
+    type: str = Query(""),
+    sig: str = Query(...)
+):
+    VerifyDownloadLink(fileKey, expires, name, type, sig)
+    if os.path.basename(fileKey) != fileKey or fileKey in ("", ".", ".."):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found.")
+
+    try:
+        chunks = storageBackend.Stream(storageBackend.PathFor(fileKey))
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found.")
+
+    quotedName = quote(name)
+    disposition = (
+        f"attachment; filename*=utf-8''{quotedName}" if quotedName != name
+        else f'attachment; filename="{name}"'
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=type or "application/octet-stream",
+        headers={"Content-Disposition": disposition, "Cache-Control": "private, max-age=300"}
+    )
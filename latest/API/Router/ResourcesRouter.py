@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from uuid import UUID
+from datetime import date
+from typing import Optional
 
+from Core.config import RESOURCE_UTILIZATION_BUCKET_DAYS
 from Models import User
 from Services.ResourceService import ResourceService
 from Dependencies.auth import GetCurrentUser
 from Schemas.ResourceSchema import (
     ResourceBase, ResourceUpdate,
     ActivityResourceBase, ActivityResourceUpdate,
-    ResourcePlanBase, ResourcePlanUpdate
+    ResourcePlanBase, ResourcePlanUpdate,
+    ResourceUtilization, ResourceLevelingProposal
 )
 
 router = APIRouter(prefix="/resources", tags=["Resources"])
@@ -53,6 +57,28 @@ def GetAllResourcesByProject(
     return service.GetAllResourcesByProjectId(projectId)
 
 
+@router.get("/project/{projectId}/utilization", response_model=ResourceUtilization)
+def GetResourceUtilization(
+    projectId: str,
+    bucketDays: int = Query(RESOURCE_UTILIZATION_BUCKET_DAYS, ge=1, le=366),
+    start: Optional[date] = Query(None, description="Defaults to the earliest task start"),
+    end: Optional[date] = Query(None, description="Defaults to the latest task deadline"),
+    currentUser: User = Depends(GetCurrentUser),
+    service: ResourceService = Depends(ResourceService)
+):
+    return service.GetResourceUtilization(currentUser.Id, projectId, bucketDays, start, end)
+
+
+@router.get("/project/{projectId}/leveling", response_model=ResourceLevelingProposal)
+def ProposeLeveledSchedule(
+    projectId: str,
+    currentUser: User = Depends(GetCurrentUser),
+    service: ResourceService = Depends(ResourceService)
+):
+    """Proposed task dates that keep every resource within capacity; nothing is saved"""
+    return service.ProposeLeveledSchedule(currentUser.Id, projectId)
+
+
 @router.get("/{resourceId}")
 def GetResourceById(
     resourceId: str,
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from typing import Optional
 from uuid import UUID
 
+from Core.config import RISK_SIMULATION_SCENARIOS, RISK_SIMULATION_MAX_SCENARIOS
 from Models import User
 from Schemas.RiskSchema import (
     RiskBase, RiskUpdate,
     RiskAnalysisBase, RiskAnalysisUpdate,
-    RiskResponsePlanBase, RiskResponsePlanUpdate
+    RiskResponsePlanBase, RiskResponsePlanUpdate,
+    RiskSummary, RiskSimulationResult
 )
 from Services.RiskService import RiskService
 from Dependencies.auth import GetCurrentUser
@@ -54,7 +57,25 @@ def GetAllRisksByProject(
     projectId: str,
     riskService: RiskService = Depends(RiskService)
 ):
-    return riskService.GetAllRisksByProject(projectId)
+    return riskService.GetAllRisks(projectId)
+
+@router.get("/project/{projectId}/summary", response_model=RiskSummary, summary="Risk heatmap and totals for a project")
+def GetRiskSummary(
+    projectId: str,
+    currentUser: User = Depends(GetCurrentUser),
+    riskService: RiskService = Depends(RiskService)
+):
+    return riskService.GetRiskSummary(currentUser.Id, projectId)
+
+@router.get("/project/{projectId}/simulation", response_model=RiskSimulationResult, summary="Monte Carlo cost exposure for a project")
+def SimulateCostExposure(
+    projectId: str,
+    scenarios: int = Query(RISK_SIMULATION_SCENARIOS, ge=1000, le=RISK_SIMULATION_MAX_SCENARIOS),
+    seed: Optional[int] = Query(None, description="Fix to get reproducible results"),
+    currentUser: User = Depends(GetCurrentUser),
+    riskService: RiskService = Depends(RiskService)
+):
+    return riskService.SimulateCostExposure(currentUser.Id, projectId, scenarios, seed)
 
 
 
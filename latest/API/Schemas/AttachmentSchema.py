@@ -1,13 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from Models.Attachment import AttachmentEntityType
+from Models.Attachment import AttachmentEntityType, AttachmentUploadStatus
 
 
 class AttachmentCreateSchema(BaseModel):
     FileName: str
     FileType: Optional[str]
-    FileSize: Optional[int]
+    FileSize: Optional[int] = Field(..., ge=0)  # Charged against the storage quotas
     FilePath: str
     EntityType: AttachmentEntityType
     EntityId: str
@@ -25,6 +25,28 @@ class AttachmentResponseSchema(BaseModel):
     EntityId: str
     OwnerId: str
     UploadedAt: datetime
+    UploadStatus: AttachmentUploadStatus = AttachmentUploadStatus.AVAILABLE
 
     class Config:
         orm_mode = True
+
+
+class AttachmentUploadStatusSchema(BaseModel):
+    Id: str
+    FileName: str
+    FileSize: Optional[int]
+    UploadStatus: AttachmentUploadStatus
+    UploadAttempts: Optional[int]
+    UploadError: Optional[str]
+
+    class Config:
+        orm_mode = True
+
+
+class StorageUsageSchema(BaseModel):
+    ScopeType: str
+    ScopeId: str
+    Bytes: int
+    Files: int
+    QuotaBytes: Optional[int] = None  # None when unlimited
+    RemainingBytes: Optional[int] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime
 
 
 # -------------------------------
@@ -71,3 +71,59 @@ class ResourcePlanRead(ResourcePlanBase):
 
     class Config:
         orm_mode = True
+
+
+# -------------------------------
+# Resource Utilization Schemas
+# -------------------------------
+
+class ResourceUtilizationRow(BaseModel):
+    ResourceId: str
+    Name: str
+    Unit: Optional[str]
+    Capacity: Optional[float]  # None when the resource has no Total
+    Demand: List[float]  # Peak daily demand in each bucket
+    Utilization: List[Optional[float]]  # Demand / Capacity per bucket
+    PeakUtilization: Optional[float]
+    OverAllocatedBuckets: List[int]
+
+class ResourceOverAllocation(BaseModel):
+    ResourceId: str
+    BucketStart: date
+    Demand: float
+    Capacity: float
+    Excess: float
+
+class ResourceUtilization(BaseModel):
+    ProjectId: str
+    BucketDays: int
+    Buckets: List[date]  # First day of each bucket
+    Resources: List[ResourceUtilizationRow]
+    OverAllocations: List[ResourceOverAllocation]
+    UnscheduledDemand: Dict[str, float]  # Per resource, from tasks without a deadline
+
+
+# -------------------------------
+# Resource Leveling Schemas
+# -------------------------------
+
+class LeveledTask(BaseModel):
+    TaskId: str
+    Title: str
+    Priority: Optional[str]
+    CurrentStart: date
+    CurrentFinish: date  # The task's deadline
+    ProposedStart: date
+    ProposedFinish: date
+    ShiftDays: int
+    MissesDeadline: bool
+    ExceedsCapacity: bool  # Needs more of a resource than its Total; left in place
+
+class ResourceLevelingProposal(BaseModel):
+    ProjectId: str
+    Tasks: List[LeveledTask]
+    TasksShifted: int
+    TasksMissingDeadline: int
+    UnscheduledTaskIds: List[str]  # Tasks without a deadline
+    CurrentFinish: Optional[date]
+    ProposedFinish: Optional[date]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # -----------------------------
@@ -77,3 +77,34 @@ class RiskResponsePlanRead(RiskResponsePlanBase):
 
     class Config:
         orm_mode = True
+
+# ---------------------------
+# Risk Summary Schemas
+
+class RiskHeatmapCell(BaseModel):
+    ProbabilityBand: int  # 1 (rare) to 5 (almost certain)
+    ImpactBand: int  # 1 (negligible) to 5 (severe)
+    Count: int
+    TotalSeverity: float
+
+class RiskSummary(BaseModel):
+    ProjectId: str
+    TotalRisks: int
+    Heatmap: List[RiskHeatmapCell]  # Only cells that contain risks
+    ByCategory: Dict[str, int]
+    ByStatus: Dict[str, int]
+    TotalExpectedValue: float
+    AnalysisCount: int
+
+class RiskSimulationResult(BaseModel):
+    ProjectId: str
+    Scenarios: int
+    Seed: Optional[int]
+    RisksSimulated: int
+    UnquantifiedRisks: int  # Risks without an analysis, left out of the simulation
+    ExpectedValue: float
+    Mean: float
+    P50: float
+    P80: float
+    P95: float
+    Max: float
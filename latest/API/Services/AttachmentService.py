@@ -1,9 +1,11 @@
 from fastapi import HTTPException, status, UploadFile
 from sqlalchemy.orm import Session
-from Models.Attachment import Attachment, AttachmentEntityType
-from Repositories import AttachmentRepository
+from Models.Attachment import Attachment, AttachmentEntityType, AttachmentUploadStatus
+from Repositories import AttachmentRepository, StorageUsageRepository
 from Repositories.ProjectRepository import HasProjectAccess
 from Schemas.AttachmentSchema import AttachmentCreateSchema
+from Core.storage import uploadMetrics
+from Services.AttachmentUploadWorker import uploadWorker
 
 
 def AddAttachment(db: Session, attachmentData: AttachmentCreateSchema, userId: str) -> Attachment:
@@ -57,8 +59,10 @@ def FileUpload(
 ):
     if not HasProjectAccess(db, projectId, currentUser):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied to this project.")
+    # Refuse before spooling when the declared size cannot fit
+    StorageUsageRepository.CheckQuota(db, projectId, currentUser, file.size or 0)
 
-    return AttachmentRepository.FileUpload(
+    attachment = AttachmentRepository.FileUpload(
         db=db,
         file=file,
         entityType=entityType,
@@ -66,12 +70,44 @@ def FileUpload(
         projectId=projectId,
         currentUser=currentUser
     )
+    uploadWorker.Enqueue(attachment.Id)
+    return attachment
+
+def GetUploadStatus(db: Session, attachmentId: str, userId: str) -> Attachment:
+    attachment = db.query(Attachment).filter(
+        Attachment.Id == attachmentId,
+        Attachment.IsDeleted == False
+    ).first()
+    if not attachment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attachment not found.")
+    if not HasProjectAccess(db, attachment.ProjectId, userId):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied to this project.")
+    return attachment
 
-def DownloadAttachment(db: Session, attachmentId: str):
+def DownloadAttachment(db: Session, attachmentId: str, userId: str, baseUrl: str):
     attachment = AttachmentRepository.GetAttachmentById(db, attachmentId)
     if not attachment or attachment.IsDeleted:
         raise HTTPException(status_code=404, detail="Attachment not found")
+    if not HasProjectAccess(db, attachment.ProjectId, userId):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied to this project.")
+    if attachment.UploadStatus != AttachmentUploadStatus.AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Attachment is not available yet (status: {attachment.UploadStatus.value})."
+        )
     
-    url = AttachmentRepository.DownloadAttachment(attachment)
-    return {"download_url": url}
+    return AttachmentRepository.DownloadAttachment(attachment, baseUrl)
+
+
+def GetProjectStorageUsage(db: Session, projectId: str, userId: str) -> dict:
+    if not HasProjectAccess(db, projectId, userId):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied to this project.")
+    return StorageUsageRepository.GetUsage(db, StorageUsageRepository.PROJECT_SCOPE, projectId)
+
+
+def GetUserStorageUsage(db: Session, userId: str) -> dict:
+    return StorageUsageRepository.GetUsage(db, StorageUsageRepository.USER_SCOPE, userId)
+
 
+def GetUploadMetrics() -> dict:
+    return uploadMetrics.Summary()
@@ -0,0 +1,164 @@
+import logging
+import os
+import queue
+import threading
+from typing import Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from Core.config import (
+    UPLOAD_SPOOL_DIR, UPLOAD_MAX_ATTEMPTS, UPLOAD_RETRY_BASE_SECONDS, UPLOAD_WORKER_COUNT
+)
+from Core.storage import (
+    StorageBackend, storageBackend, SaveWithMetrics, SpoolPath, PublicPath, AttachmentStorageKey
+)
+from Db.session import SessionLocal
+from Models.Attachment import Attachment, AttachmentUploadStatus
+from Repositories.StorageUsageRepository import ReleaseUsage
+
+logger = logging.getLogger(__name__)
+
+class AttachmentUploadWorker:
+    """Pushes spooled uploads to the storage backend in the background.
+
+    Failed pushes are retried with exponential backoff; the Attachment row
+    tracks Pending -> Available (or Failed after UPLOAD_MAX_ATTEMPTS). Rows
+    still Pending at startup are re-queued, so a restart loses nothing that
+    was spooled.
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend = storageBackend,
+        sessionFactory: sessionmaker = SessionLocal,
+        workerCount: int = UPLOAD_WORKER_COUNT,
+        maxAttempts: int = UPLOAD_MAX_ATTEMPTS,
+        retryBaseSeconds: float = UPLOAD_RETRY_BASE_SECONDS,
+        spoolDir: str = UPLOAD_SPOOL_DIR
+    ):
+        self.backend = backend
+        self.sessionFactory = sessionFactory
+        self.workerCount = workerCount
+        self.maxAttempts = maxAttempts
+        self.retryBaseSeconds = retryBaseSeconds
+        self.spoolDir = spoolDir
+        self.jobs: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.threads = []
+        self.timers = set()
+        self.lock = threading.Lock()
+        self.stopping = False
+
+    def Start(self) -> None:
+        if self.threads:
+            return
+        self.stopping = False
+        for index in range(self.workerCount):
+            thread = threading.Thread(target=self.Run, name=f"attachment-upload-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        self.ResumePending()
+
+    def Stop(self) -> None:
+        self.stopping = True
+        with self.lock:
+            for timer in self.timers:
+                timer.cancel()
+            self.timers.clear()
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join(timeout=5)
+        self.threads = []
+
+    def Enqueue(self, attachmentId: str) -> None:
+        self.jobs.put(attachmentId)
+
+    def EnqueueLater(self, attachmentId: str, delaySeconds: float) -> None:
+        def Fire():
+            with self.lock:
+                self.timers.discard(timer)
+            if not self.stopping:
+                self.jobs.put(attachmentId)
+
+        timer = threading.Timer(delaySeconds, Fire)
+        timer.daemon = True
+        with self.lock:
+            self.timers.add(timer)
+        timer.start()
+
+    def ResumePending(self) -> None:
+        db: Session = self.sessionFactory()
+        try:
+            pendingIds = [
+                attachmentId for (attachmentId,) in db.query(Attachment.Id).filter(
+                    Attachment.UploadStatus == AttachmentUploadStatus.PENDING,
+                    Attachment.IsDeleted == False
+                ).all()
+            ]
+        finally:
+            db.close()
+        for attachmentId in pendingIds:
+            self.Enqueue(attachmentId)
+
+    def Run(self) -> None:
+        while True:
+            attachmentId = self.jobs.get()
+            if attachmentId is None:
+                return
+            try:
+                self.Process(attachmentId)
+            except Exception:
+                logger.exception("Attachment upload worker error for %s", attachmentId)
+
+    def Process(self, attachmentId: str) -> None:
+        db: Session = self.sessionFactory()
+        try:
+            attachment = db.query(Attachment).filter(Attachment.Id == attachmentId).first()
+            if not attachment or attachment.UploadStatus != AttachmentUploadStatus.PENDING:
+                return
+
+            spoolPath = SpoolPath(attachmentId, self.spoolDir)
+            if attachment.IsDeleted:
+                self.RemoveSpool(spoolPath)
+                return
+            if not os.path.exists(spoolPath):
+                attachment.UploadStatus = AttachmentUploadStatus.FAILED
+                attachment.UploadError = "Spooled file is missing"
+                ReleaseUsage(db, attachment.ProjectId, attachment.OwnerId, attachment.FileSize or 0)
+                db.commit()
+                return
+
+            attachment.UploadAttempts = (attachment.UploadAttempts or 0) + 1
+            try:
+                with open(spoolPath, "rb") as stream:
+                    stored = SaveWithMetrics(
+                        self.backend, stream, AttachmentStorageKey(attachment.Id, attachment.FileName)
+                    )
+            except Exception as e:
+                attachment.UploadError = str(e)[:500]
+                if attachment.UploadAttempts >= self.maxAttempts:
+                    attachment.UploadStatus = AttachmentUploadStatus.FAILED
+                    ReleaseUsage(db, attachment.ProjectId, attachment.OwnerId, attachment.FileSize or 0)
+                    db.commit()
+                    self.RemoveSpool(spoolPath)
+                else:
+                    db.commit()
+                    delay = self.retryBaseSeconds * (2 ** (attachment.UploadAttempts - 1))
+                    self.EnqueueLater(attachmentId, delay)
+                return
+
+            attachment.FilePath = PublicPath(stored["Path"])
+            attachment.FileSize = stored["Size"]
+            attachment.UploadStatus = AttachmentUploadStatus.AVAILABLE
+            attachment.UploadError = None
+            db.commit()
+            self.RemoveSpool(spoolPath)
+        finally:
+            db.close()
+
+    def RemoveSpool(self, spoolPath: str) -> None:
+        if os.path.exists(spoolPath):
+            os.remove(spoolPath)
+
+
+uploadWorker = AttachmentUploadWorker()
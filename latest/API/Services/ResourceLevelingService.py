@@ -0,0 +1,149 @@
+import heapq
+from datetime import timedelta
+from typing import Dict, List
+
+from Services.ResourceUtilizationService import AssignmentWindow, CAPACITY_TOLERANCE
+
+# Resource leveling.
+#
+# Proposes new start dates so that no resource is ever asked for more than its
+# Total, without writing anything. Each task keeps its current length (creation
+# to deadline, as in the utilization matrix) and may only move later. That
+# leaves no slack, so every task that moves misses its deadline; the ordering
+# decides which ones move: higher Priority first, then the earliest deadline.
+#
+# This is parallel list scheduling driven by three heaps: tasks waiting for
+# their current start date, tasks ready to start in priority order, and
+# running tasks ordered by finish day. At each event day finished tasks hand
+# back their resources and ready tasks start in priority order whenever all
+# their resources fit. A task that does not fit is parked on the resource it
+# is short of and only looked at again when that resource frees up, which
+# keeps a 5k-task project well under a second.
+
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+
+def CollectLevelingTasks(resources: List, assignments: List):
+    """Group assignment rows into tasks with their window and summed demand"""
+    capacity = {resource.Id: resource.Total for resource in resources if resource.Total is not None}
+    tasks: Dict[str, Dict] = {}
+    unscheduled = set()
+    for assignment in assignments:
+        if assignment.Deadline is None:
+            unscheduled.add(assignment.TaskId)
+            continue
+        task = tasks.get(assignment.TaskId)
+        if task is None:
+            start, finish = AssignmentWindow(assignment.CreatedAt, assignment.Deadline)
+            task = tasks[assignment.TaskId] = {
+                "TaskId": assignment.TaskId,
+                "Title": assignment.Title,
+                "Priority": assignment.Priority,
+                "Start": start,
+                "Finish": finish,
+                "Demand": {},
+            }
+        if assignment.ResourceId in capacity:
+            demand = task["Demand"]
+            demand[assignment.ResourceId] = demand.get(assignment.ResourceId, 0.0) + assignment.Quantity
+    return tasks, capacity, sorted(unscheduled)
+
+
+def LevelResources(resources: List, assignments: List) -> Dict:
+    """Proposed start and finish of every task so resource demand stays within capacity"""
+    tasks, capacity, unscheduled = CollectLevelingTasks(resources, assignments)
+    result = {
+        "Tasks": [],
+        "TasksShifted": 0,
+        "TasksMissingDeadline": 0,
+        "UnscheduledTaskIds": unscheduled,
+        "CurrentFinish": None,
+        "ProposedFinish": None,
+    }
+    if not tasks:
+        return result
+
+    origin = min(task["Start"] for task in tasks.values())
+    order = sorted(tasks)
+    free = dict(capacity)
+    released = []  # (start day, task index)
+    infeasible = set()
+    taskList = [tasks[taskId] for taskId in order]
+    for index, task in enumerate(taskList):
+        task["Release"] = (task["Start"] - origin).days
+        task["Length"] = (task["Finish"] - task["Start"]).days + 1
+        task["Due"] = (task["Finish"] - origin).days
+        task["Key"] = (PRIORITY_RANK.get(task["Priority"], len(PRIORITY_RANK)), task["Due"], task["TaskId"])
+        # A task that needs more than a resource's whole Total can never fit;
+        # it keeps its dates and is reported instead of blocking everyone else
+        if any(quantity > capacity[resourceId] + CAPACITY_TOLERANCE for resourceId, quantity in task["Demand"].items()):
+            infeasible.add(index)
+            task["ProposedStart"] = task["Release"]
+            continue
+        heapq.heappush(released, (task["Release"], index))
+
+    ready = []  # (priority key, task index)
+    running = []  # (first free day, task index)
+    parked: Dict[str, List] = {resourceId: [] for resourceId in capacity}
+
+    def Blocker(task):
+        for resourceId, quantity in task["Demand"].items():
+            if quantity > free[resourceId] + CAPACITY_TOLERANCE:
+                return resourceId
+        return None
+
+    day = released[0][0] if released else 0
+    while released or ready or running:
+        while running and running[0][0] <= day:
+            _, index = heapq.heappop(running)
+            for resourceId, quantity in taskList[index]["Demand"].items():
+                free[resourceId] += quantity
+                for waiting in parked[resourceId]:
+                    heapq.heappush(ready, waiting)
+                parked[resourceId] = []
+        while released and released[0][0] <= day:
+            _, index = heapq.heappop(released)
+            heapq.heappush(ready, (taskList[index]["Key"], index))
+
+        while ready:
+            entry = heapq.heappop(ready)
+            task = taskList[entry[1]]
+            blocker = Blocker(task)
+            if blocker is not None:
+                parked[blocker].append(entry)
+                continue
+            for resourceId, quantity in task["Demand"].items():
+                free[resourceId] -= quantity
+            task["ProposedStart"] = day
+            heapq.heappush(running, (day + task["Length"], entry[1]))
+
+        upcoming = [heap[0][0] for heap in (running, released) if heap]
+        if not upcoming:
+            break
+        day = min(upcoming)
+
+    currentFinish = proposedFinish = None
+    for index, task in enumerate(taskList):
+        shift = task["ProposedStart"] - task["Release"]
+        proposedStart = task["Start"] + timedelta(days=shift)
+        proposedEnd = task["Finish"] + timedelta(days=shift)
+        missesDeadline = proposedEnd > task["Finish"]
+        result["Tasks"].append({
+            "TaskId": task["TaskId"],
+            "Title": task["Title"],
+            "Priority": task["Priority"],
+            "CurrentStart": task["Start"],
+            "CurrentFinish": task["Finish"],
+            "ProposedStart": proposedStart,
+            "ProposedFinish": proposedEnd,
+            "ShiftDays": shift,
+            "MissesDeadline": missesDeadline,
+            "ExceedsCapacity": index in infeasible,
+        })
+        result["TasksShifted"] += shift > 0
+        result["TasksMissingDeadline"] += missesDeadline
+        currentFinish = max(currentFinish or task["Finish"], task["Finish"])
+        proposedFinish = max(proposedFinish or proposedEnd, proposedEnd)
+    result["CurrentFinish"] = currentFinish
+    result["ProposedFinish"] = proposedFinish
+    return result
@@ -1,7 +1,10 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
 from uuid import UUID
+from datetime import date
+from typing import Optional
 
+from Core.config import RESOURCE_UTILIZATION_MAX_BUCKETS
 from Dependencies.db import GetDb
 from Repositories import ResourceRepository, ProjectRepository
 from Schemas.ResourceSchema import (
@@ -12,6 +15,8 @@ from Schemas.ResourceSchema import (
 from Models.Resource import Resource
 from Models.ResourcePlan import ResourcePlan
 from Models.ActivityResource import ActivityResource
+from Services.ResourceUtilizationService import BuildUtilization
+from Services.ResourceLevelingService import LevelResources
 
 
 class ResourceService:
@@ -55,6 +60,35 @@ class ResourceService:
             raise HTTPException(status_code=404, detail="Resource not found")
         return resource
 
+    def GetResourceUtilization(
+        self,
+        userId: UUID,
+        projectId: str,
+        bucketDays: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ):
+        if not ProjectRepository.HasProjectAccess(self.db, projectId, str(userId)):
+            raise HTTPException(status_code=403, detail="You are not a member of this project.")
+
+        resources = ResourceRepository.GetAllResourcesByProjectId(self.db, projectId)
+        assignments = ResourceRepository.GetProjectAssignmentWindows(self.db, projectId)
+        try:
+            utilization = BuildUtilization(
+                resources, assignments, bucketDays, RESOURCE_UTILIZATION_MAX_BUCKETS, start, end
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"ProjectId": projectId, **utilization}
+
+    def ProposeLeveledSchedule(self, userId: UUID, projectId: str):
+        if not ProjectRepository.HasProjectAccess(self.db, projectId, str(userId)):
+            raise HTTPException(status_code=403, detail="You are not a member of this project.")
+
+        resources = ResourceRepository.GetAllResourcesByProjectId(self.db, projectId)
+        assignments = ResourceRepository.GetProjectAssignmentWindows(self.db, projectId)
+        return {"ProjectId": projectId, **LevelResources(resources, assignments)}
+
     # -----------------------------
     # ActivityResource
 
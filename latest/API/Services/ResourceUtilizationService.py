@@ -0,0 +1,134 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Resource utilization over time.
+#
+# Tasks have no start date, so an assignment holds its Quantity of a resource
+# from the day its task was created through the task's deadline. Demand is
+# reported in fixed-width buckets as the peak daily demand within the bucket,
+# so two assignments in the same week that never overlap in time are not
+# added together. It is compared with the resource's Total; a resource without
+# a Total is treated as unlimited. Assignments on tasks with no deadline cannot
+# be placed in time and are reported separately.
+#
+# Daily demand is built as a (resources x days) array from one difference
+# array: +Quantity on the day an assignment starts, -Quantity the day after it
+# ends, then a running sum along time. The days are then folded into buckets
+# with a max. Cost is linear in assignments plus the size of the daily matrix.
+
+CAPACITY_TOLERANCE = 1e-9
+
+
+def AssignmentWindow(createdAt, deadline):
+    """First and last day an assignment occupies its resource"""
+    end = deadline.date()
+    start = createdAt.date() if createdAt else end
+    return min(start, end), end
+
+
+def BuildUtilization(
+    resources: List,
+    assignments: List,
+    bucketDays: int,
+    maxBuckets: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> Dict:
+    """Demand, utilization and over-allocation per resource and time bucket.
+
+    `resources` rows need Id, Name, Unit and Total; `assignments` rows need
+    ResourceId, Quantity, CreatedAt and Deadline.
+    """
+    resourceIndex = {resource.Id: index for index, resource in enumerate(resources)}
+    unscheduled: Dict[str, float] = {}
+    rows, starts, ends, quantities = [], [], [], []
+    for assignment in assignments:
+        index = resourceIndex.get(assignment.ResourceId)
+        if index is None:
+            continue
+        if assignment.Deadline is None:
+            unscheduled[assignment.ResourceId] = unscheduled.get(assignment.ResourceId, 0.0) + assignment.Quantity
+            continue
+        windowStart, windowEnd = AssignmentWindow(assignment.CreatedAt, assignment.Deadline)
+        rows.append(index)
+        starts.append(windowStart)
+        ends.append(windowEnd)
+        quantities.append(assignment.Quantity)
+
+    if starts:
+        start = start or min(starts)
+        end = end or max(ends)
+    else:
+        start = start or date.today()
+        end = end or start
+    if end < start:
+        raise ValueError("The end of the range is before its start")
+    bucketCount = (end - start).days // bucketDays + 1
+    if bucketCount > maxBuckets:
+        raise ValueError(f"The range spans {bucketCount} buckets; the limit is {maxBuckets}")
+
+    demand = np.zeros((len(resources), bucketCount), dtype=np.float64)
+    if rows:
+        origin = np.datetime64(start, "D")
+        startDays = (np.array(starts, dtype="datetime64[D]") - origin).astype(np.int64)
+        endDays = (np.array(ends, dtype="datetime64[D]") - origin).astype(np.int64)
+        rangeDays = (end - start).days
+        # Assignments entirely outside the range do not count
+        inRange = (endDays >= 0) & (startDays <= rangeDays)
+        rowIndex = np.array(rows, dtype=np.int64)[inRange]
+        firstDay = np.clip(startDays[inRange], 0, rangeDays)
+        lastDay = np.clip(endDays[inRange], 0, rangeDays)
+        quantity = np.array(quantities, dtype=np.float64)[inRange]
+
+        # One column per day, padded so the days split evenly into buckets
+        dayCount = bucketCount * bucketDays
+        changes = np.zeros((len(resources), dayCount + 1), dtype=np.float64)
+        np.add.at(changes, (rowIndex, firstDay), quantity)
+        np.add.at(changes, (rowIndex, lastDay + 1), -quantity)
+        dailyDemand = np.cumsum(changes[:, :dayCount], axis=1)
+        demand = dailyDemand.reshape(len(resources), bucketCount, bucketDays).max(axis=2)
+
+    capacity = np.array(
+        [resource.Total if resource.Total is not None else np.nan for resource in resources],
+        dtype=np.float64
+    ).reshape(-1, 1)
+    limited = ~np.isnan(capacity)
+    overAllocated = limited & (demand > capacity + CAPACITY_TOLERANCE)
+    # Zero capacity has no meaningful ratio; such buckets still show as over-allocated
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilization = np.where(limited & (capacity > 0), demand / capacity, np.nan)
+
+    bucketStarts = [start + timedelta(days=bucketDays * bucket) for bucket in range(bucketCount)]
+    resourceRows = []
+    overAllocations = []
+    for index, resource in enumerate(resources):
+        overBuckets = np.flatnonzero(overAllocated[index])
+        rowUtilization = utilization[index]
+        resourceRows.append({
+            "ResourceId": resource.Id,
+            "Name": resource.Name,
+            "Unit": resource.Unit,
+            "Capacity": resource.Total,
+            "Demand": demand[index].tolist(),
+            "Utilization": [None if np.isnan(value) else float(value) for value in rowUtilization],
+            "PeakUtilization": None if np.all(np.isnan(rowUtilization)) else float(np.nanmax(rowUtilization)),
+            "OverAllocatedBuckets": overBuckets.tolist(),
+        })
+        for bucket in overBuckets:
+            overAllocations.append({
+                "ResourceId": resource.Id,
+                "BucketStart": bucketStarts[bucket],
+                "Demand": float(demand[index, bucket]),
+                "Capacity": resource.Total,
+                "Excess": float(demand[index, bucket] - resource.Total),
+            })
+
+    return {
+        "BucketDays": bucketDays,
+        "Buckets": bucketStarts,
+        "Resources": resourceRows,
+        "OverAllocations": overAllocations,
+        "UnscheduledDemand": unscheduled,
+    }
@@ -1,9 +1,16 @@
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException
 from uuid import UUID
+from typing import Optional
+from threading import Lock
+from cachetools import TTLCache
 
+from Core.cascade import SoftDeleteCascade
+from Core.config import RISK_SUMMARY_CACHE_TTL_SECONDS
 from Models.Project import Project
+from Models.Risk import Risk
 from Repositories import RiskRepository, ProjectRepository
+from Services import RiskSimulationService
 from Schemas.RiskSchema import (
     RiskBase, RiskUpdate,
     RiskAnalysisBase, RiskAnalysisUpdate,
@@ -11,6 +18,19 @@ from Schemas.RiskSchema import (
 )
 from Dependencies.db import GetDb
 
+# Risk summaries per project, dropped whenever a risk or analysis of the project
+# changes. The generation counter stops a summary computed before a write from
+# being cached after it.
+riskSummaryCache = TTLCache(maxsize=1024, ttl=RISK_SUMMARY_CACHE_TTL_SECONDS)
+riskSummaryGenerations = {}
+riskSummaryLock = Lock()
+
+
+def InvalidateRiskSummary(projectId: str):
+    with riskSummaryLock:
+        riskSummaryCache.pop(projectId, None)
+        riskSummaryGenerations[projectId] = riskSummaryGenerations.get(projectId, 0) + 1
+
 
 class RiskService:
     def __init__(self, db: Session = Depends(GetDb)):
@@ -19,7 +39,9 @@ class RiskService:
     def CreateRisk(self, userId: UUID, riskData: RiskBase):
         if not ProjectRepository.HasProjectAccess(self.db, riskData.ProjectId, str(userId)):
             raise HTTPException(status_code=403, detail="You are not a member of this project.")
-        return RiskRepository.CreateRisk(self.db, riskData, str(userId))
+        risk = RiskRepository.CreateRisk(self.db, riskData, str(userId))
+        InvalidateRiskSummary(risk.ProjectId)
+        return risk
 
     def UpdateRisk(self, userId: UUID, riskId: UUID, updateData: RiskUpdate):
         risk = RiskRepository.GetRiskById(self.db, str(riskId))
@@ -29,7 +51,9 @@ class RiskService:
         if not ProjectRepository.HasProjectAccess(self.db, risk.ProjectId, str(userId)):
             raise HTTPException(status_code=403, detail="You are not a member of this project.")
 
-        return RiskRepository.UpdateRisk(self.db, str(riskId), updateData)
+        updated = RiskRepository.UpdateRisk(self.db, str(riskId), updateData)
+        InvalidateRiskSummary(risk.ProjectId)
+        return updated
 
 
     def SoftDeleteRisk(self, userId: UUID, riskId: UUID, projectId: UUID):
@@ -41,18 +65,9 @@ class RiskService:
         if not risk:
             raise HTTPException(status_code=404, detail="Risk not found")
 
-        # Step 2: Soft delete the risk
-        RiskRepository.SoftDeleteRisk(self.db, str(riskId))
-
-        # Step 3: Soft delete related analyses
-        analyses = RiskRepository.GetAllRiskAnalysesByRiskId(self.db, str(riskId))
-        for analysis in analyses:
-            RiskRepository.SoftDeleteRiskAnalysis(self.db, analysis.Id)
-
-        # Step 4: Soft delete related response plans
-        responsePlans = RiskRepository.GetAllRiskResponsePlansByRiskId(self.db, str(riskId))
-        for plan in responsePlans:
-            RiskRepository.SoftDeleteRiskResponsePlan(self.db, plan.Id)
+        # Step 2: Soft delete the risk with its analyses and response plans
+        SoftDeleteCascade(self.db, Risk, [str(riskId)])
+        InvalidateRiskSummary(risk.ProjectId)
 
         return {"message": "Risk and its related data soft deleted."}
 
@@ -66,6 +81,27 @@ class RiskService:
     def GetAllRisks(self, projectId: str):
         return RiskRepository.GetAllRisks(self.db, projectId)
 
+    def GetRiskSummary(self, userId: UUID, projectId: str):
+        if not ProjectRepository.HasProjectAccess(self.db, projectId, str(userId)):
+            raise HTTPException(status_code=403, detail="You are not a member of this project.")
+
+        with riskSummaryLock:
+            summary = riskSummaryCache.get(projectId)
+            generation = riskSummaryGenerations.get(projectId, 0)
+        if summary is not None:
+            return summary
+
+        summary = RiskRepository.GetRiskSummary(self.db, projectId)
+        with riskSummaryLock:
+            if riskSummaryGenerations.get(projectId, 0) == generation:
+                riskSummaryCache[projectId] = summary
+        return summary
+
+    def SimulateCostExposure(self, userId: UUID, projectId: str, scenarios: int, seed: Optional[int] = None):
+        if not ProjectRepository.HasProjectAccess(self.db, projectId, str(userId)):
+            raise HTTPException(status_code=403, detail="You are not a member of this project.")
+        return RiskSimulationService.GetCostExposure(self.db, projectId, scenarios, seed)
+
     #----------------------
     # RiskAnalysis
 
@@ -77,7 +113,9 @@ class RiskService:
 
         if not ProjectRepository.HasProjectAccess(self.db, risk.ProjectId, str(userId)):
             raise HTTPException(status_code=403, detail="You are not a member of the project for this risk.")
-        return RiskRepository.CreateRiskAnalysis(self.db, analysisData)
+        analysis = RiskRepository.CreateRiskAnalysis(self.db, analysisData)
+        InvalidateRiskSummary(risk.ProjectId)
+        return analysis
 
 
     def UpdateRiskAnalysis(self, userId: UUID, analysisId: UUID, updateData: RiskAnalysisUpdate):
@@ -92,7 +130,9 @@ class RiskService:
         if not ProjectRepository.HasProjectAccess(self.db, risk.ProjectId, str(userId)):
             raise HTTPException(status_code=403, detail="You are not a member of this project.")
 
-        return RiskRepository.UpdateRiskAnalysis(self.db, str(analysisId), updateData)
+        updated = RiskRepository.UpdateRiskAnalysis(self.db, str(analysisId), updateData)
+        InvalidateRiskSummary(risk.ProjectId)
+        return updated
 
 
     def SoftDeleteRiskAnalysis(self, userId: UUID, analysisId: UUID):
@@ -106,7 +146,9 @@ class RiskService:
 
         if not ProjectRepository.HasProjectAccess(self.db, risk.ProjectId, str(userId)):
             raise HTTPException(status_code=403, detail="You are not a member of this project.")
-        return RiskRepository.SoftDeleteRiskAnalysis(self.db, str(analysisId))
+        deleted = RiskRepository.SoftDeleteRiskAnalysis(self.db, str(analysisId))
+        InvalidateRiskSummary(risk.ProjectId)
+        return deleted
 
     def GetRiskAnalysisById(self, analysisId: UUID):
         analysis = RiskRepository.GetRiskAnalysisById(self.db, str(analysisId))
@@ -0,0 +1,160 @@
+import atexit
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+from cachetools import LRUCache
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from Core.config import RISK_SIMULATION_WORKERS
+from Models.Risk import Risk
+from Models.RiskAnalysis import RiskAnalysis
+
+# Monte Carlo cost exposure.
+#
+# Each risk occurs in a scenario with its Probability. When it occurs it costs
+# ExpectedValue / Probability from its latest analysis, drawn from a symmetric
+# triangular distribution whose width grows with Impact (Impact 10 spans 0 to
+# twice the cost). The mean therefore matches the analysed expected value while
+# the percentiles show how bad a bad year gets. Risks without an analysis have
+# no cost to simulate and are only counted.
+#
+# Scenarios are sampled as (scenarios x risks) arrays in fixed-size chunks, in a
+# process pool so the CPU work stays off the API workers. Results are cached
+# under a fingerprint of the inputs, so any change to the project's risks or
+# analyses produces a fresh run.
+
+SCENARIO_CHUNK_CELLS = 2_000_000  # Bounds each chunk's arrays to a few dozen MB
+PERCENTILES = (50, 80, 95)
+
+simulationCache = LRUCache(maxsize=256)
+simulationLock = Lock()
+simulationPool: Optional[ProcessPoolExecutor] = None
+
+
+def GetSimulationPool() -> ProcessPoolExecutor:
+    global simulationPool
+    with simulationLock:
+        if simulationPool is None:
+            # Spawned, not forked: the API process runs the upload worker and
+            # SFTP pool threads, whose locks a fork would copy mid-use
+            simulationPool = ProcessPoolExecutor(
+                max_workers=RISK_SIMULATION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return simulationPool
+
+
+def ShutdownSimulationPool() -> None:
+    global simulationPool
+    with simulationLock:
+        if simulationPool is not None:
+            simulationPool.shutdown(wait=False, cancel_futures=True)
+            simulationPool = None
+
+
+atexit.register(ShutdownSimulationPool)
+
+
+def LoadRiskInputs(db: Session, projectId: str) -> Dict:
+    """Probability, consequence cost and spread of each live risk, from one query"""
+    rows = db.query(
+        Risk.Id, Risk.Probability, Risk.Impact, RiskAnalysis.ExpectedValue
+    ).outerjoin(
+        RiskAnalysis, and_(RiskAnalysis.RiskId == Risk.Id, RiskAnalysis.IsDeleted == False)
+    ).filter(
+        Risk.ProjectId == projectId,
+        Risk.IsDeleted == False
+    ).order_by(Risk.Id, RiskAnalysis.AnalysisDate, RiskAnalysis.Id).all()
+
+    # Rows come ordered by analysis date, so the last one per risk wins
+    latest = {}
+    for riskId, probability, impact, expectedValue in rows:
+        latest[riskId] = (probability, impact, expectedValue)
+
+    inputs = {"Probabilities": [], "Costs": [], "Spreads": [], "Unquantified": 0}
+    for probability, impact, expectedValue in latest.values():
+        if expectedValue is None:
+            inputs["Unquantified"] += 1
+            continue
+        if not probability or probability <= 0:
+            continue
+        inputs["Probabilities"].append(min(probability, 1.0))
+        inputs["Costs"].append(expectedValue / probability)
+        inputs["Spreads"].append(min(max(impact or 1, 1), 10) / 10)
+    return inputs
+
+
+def InputFingerprint(inputs: Dict) -> str:
+    digest = hashlib.sha256()
+    for key in ("Probabilities", "Costs", "Spreads"):
+        digest.update(np.asarray(inputs[key], dtype=np.float64).tobytes())
+    digest.update(str(inputs["Unquantified"]).encode())
+    return digest.hexdigest()
+
+
+def SimulateCostExposure(
+    probabilities: List[float],
+    costs: List[float],
+    spreads: List[float],
+    scenarios: int,
+    seed: Optional[int] = None
+) -> Dict:
+    """Total risk cost of `scenarios` sampled outcomes; runs in the process pool"""
+    rng = np.random.default_rng(seed)
+    probability = np.asarray(probabilities, dtype=np.float64)
+    cost = np.asarray(costs, dtype=np.float64)
+    spread = np.asarray(spreads, dtype=np.float64)
+    riskCount = len(probability)
+
+    totals = np.zeros(scenarios, dtype=np.float64)
+    if riskCount:
+        chunkSize = max(1, SCENARIO_CHUNK_CELLS // riskCount)
+        for start in range(0, scenarios, chunkSize):
+            size = min(chunkSize, scenarios - start)
+            occurs = rng.random((size, riskCount)) < probability
+            # Inverse CDF of a symmetric triangular distribution on [-1, 1]
+            u = rng.random((size, riskCount))
+            offset = np.where(u < 0.5, np.sqrt(2 * u) - 1, 1 - np.sqrt(2 * (1 - u)))
+            outcome = cost * (1 + spread * offset)
+            totals[start:start + size] = np.where(occurs, outcome, 0.0).sum(axis=1)
+
+    p50, p80, p95 = np.percentile(totals, PERCENTILES)
+    return {
+        "Mean": float(totals.mean()),
+        "P50": float(p50),
+        "P80": float(p80),
+        "P95": float(p95),
+        "Max": float(totals.max()),
+    }
+
+
+def GetCostExposure(db: Session, projectId: str, scenarios: int, seed: Optional[int] = None) -> Dict:
+    """Cost exposure percentiles of a project, simulated once per set of risk inputs"""
+    inputs = LoadRiskInputs(db, projectId)
+    key = (projectId, InputFingerprint(inputs), scenarios, seed)
+    with simulationLock:
+        cached = simulationCache.get(key)
+    if cached is not None:
+        return cached
+
+    future = GetSimulationPool().submit(
+        SimulateCostExposure,
+        inputs["Probabilities"], inputs["Costs"], inputs["Spreads"], scenarios, seed
+    )
+    result = {
+        "ProjectId": projectId,
+        "Scenarios": scenarios,
+        "Seed": seed,
+        "RisksSimulated": len(inputs["Probabilities"]),
+        "UnquantifiedRisks": inputs["Unquantified"],
+        "ExpectedValue": float(sum(p * c for p, c in zip(inputs["Probabilities"], inputs["Costs"]))),
+        **future.result(),
+    }
+    with simulationLock:
+        simulationCache[key] = result
+    return result
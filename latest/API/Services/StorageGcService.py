@@ -0,0 +1,242 @@
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Set
+
+from sqlalchemy.orm import Session
+
+from Core.config import (
+    ATTACHMENT_PURGE_GRACE_DAYS, STORAGE_GC_GRACE_SECONDS, STORAGE_GC_BATCH_SIZE, UPLOAD_SPOOL_DIR
+)
+from sqlalchemy import and_
+
+from Core.storage import StorageBackend, storageBackend, SpoolPath, StorageKey
+from Models.Attachment import Attachment, AttachmentUploadStatus
+
+# Storage garbage collection.
+#
+# Soft-deleted attachments keep their file for ATTACHMENT_PURGE_GRACE_DAYS so a
+# delete can be undone, then the file and row are purged. Stored and spooled
+# files that no attachment points at are removed once they are older than
+# STORAGE_GC_GRACE_SECONDS; the upload worker saves a file before it commits the
+# path, so anything younger may belong to an upload that is still in flight.
+#
+# Stored files are matched to rows by storage key (the file name the backend
+# keeps them under), whatever form FilePath was written in; rows that link to a
+# URL have no stored file. Only the backend's attachment directory is swept.
+
+
+def NewReport() -> Dict:
+    return {
+        "AttachmentsPurged": 0,
+        "FilesScanned": 0,
+        "FilesRemoved": 0,
+        "BytesReclaimed": 0,
+    }
+
+
+def Batched(items, batchSize: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batchSize:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ReferencedStorageKeys(db: Session, batchSize: int, condition=None) -> Set[str]:
+    """Storage keys of every attachment row, or of the rows matching `condition`"""
+    query = db.query(Attachment.FilePath)
+    if condition is not None:
+        query = query.filter(condition)
+    keys = set()
+    for (filePath,) in query.yield_per(batchSize):
+        key = StorageKey(filePath)
+        if key is not None:
+            keys.add(key)
+    return keys
+
+
+def PurgeDeletedAttachments(
+    db: Session,
+    report: Dict,
+    backend: StorageBackend = storageBackend,
+    graceDays: int = ATTACHMENT_PURGE_GRACE_DAYS,
+    batchSize: int = STORAGE_GC_BATCH_SIZE,
+    dryRun: bool = False,
+    spoolDir: str = UPLOAD_SPOOL_DIR
+) -> None:
+    """Remove the files and rows of attachments soft-deleted before the grace period"""
+    now = datetime.utcnow()
+    if not dryRun:
+        # Rows deleted before DeletedAt existed start their grace period now
+        db.query(Attachment).filter(
+            Attachment.IsDeleted == True,
+            Attachment.DeletedAt.is_(None)
+        ).update({Attachment.DeletedAt: now}, synchronize_session=False)
+        db.commit()
+
+    cutoff = now - timedelta(days=graceDays)
+    purgeable = and_(Attachment.IsDeleted == True, Attachment.DeletedAt < cutoff)
+    lastId = ""
+    while True:
+        rows = db.query(
+            Attachment.Id, Attachment.FilePath, Attachment.FileSize, Attachment.UploadStatus
+        ).filter(
+            purgeable,
+            Attachment.Id > lastId
+        ).order_by(Attachment.Id).limit(batchSize).all()
+        if not rows:
+            return
+        lastId = rows[-1].Id
+
+        attachmentIds = [row.Id for row in rows]
+        for row in rows:
+            if row.UploadStatus == AttachmentUploadStatus.AVAILABLE:
+                key = StorageKey(row.FilePath)
+                if key is None:
+                    continue
+                if not dryRun:
+                    backend.Delete(backend.PathFor(key))
+                report["FilesRemoved"] += 1
+                report["BytesReclaimed"] += row.FileSize or 0
+            else:
+                spoolPath = SpoolPath(row.Id, spoolDir)
+                if os.path.exists(spoolPath):
+                    if not dryRun:
+                        os.remove(spoolPath)
+                    report["FilesRemoved"] += 1
+                    report["BytesReclaimed"] += row.FileSize or 0
+
+        if not dryRun:
+            db.query(Attachment).filter(Attachment.Id.in_(attachmentIds)).delete(synchronize_session=False)
+            db.commit()
+        report["AttachmentsPurged"] += len(rows)
+
+        if len(rows) < batchSize:
+            return
+
+
+def RemoveOrphanStoredFiles(
+    db: Session,
+    report: Dict,
+    backend: StorageBackend = storageBackend,
+    graceSeconds: int = STORAGE_GC_GRACE_SECONDS,
+    batchSize: int = STORAGE_GC_BATCH_SIZE,
+    dryRun: bool = False
+) -> None:
+    """Remove files in the storage backend's attachment directory that no attachment row points at"""
+    cutoff = time.time() - graceSeconds
+    referenced = None
+    for batch in Batched(backend.ListFiles(), batchSize):
+        report["FilesScanned"] += len(batch)
+        candidates = [entry for entry in batch if entry["ModifiedAt"] < cutoff]
+        if not candidates:
+            continue
+
+        if referenced is None:
+            referenced = ReferencedStorageKeys(db, batchSize)
+        for entry in candidates:
+            if StorageKey(entry["Path"]) in referenced:
+                continue
+            if not dryRun:
+                backend.Delete(entry["Path"])
+            report["FilesRemoved"] += 1
+            report["BytesReclaimed"] += entry["Size"]
+
+
+def RemoveOrphanSpoolFiles(
+    db: Session,
+    report: Dict,
+    graceSeconds: int = STORAGE_GC_GRACE_SECONDS,
+    batchSize: int = STORAGE_GC_BATCH_SIZE,
+    dryRun: bool = False,
+    spoolDir: str = UPLOAD_SPOOL_DIR
+) -> None:
+    """Remove spooled uploads that no pending attachment is waiting on"""
+    if not os.path.isdir(spoolDir):
+        return
+
+    cutoff = time.time() - graceSeconds
+    with os.scandir(spoolDir) as entries:
+        files = [entry for entry in entries if entry.is_file()]
+
+    for batch in Batched(files, batchSize):
+        report["FilesScanned"] += len(batch)
+        candidates: Dict[str, List] = {}
+        for entry in batch:
+            info = entry.stat()
+            if info.st_mtime < cutoff:
+                attachmentId = entry.name[:-len(".part")] if entry.name.endswith(".part") else entry.name
+                candidates.setdefault(attachmentId, []).append((entry.path, info.st_size))
+        if not candidates:
+            continue
+
+        pending = {
+            attachmentId for (attachmentId,) in db.query(Attachment.Id).filter(
+                Attachment.Id.in_(list(candidates)),
+                Attachment.UploadStatus == AttachmentUploadStatus.PENDING,
+                Attachment.IsDeleted == False
+            ).all()
+        }
+        for attachmentId, spooled in candidates.items():
+            if attachmentId in pending:
+                continue
+            for path, size in spooled:
+                if not dryRun and os.path.exists(path):
+                    os.remove(path)
+                report["FilesRemoved"] += 1
+                report["BytesReclaimed"] += size
+
+
+def MoveLegacyFiles(db: Session, backend: StorageBackend = storageBackend, batchSize: int = STORAGE_GC_BATCH_SIZE) -> int:
+    """Move stored attachments out of the old web-root location; returns how many moved"""
+    keys = ReferencedStorageKeys(db, batchSize, Attachment.UploadStatus == AttachmentUploadStatus.AVAILABLE)
+    return sum(1 for key in sorted(keys) if backend.MoveFromLegacy(key))
+
+
+def CollectStorageGarbage(
+    db: Session,
+    backend: StorageBackend = storageBackend,
+    dryRun: bool = False,
+    batchSize: int = STORAGE_GC_BATCH_SIZE
+) -> Dict:
+    """Purge expired soft-deletes and unreferenced files; returns what was reclaimed"""
+    report = NewReport()
+    PurgeDeletedAttachments(db, report, backend, batchSize=batchSize, dryRun=dryRun)
+    RemoveOrphanStoredFiles(db, report, backend, batchSize=batchSize, dryRun=dryRun)
+    RemoveOrphanSpoolFiles(db, report, batchSize=batchSize, dryRun=dryRun)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import main  # noqa: F401  Loads every model through the routers
+    from Db.session import SessionLocal, engine
+    from Models.StorageUsage import StorageUsage
+    from Repositories.StorageUsageRepository import RepairUsage
+
+    parser = argparse.ArgumentParser(description="Reclaim attachment storage")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without removing it")
+    parser.add_argument("--repair-usage", action="store_true", help="Recompute storage usage counters instead")
+    parser.add_argument(
+        "--move-legacy", action="store_true",
+        help="Move attachments stored in the public web root into the attachment directory instead"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.move_legacy:
+            print(f"Moved {MoveLegacyFiles(db)} attachment files out of the web root.")
+        elif args.repair_usage:
+            StorageUsage.__table__.create(bind=engine, checkfirst=True)
+            print(f"Repaired {RepairUsage(db)} storage usage counters.")
+        else:
+            result = CollectStorageGarbage(db, dryRun=args.dry_run)
+            print(result)
+    finally:
+        db.close()
+        storageBackend.Close()
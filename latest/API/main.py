@@ -17,9 +17,15 @@ from Router.RiskRouter import router as risk_router
 from Router.ResourcesRouter import router as resource_router
 from Router.AttachmentRouter import router as attachment_router
 from Router.StakeholderRouter import router as stakeholder_router
+from Router.FileRouter import router as file_router
 
 # Database
 from Db.session import engine, Base
+from Db.upgrade import UpgradeSchema
+from Core.config import DOWNLOAD_URL_SECRET
+from Core.storage import storageBackend
+from Services.AttachmentUploadWorker import uploadWorker
+from Services.RiskSimulationService import ShutdownSimulationPool
 
 app = FastAPI(
     title="Taskup API",
@@ -40,10 +46,21 @@ app.add_middleware(
 # ✅ Create tables
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all never adds columns to existing tables
+    UpgradeSchema(engine)
 
 @app.on_event("startup")
 def on_startup():
+    if not DOWNLOAD_URL_SECRET:
+        raise RuntimeError("DOWNLOAD_URL_SECRET must be set; download links are signed with it")
     init_db()
+    uploadWorker.Start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    uploadWorker.Stop()
+    storageBackend.Close()
+    ShutdownSimulationPool()
 
 # ✅ Health check route
 @app.get("/")
@@ -63,6 +80,7 @@ app.include_router(risk_router)
 app.include_router(resource_router)
 app.include_router(attachment_router)
 app.include_router(stakeholder_router)
+app.include_router(file_router)
 
 # ✅ Run app
 if __name__ == "__main__":
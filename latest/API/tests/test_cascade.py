@@ -0,0 +1,106 @@
+import importlib
+import pkgutil
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import Models
+from Core.cascade import SoftDeleteCascade
+from Db.session import Base
+from Models.Project import Project
+from Models.Task import Task
+
+# Relationships are declared by name, so every model has to be loaded
+for module in pkgutil.iter_modules(Models.__path__):
+    importlib.import_module(f"Models.{module.name}")
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def AddRow(db, table, **values):
+    """Insert a row, filling required columns the test does not care about"""
+    columns = Base.metadata.tables[table].c
+    for column in columns:
+        if column.name in values or column.nullable or column.primary_key or column.default is not None:
+            continue
+        typeName = str(column.type)
+        if typeName.startswith(("INT", "FLOAT", "NUMERIC", "BOOL")):
+            values[column.name] = 0
+        elif "DATE" in typeName:
+            values[column.name] = "2024-01-01"
+        else:
+            values[column.name] = "x"
+    db.execute(columns[0].table.insert().values(**values))
+
+
+def Flags(db, table):
+    return dict(db.execute(text(f"SELECT Id, IsDeleted FROM {table}")).all())
+
+
+def test_task_tree_is_deleted_level_by_level(db):
+    AddRow(db, "Project", Id="p1", IsDeleted=False, RemainingBudget=0)
+    for taskId, parentId in [("t1", None), ("t2", "t1"), ("t3", "t2"), ("t4", "t3"), ("other", None)]:
+        AddRow(db, "Task", Id=taskId, ProjectId="p1", ParentTaskId=parentId, IsDeleted=False)
+    db.commit()
+
+    counts = SoftDeleteCascade(db, Task, ["t1"])
+
+    assert counts["Task"] == 4
+    assert Flags(db, "Task") == {"t1": 1, "t2": 1, "t3": 1, "t4": 1, "other": 0}
+
+
+def test_parent_loop_terminates(db):
+    AddRow(db, "Project", Id="p1", IsDeleted=False, RemainingBudget=0)
+    AddRow(db, "Task", Id="a", ProjectId="p1", ParentTaskId="b", IsDeleted=False)
+    AddRow(db, "Task", Id="b", ProjectId="p1", ParentTaskId="a", IsDeleted=False)
+    AddRow(db, "Task", Id="c", ProjectId="p1", ParentTaskId="b", IsDeleted=False)
+    db.commit()
+
+    counts = SoftDeleteCascade(db, Task, ["a"])
+
+    assert counts["Task"] == 3
+    assert set(Flags(db, "Task").values()) == {1}
+
+
+def test_project_cascade_reaches_every_child_table_in_one_commit(db):
+    AddRow(db, "Project", Id="p1", IsDeleted=False, RemainingBudget=0)
+    AddRow(db, "Project", Id="p2", IsDeleted=False, RemainingBudget=0)
+    AddRow(db, "Team", Id="team", ProjectId="p1", IsDeleted=False)
+    AddRow(db, "TeamMember", Id="member", TeamId="team", UserId="u", IsActive=True)
+    AddRow(db, "Risks", Id="risk", ProjectId="p1", Probability=0.5, Impact=1, IsDeleted=False)
+    AddRow(db, "RiskAnalyses", Id="analysis", RiskId="risk", IsDeleted=False)
+    AddRow(db, "Task", Id="t1", ProjectId="p1", IsDeleted=False)
+    AddRow(db, "Task", Id="t2", ProjectId="p1", ParentTaskId="t1", IsDeleted=False)
+    AddRow(db, "Task", Id="kept", ProjectId="p2", IsDeleted=False)
+    db.commit()
+    db.statements.clear()
+
+    counts = SoftDeleteCascade(db, Project, ["p1"])
+
+    assert counts["Project"] == 1
+    assert counts["Task"] == 2
+    assert counts["Risks"] == 1
+    assert counts["RiskAnalyses"] == 1
+    assert counts["TeamMember"] == 1
+    assert Flags(db, "Task")["kept"] == 0
+    assert sum(statement.startswith("COMMIT") for statement in db.statements) <= 1
+
+
+def test_already_deleted_rows_are_not_counted_again(db):
+    AddRow(db, "Project", Id="p1", IsDeleted=False, RemainingBudget=0)
+    AddRow(db, "Task", Id="t1", ProjectId="p1", IsDeleted=False)
+    AddRow(db, "Task", Id="t2", ProjectId="p1", ParentTaskId="t1", IsDeleted=True)
+    db.commit()
+
+    assert SoftDeleteCascade(db, Task, ["t1"])["Task"] == 1
+    assert SoftDeleteCascade(db, Task, ["t1"]).get("Task", 0) == 0
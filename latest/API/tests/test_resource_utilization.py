@@ -0,0 +1,69 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from Services.ResourceUtilizationService import BuildUtilization
+
+
+def Resource(resourceId, total):
+    return SimpleNamespace(Id=resourceId, Name=resourceId, Unit="h", Total=total)
+
+
+def Assignment(resourceId, quantity, createdAt, deadline):
+    return SimpleNamespace(
+        ResourceId=resourceId, Quantity=quantity,
+        CreatedAt=datetime.combine(createdAt, datetime.min.time()) if createdAt else None,
+        Deadline=datetime.combine(deadline, datetime.min.time()) if deadline else None
+    )
+
+
+def test_weekly_bucket_takes_the_peak_day_not_the_sum():
+    resources = [Resource("crane", 1)]
+    assignments = [
+        # Monday-Tuesday and Thursday-Friday of the same week never overlap
+        Assignment("crane", 1, date(2024, 1, 1), date(2024, 1, 2)),
+        Assignment("crane", 1, date(2024, 1, 4), date(2024, 1, 5)),
+    ]
+
+    result = BuildUtilization(resources, assignments, bucketDays=7, maxBuckets=10)
+
+    row = result["Resources"][0]
+    assert row["Demand"] == [1.0]
+    assert row["OverAllocatedBuckets"] == []
+    assert result["OverAllocations"] == []
+
+
+def test_overlapping_days_are_over_allocated():
+    resources = [Resource("crane", 1), Resource("crew", None)]
+    assignments = [
+        Assignment("crane", 1, date(2024, 1, 1), date(2024, 1, 3)),
+        Assignment("crane", 2, date(2024, 1, 3), date(2024, 1, 9)),
+        Assignment("crew", 4, date(2024, 1, 8), date(2024, 1, 8)),
+        Assignment("crew", 5, None, None),
+    ]
+
+    result = BuildUtilization(resources, assignments, bucketDays=7, maxBuckets=10)
+
+    crane, crew = result["Resources"]
+    assert result["Buckets"] == [date(2024, 1, 1), date(2024, 1, 8)]
+    assert crane["Demand"] == [3.0, 2.0]
+    assert crane["Utilization"] == [3.0, 2.0]
+    assert crane["OverAllocatedBuckets"] == [0, 1]
+    assert result["OverAllocations"][0]["Excess"] == 2.0
+    assert crew["Demand"] == [0.0, 4.0]
+    assert crew["PeakUtilization"] is None
+    assert result["UnscheduledDemand"] == {"crew": 5}
+
+
+def test_range_limits_and_daily_buckets():
+    resources = [Resource("crane", 2)]
+    assignments = [Assignment("crane", 1, date(2023, 12, 30), date(2024, 1, 2))]
+
+    result = BuildUtilization(
+        resources, assignments, bucketDays=1, maxBuckets=10, start=date(2024, 1, 1), end=date(2024, 1, 3)
+    )
+
+    assert result["Resources"][0]["Demand"] == [1.0, 1.0, 0.0]
+    with pytest.raises(ValueError):
+        BuildUtilization(resources, assignments, bucketDays=1, maxBuckets=2, start=date(2024, 1, 1), end=date(2024, 1, 3))
@@ -0,0 +1,43 @@
+import importlib
+import pkgutil
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+import Models
+from Db.upgrade import UpgradeSchema
+from Models.Attachment import Attachment, AttachmentUploadStatus
+
+for module in pkgutil.iter_modules(Models.__path__):
+    importlib.import_module(f"Models.{module.name}")
+
+
+def test_existing_attachment_table_gets_the_new_columns():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE Attachment (Id VARCHAR(36) PRIMARY KEY, ProjectId VARCHAR(36) NOT NULL, "
+            "EntityType VARCHAR(8) NOT NULL, EntityId VARCHAR(36) NOT NULL, FileName VARCHAR(255) NOT NULL, "
+            "FileType VARCHAR(50), FileSize INTEGER, FilePath VARCHAR(500) NOT NULL, "
+            "OwnerId VARCHAR(36) NOT NULL, IsDeleted BOOLEAN, UploadedAt DATETIME)"
+        ))
+        connection.execute(text(
+            "INSERT INTO Attachment (Id, ProjectId, EntityType, EntityId, FileName, FilePath, OwnerId, IsDeleted) "
+            "VALUES ('a1', 'p1', 'SCOPE', 'e1', 'a.txt', '/public_html/a.txt', 'u1', 0)"
+        ))
+
+    added = UpgradeSchema(engine)
+
+    assert added == [
+        "Attachment.UploadStatus", "Attachment.UploadAttempts", "Attachment.UploadError", "Attachment.DeletedAt"
+    ]
+    columns = {column["name"]: column for column in inspect(engine).get_columns("Attachment")}
+    assert columns["UploadStatus"]["nullable"] is False
+    db = sessionmaker(bind=engine)()
+    attachment = db.get(Attachment, "a1")
+    assert attachment.UploadStatus == AttachmentUploadStatus.AVAILABLE
+    assert attachment.UploadAttempts == 0
+    assert attachment.DeletedAt is None
+
+    # Running it again changes nothing
+    assert UpgradeSchema(engine) == []
@@ -0,0 +1,176 @@
+import importlib
+import os
+import pkgutil
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import Models
+from Core.storage import LocalStorageBackend, SpoolPath
+from Db.session import Base
+from Models.Attachment import Attachment, AttachmentEntityType, AttachmentUploadStatus
+from Models.StorageUsage import StorageUsage
+from Repositories.StorageUsageRepository import ChargeUsage
+from Services.AttachmentUploadWorker import AttachmentUploadWorker
+
+for module in pkgutil.iter_modules(Models.__path__):
+    importlib.import_module(f"Models.{module.name}")
+
+
+class FlakyBackend(LocalStorageBackend):
+    """Local storage that fails the first `failures` saves"""
+
+    def __init__(self, rootDir, failures):
+        super().__init__(rootDir)
+        self.failures = failures
+
+    def Save(self, stream, fileName):
+        if self.failures:
+            self.failures -= 1
+            raise IOError("connection reset")
+        return super().Save(stream, fileName)
+
+
+@pytest.fixture
+def sessionFactory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def MakeWorker(tmp_path, sessionFactory, failures=0, maxAttempts=3):
+    worker = AttachmentUploadWorker(
+        backend=FlakyBackend(str(tmp_path / "store"), failures),
+        sessionFactory=sessionFactory,
+        workerCount=1,
+        maxAttempts=maxAttempts,
+        retryBaseSeconds=2,
+        spoolDir=str(tmp_path / "spool")
+    )
+    worker.retries = []
+    worker.EnqueueLater = lambda attachmentId, delay: worker.retries.append((attachmentId, delay))
+    return worker
+
+
+def AddPending(db, worker, attachmentId, data=b"data", spooled=True, deleted=False):
+    db.add(Attachment(
+        Id=attachmentId, ProjectId="p1", EntityType=AttachmentEntityType.SCOPE, EntityId="e1",
+        FileName=f"{attachmentId}.txt", FileSize=len(data), FilePath="", OwnerId="u1",
+        IsDeleted=deleted, UploadStatus=AttachmentUploadStatus.PENDING
+    ))
+    ChargeUsage(db, "p1", "u1", len(data))
+    db.commit()
+    if spooled:
+        os.makedirs(worker.spoolDir, exist_ok=True)
+        with open(SpoolPath(attachmentId, worker.spoolDir), "wb") as spool:
+            spool.write(data)
+
+
+def Usage(db):
+    return {row.ScopeType: (row.Bytes, row.Files) for row in db.query(StorageUsage).all()}
+
+
+def test_spooled_upload_becomes_available(tmp_path, sessionFactory):
+    worker = MakeWorker(tmp_path, sessionFactory)
+    db = sessionFactory()
+    AddPending(db, worker, "a1")
+
+    worker.Process("a1")
+
+    db.expire_all()
+    attachment = db.get(Attachment, "a1")
+    assert attachment.UploadStatus == AttachmentUploadStatus.AVAILABLE
+    assert attachment.UploadAttempts == 1
+    assert os.path.basename(attachment.FilePath) == "a1.txt"
+    with open(attachment.FilePath, "rb") as stored:
+        assert stored.read() == b"data"
+    assert not (tmp_path / "spool" / "a1").exists()
+    assert Usage(db) == {"Project": (4, 1), "User": (4, 1)}
+
+
+def test_failed_push_backs_off_then_gives_up(tmp_path, sessionFactory):
+    worker = MakeWorker(tmp_path, sessionFactory, failures=5, maxAttempts=2)
+    db = sessionFactory()
+    AddPending(db, worker, "a1")
+
+    worker.Process("a1")
+
+    db.expire_all()
+    attachment = db.get(Attachment, "a1")
+    assert attachment.UploadStatus == AttachmentUploadStatus.PENDING
+    assert attachment.UploadError == "connection reset"
+    assert worker.retries == [("a1", 2)]
+    assert (tmp_path / "spool" / "a1").exists()
+
+    worker.Process("a1")
+
+    db.expire_all()
+    attachment = db.get(Attachment, "a1")
+    assert attachment.UploadStatus == AttachmentUploadStatus.FAILED
+    assert attachment.UploadAttempts == 2
+    assert worker.retries == [("a1", 2)]
+    assert not (tmp_path / "spool" / "a1").exists()
+    assert Usage(db) == {"Project": (0, 0), "User": (0, 0)}
+
+
+def test_retry_succeeds_after_a_transient_failure(tmp_path, sessionFactory):
+    worker = MakeWorker(tmp_path, sessionFactory, failures=1)
+    db = sessionFactory()
+    AddPending(db, worker, "a1")
+
+    worker.Process("a1")
+    worker.Process("a1")
+
+    db.expire_all()
+    attachment = db.get(Attachment, "a1")
+    assert attachment.UploadStatus == AttachmentUploadStatus.AVAILABLE
+    assert attachment.UploadError is None
+    assert attachment.UploadAttempts == 2
+
+
+def test_missing_spool_fails_and_releases_usage(tmp_path, sessionFactory):
+    worker = MakeWorker(tmp_path, sessionFactory)
+    db = sessionFactory()
+    AddPending(db, worker, "a1", spooled=False)
+
+    worker.Process("a1")
+
+    db.expire_all()
+    assert db.get(Attachment, "a1").UploadStatus == AttachmentUploadStatus.FAILED
+    assert Usage(db) == {"Project": (0, 0), "User": (0, 0)}
+
+
+def test_resume_requeues_only_live_pending_rows(tmp_path, sessionFactory):
+    worker = MakeWorker(tmp_path, sessionFactory)
+    db = sessionFactory()
+    AddPending(db, worker, "pending")
+    AddPending(db, worker, "deleted", deleted=True)
+    AddPending(db, worker, "done")
+    worker.Process("done")
+
+    worker.ResumePending()
+
+    assert [worker.jobs.get_nowait() for _ in range(worker.jobs.qsize())] == ["pending"]
+
+
+def test_uploads_with_the_same_name_are_stored_apart(tmp_path, sessionFactory):
+    worker = MakeWorker(tmp_path, sessionFactory)
+    db = sessionFactory()
+    AddPending(db, worker, "a1", data=b"first")
+    AddPending(db, worker, "a2", data=b"second")
+    for attachmentId in ("a1", "a2"):
+        attachment = db.get(Attachment, attachmentId)
+        attachment.FileName = "report.PDF"
+    db.commit()
+
+    worker.Process("a1")
+    worker.Process("a2")
+
+    db.expire_all()
+    paths = [db.get(Attachment, attachmentId).FilePath for attachmentId in ("a1", "a2")]
+    assert [os.path.basename(path) for path in paths] == ["a1.pdf", "a2.pdf"]
+    for path, data in zip(paths, (b"first", b"second")):
+        with open(path, "rb") as stored:
+            assert stored.read() == data
@@ -16,6 +16,8 @@ class Attachment(Base):
     FileType = Column(String(50))
     FileSize = Column(Integer)
     FilePath = Column(String(500), nullable=False)
+    # SHA-256 of the content; AttachmentBlob.Hash when the file lives in the blob store
+    ContentHash = Column(String(64), index=True)
     UploadedById = Column(String(36), ForeignKey("User.Id"), nullable=False)
     UploadedAt = Column(DateTime, default=datetime.utcnow)
 
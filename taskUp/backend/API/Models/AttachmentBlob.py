@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer
+from Db.session import Base
+
+
+class AttachmentBlob(Base):
+    """Deduplicated attachment content, stored once per SHA-256 digest"""
+
+    __tablename__ = "AttachmentBlob"
+
+    Hash = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    Size = Column(Integer, nullable=False)
+    Path = Column(String(500), nullable=False)
+    RefCount = Column(Integer, nullable=False, default=0)  # Attachment rows pointing here
+    CreatedAt = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from Db.session import Base
 
@@ -14,12 +14,18 @@ class ChatMessage(Base):
     UserId = Column(String(36), ForeignKey("User.Id", ondelete="CASCADE"), nullable=False)
     Content = Column(Text, nullable=False)
     SentAt = Column(DateTime, default=datetime.utcnow)
+    # Deprecated: read state is tracked per user in ChatReadCursor
     IsRead = Column(Boolean, default=False)
 
     # Relationships
     Project = relationship("Project", back_populates="ChatMessages")
     User = relationship("User")
 
+    # history and unread counts are range scans over a room's messages
+    __table_args__ = (
+        Index("ix_ChatMessage_ProjectId_SentAt", "ProjectId", "SentAt"),
+    )
+
 
     #lazim olsa uncomment edin
 
@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from Db.session import Base
+
+
+class ChatReadCursor(Base):
+
+    __tablename__ = "ChatReadCursor"
+
+    Id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    ProjectId = Column(String(36), ForeignKey("Project.Id", ondelete="CASCADE"), nullable=False)
+    UserId = Column(String(36), ForeignKey("User.Id", ondelete="CASCADE"), nullable=False)
+
+    # Messages sent after this point are unread for the user
+    LastReadSentAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    UpdatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    Project = relationship("Project")
+    User = relationship("User")
+
+    # one cursor per user per room
+    __table_args__ = (
+        UniqueConstraint("ProjectId", "UserId", name="uq_chat_read_cursor_project_user"),
+    )
@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from Db.session import Base
+from API.utils.notification_templates import render_notification
 
 
 class Notification(Base):
@@ -12,15 +13,41 @@ class Notification(Base):
     Id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     UserId = Column(String(36), ForeignKey("User.Id", ondelete="CASCADE"), nullable=False)
     Type = Column(String(50), nullable=False)  # task_assigned, comment_added, etc.
-    Message = Column(Text, nullable=False)
+    # Legacy fully rendered text; new rows store TemplateCode + Params instead
+    Message = Column(Text, nullable=True)
+    TemplateCode = Column(String(50))
+    Params = Column(Text)  # Compact JSON template parameters
     RelatedEntityId = Column(String(36))  # ID of task, project, etc.
     RelatedEntityType = Column(String(50))  # Type of related object
     IsRead = Column(Boolean, default=False)
     CreatedAt = Column(DateTime, default=datetime.utcnow)
 
+    # Repeats of the same (user, type, entity) within the coalescing window
+    # update this row instead of inserting a new one
+    Count = Column(Integer, nullable=False, default=1)
+    LastActorId = Column(String(36))
+    UpdatedAt = Column(DateTime)
+    # Time of the latest coalesced event; the window itself stays anchored on CreatedAt
+    LastActivityAt = Column(DateTime, default=datetime.utcnow)
+
     # Relationships
     User = relationship("User", back_populates="Notifications")
 
+    # per-user listing and the retention job both scan by LastActivityAt
+    __table_args__ = (
+        Index("ix_Notification_UserId_LastActivityAt", "UserId", "LastActivityAt"),
+        Index("ix_Notification_LastActivityAt", "LastActivityAt"),
+        Index("ix_Notification_Coalesce", "UserId", "Type", "RelatedEntityId", "CreatedAt"),
+    )
+
+    @property
+    def RenderedMessage(self) -> str:
+        """Message text rendered from the template, or the legacy stored text"""
+        rendered = self.__dict__.get("_rendered_message")
+        if rendered is not None:
+            return rendered
+        return render_notification(self.TemplateCode, self.Params, self.Message)
+
     # @property
     # def TimeElapsed(self):
     #     now = datetime.utcnow()
@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, Text, Index
+from Db.session import Base
+
+
+class NotificationArchive(Base):
+    """Notifications moved out of the live table by the retention job"""
+
+    __tablename__ = "NotificationArchive"
+
+    # Same Id as the original Notification row
+    Id = Column(String(36), primary_key=True)
+    UserId = Column(String(36), nullable=False)
+    Type = Column(String(50), nullable=False)
+    Message = Column(Text, nullable=True)
+    TemplateCode = Column(String(50))
+    Params = Column(Text)
+    RelatedEntityId = Column(String(36))
+    RelatedEntityType = Column(String(50))
+    IsRead = Column(Boolean, default=False)
+    CreatedAt = Column(DateTime)
+    Count = Column(Integer, nullable=False, default=1)
+    LastActorId = Column(String(36))
+    UpdatedAt = Column(DateTime)
+    LastActivityAt = Column(DateTime)
+    ArchivedAt = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_NotificationArchive_UserId_CreatedAt", "UserId", "CreatedAt"),
+    )
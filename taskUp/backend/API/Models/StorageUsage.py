@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger
+from Db.session import Base
+
+
+class StorageUsage(Base):
+    """Running attachment storage totals for one project or one user"""
+
+    __tablename__ = "StorageUsage"
+
+    ScopeType = Column(String(10), primary_key=True)  # "project" or "user"
+    ScopeId = Column(String(36), primary_key=True)
+    Bytes = Column(BigInteger, nullable=False, default=0)
+    Files = Column(Integer, nullable=False, default=0)
+    UpdatedAt = Column(DateTime, default=datetime.utcnow)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, Boolean, Integer, Text, ForeignKey, CheckConstraint, Numeric
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import backref, relationship, validates
 from Db.session import Base
 
 
@@ -21,6 +21,7 @@ class Task(Base):
     # subtask create edende lazim olar
     ParentTaskId = Column(String(36), ForeignKey("Task.Id", ondelete="CASCADE"), nullable=True)
     Deadline = Column(DateTime)
+    DurationDays = Column(Integer, default=1)  # Planned working length for the critical path
     BudgetAllocated = Column(Numeric(12, 2), default=0)
    # BudgetUsed = Column(Numeric(12, 2), default=0)
     PriorityId = Column(String(36), ForeignKey("Priority.Id"), nullable=False)
@@ -43,8 +44,11 @@ class Task(Base):
     # Relationships
     Project = relationship("Project", back_populates="Tasks")
     Team = relationship("Team", back_populates="Tasks")
-    AssignedUsers = relationship("User", secondary="TaskAssignment", back_populates="TasksAssigned")
-    Subtasks = relationship("Task", backref="ParentTask", remote_side=[Id], cascade="all, delete-orphan")
+    AssignedUsers = relationship(
+        "User", secondary="TaskAssignment", back_populates="TasksAssigned",
+        primaryjoin="Task.Id == TaskAssignment.TaskId", secondaryjoin="User.Id == TaskAssignment.UserId"
+    )
+    Subtasks = relationship("Task", backref=backref("ParentTask", remote_side=[Id]), cascade="all, delete-orphan")
     Comments = relationship("Comment", back_populates="Task", cascade="all, delete-orphan")
     Attachments = relationship("Attachment", back_populates="Task", cascade="all, delete-orphan")
     Priority = relationship("Priority")
@@ -17,7 +17,7 @@ class TaskAssignment(Base):
 
     # Relationships
     Task = relationship("Task")
-    User = relationship("User")
+    User = relationship("User", foreign_keys=[UserId])
     Assigner = relationship("User", foreign_keys=[AssignedBy])
 
     #  unique user per task
@@ -0,0 +1,22 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, UniqueConstraint, CheckConstraint
+from Db.session import Base
+
+
+class TaskDependency(Base):
+    """Finish-to-start link: the successor cannot start until LagDays after the predecessor finishes"""
+
+    __tablename__ = "TaskDependency"
+
+    Id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    PredecessorId = Column(String(36), ForeignKey("Task.Id", ondelete="CASCADE"), nullable=False, index=True)
+    SuccessorId = Column(String(36), ForeignKey("Task.Id", ondelete="CASCADE"), nullable=False, index=True)
+    LagDays = Column(Integer, nullable=False, default=0)
+    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedBy = Column(String(36), ForeignKey("User.Id"), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("PredecessorId", "SuccessorId", name="uq_task_dependency"),
+        CheckConstraint("PredecessorId <> SuccessorId", name="check_task_dependency_not_self"),
+    )
@@ -28,7 +28,10 @@ class User(Base):
 
     # Relationships
     Teams = relationship("Team", secondary="TeamMember", back_populates="Members")
-    TasksAssigned = relationship("Task", secondary="TaskAssignment", back_populates="AssignedUsers")
+    TasksAssigned = relationship(
+        "Task", secondary="TaskAssignment", back_populates="AssignedUsers",
+        primaryjoin="User.Id == TaskAssignment.UserId", secondaryjoin="Task.Id == TaskAssignment.TaskId"
+    )
     TasksCreated = relationship("Task", foreign_keys="Task.CreatedBy", back_populates="Creator")
     Comments = relationship("Comment", back_populates="User")
     Notifications = relationship("Notification", back_populates="User")
@@ -3,13 +3,18 @@ from .Project import *
 from .Team import *
 from .Task import *
 from .TaskAssignment import *
+from .TaskDependency import *
 from .TeamMember import *
 from .Comment import *
 from .Attachment import *
+from .AttachmentBlob import *
+from .StorageUsage import *
 from .Notification import *
+from .NotificationArchive import *
 from .ProjectStakeholder import *
 from .ProjectScope import *
 from .ChatMessage import *
+from .ChatReadCursor import *
 from .AssignmentType import *
 from .Priority import *
 from .Status import *
@@ -28,12 +33,17 @@ __all__ = [
     'Status',
     'Comment',
     'Attachment',
+    'AttachmentBlob',
+    'StorageUsage',
     'Notification',
+    'NotificationArchive',
     'ProjectStakeholder',
     'ProjectScope',
     'TeamMember',
     'TaskAssignment',
+    'TaskDependency',
     'ChatMessage',
+    'ChatReadCursor',
     'AssignmentType',
     'TeamProject',
     'Expense',
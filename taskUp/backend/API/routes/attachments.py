@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
+from urllib.parse import quote
 import os
 
 from Db.session import get_db
 from API.utils.dependencies import get_current_active_user
 from API.Models.User import User
 from API.Models.Attachment import Attachment
-from API.schemas.attachment import AttachmentResponse
+from API.schemas.attachment import AttachmentResponse, AttachmentDownloadUrlResponse
 from API.services.task_service import save_attachment, delete_attachment, get_task_by_id
+from API.services.download_service import attachment_response
+from API.services.signed_url_service import create_download_link
+from API.services.archive_service import archive_response, get_task_archive_entries, safe_name
 
 router = APIRouter(
     prefix="/tasks/{task_id}/attachments",
@@ -39,13 +43,27 @@ def upload_attachment(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Upload file attachment for a task"""
+    """Upload file attachment for a task (use /tasks/{task_id}/uploads for large files)"""
     return save_attachment(file, task_id, current_user.Id, db)
 
-@router.get("/{attachment_id}", response_class=FileResponse)
+@router.get("/archive", response_class=StreamingResponse)
+def download_task_attachments_archive(
+    task_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download all attachments of a task as a streamed ZIP archive"""
+    task = get_task_by_id(db, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return archive_response(get_task_archive_entries(db, task_id), safe_name(task.Title, "task"))
+
+@router.api_route("/{attachment_id}", methods=["GET", "HEAD"], response_class=FileResponse)
 def download_attachment(
     task_id: str,
     attachment_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -59,15 +77,29 @@ def download_attachment(
     if not db_attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
     
-    # Check if file exists
-    if not os.path.exists(db_attachment.FilePath):
-        raise HTTPException(status_code=404, detail="Attachment file not found")
+    # Supports Range, If-None-Match and proxy hand-off
+    return attachment_response(request, db_attachment)
+
+@router.get("/{attachment_id}/url", response_model=AttachmentDownloadUrlResponse)
+def get_attachment_download_url(
+    task_id: str,
+    attachment_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a short-lived signed link that downloads the attachment without auth"""
+    db_attachment = db.query(Attachment).filter(
+        Attachment.Id == attachment_id, 
+        Attachment.TaskId == task_id
+    ).first()
+    
+    if not db_attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
     
-    return FileResponse(
-        db_attachment.FilePath, 
-        filename=db_attachment.FileName,
-        media_type=db_attachment.FileType
-    )
+    link = create_download_link(db_attachment)
+    url = request.url_for("download_signed_file", relative_path=quote(link["path"])).include_query_params(**link["params"])
+    return {"Url": str(url), "ExpiresAt": link["expires_at"]}
 
 @router.delete("/{attachment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def remove_attachment(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Dict, Set
 import json
@@ -10,7 +10,15 @@ from API.Models.ChatMessage import ChatMessage
 from API.Models.Project import Project
 from API.Models.User import User
 from API.utils.auth import create_access_token
-from API.utils.dependencies import get_current_user
+from API.utils.dependencies import get_current_user, get_current_active_user
+from API.schemas.chat import (
+    ChatReadCursorUpdate, ChatReadCursorResponse, ChatUnreadCount, ChatUnreadCountListResponse
+)
+from API.services.chat_service import (
+    chat_buffer, chat_history, chat_presence, load_recent_history, to_chat_payload,
+    mark_room_read, count_unread_messages, count_unread_messages_by_project
+)
+from API.services.project_service import has_project_access, get_accessible_project_ids
 
 router = APIRouter(
     prefix="/chat",
@@ -18,9 +26,6 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Active connections by project_id
-active_connections: Dict[str, Set[WebSocket]] = {}
-
 async def get_db_websocket():
     """Database dependency for WebSockets"""
     db = next(get_db())
@@ -29,6 +34,60 @@ async def get_db_websocket():
     finally:
         db.close()
 
+@router.get("/history-cache/stats")
+def read_history_cache_stats(current_user: User = Depends(get_current_user)):
+    """Get hit/miss metrics for the in-memory chat history"""
+    return chat_history.stats()
+
+@router.get("/{project_id}/presence")
+async def read_presence(
+    project_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the users currently online in a project chat room"""
+    if not has_project_access(db, project_id, current_user.Id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this project")
+    
+    online_user_ids = chat_presence.online_users(project_id)
+    return {"projectId": project_id, "onlineUserIds": online_user_ids, "count": len(online_user_ids)}
+
+@router.get("/unread", response_model=ChatUnreadCountListResponse)
+def read_unread_counts(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get unread message counts for every chat room the user belongs to"""
+    project_ids = get_accessible_project_ids(db, current_user.Id)
+    counts = count_unread_messages_by_project(db, current_user.Id, project_ids)
+    items = [{"ProjectId": project_id, "UnreadCount": count} for project_id, count in counts.items()]
+    return {"items": items, "total": sum(counts.values())}
+
+@router.get("/{project_id}/unread", response_model=ChatUnreadCount)
+def read_project_unread_count(
+    project_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the unread message count for a project chat room"""
+    if not has_project_access(db, project_id, current_user.Id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this project")
+    
+    return {"ProjectId": project_id, "UnreadCount": count_unread_messages(db, project_id, current_user.Id)}
+
+@router.post("/{project_id}/read", response_model=ChatReadCursorResponse)
+def mark_project_read(
+    project_id: str,
+    cursor: ChatReadCursorUpdate = ChatReadCursorUpdate(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark a project chat room as read"""
+    if not has_project_access(db, project_id, current_user.Id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this project")
+    
+    return mark_room_read(db, project_id, current_user.Id, cursor.LastReadSentAt)
+
 @router.websocket("/ws/{project_id}/{token}")
 async def websocket_endpoint(
     websocket: WebSocket, 
@@ -53,52 +112,26 @@ async def websocket_endpoint(
             await websocket.close(code=1008)
             return
         
-        # Check if project exists and user has access
-        project = db.query(Project).filter(Project.Id == project_id, Project.IsDeleted == False).first()
-        if not project:
-            await websocket.close(code=1008)
-            return
-        
-        # Check user access to project (creator, stakeholder, or team member)
-        has_access = (
-            project.CreatedBy == user_id or
-            any(s.UserId == user_id for s in project.Stakeholders) or
-            any(u.Id == user_id for team in project.Teams for u in team.Members)
-        )
-        
-        if not has_access:
+        # Check project exists and user has access (creator, stakeholder, or team member)
+        if not has_project_access(db, project_id, user_id):
             await websocket.close(code=1008)
             return
         
         # Accept connection
         await websocket.accept()
         
-        # Add to active connections
-        if project_id not in active_connections:
-            active_connections[project_id] = set()
-        active_connections[project_id].add(websocket)
+        # Register the connection and announce the user if they just came online
+        if chat_presence.connect(project_id, user_id, websocket):
+            await chat_presence.broadcast(project_id, {"type": "presence", "userId": user_id, "status": "online"})
         
         try:
-            # Send last 50 messages as history
-            history = (
-                db.query(ChatMessage)
-                .filter(ChatMessage.ProjectId == project_id)
-                .order_by(ChatMessage.SentAt.desc())
-                .limit(50)
-                .all()
-            )
+            # Send recent messages as history, from memory when the room is warm
+            history = chat_history.get(project_id)
+            if history is None:
+                history = load_recent_history(db, project_id)
+                chat_history.fill(project_id, history)
             
-            history_messages = []
-            for msg in reversed(history):
-                sender = db.query(User).filter(User.Id == msg.UserId).first()
-                history_messages.append({
-                    "id": msg.Id,
-                    "content": msg.Content,
-                    "senderId": msg.UserId,
-                    "senderName": f"{sender.FirstName} {sender.LastName}" if sender else "Unknown",
-                    "timestamp": msg.SentAt.isoformat(),
-                    "isHistory": True
-                })
+            history_messages = [dict(message, isHistory=True) for message in history]
             
             if history_messages:
                 await websocket.send_text(json.dumps({
@@ -109,47 +142,35 @@ async def websocket_endpoint(
             # Handle messages
             while True:
                 data = await websocket.receive_text()
+                chat_presence.touch(websocket)
                 message_data = json.loads(data)
                 
-                # Save message to database
-                db_message = ChatMessage(
-                    Id=str(uuid.uuid4()),
-                    ProjectId=project_id,
-                    UserId=user_id,
-                    Content=message_data.get("content", ""),
-                    SentAt=datetime.utcnow(),
-                    IsRead=False
-                )
-                db.add(db_message)
-                db.commit()
+                # Heartbeat frames only refresh the connection
+                frame_type = message_data.get("type")
+                if frame_type == "pong":
+                    continue
+                if frame_type == "ping":
+                    await chat_presence.send(websocket, {"type": "pong"})
+                    continue
                 
-                # Broadcast message to all connected clients
-                response = {
-                    "id": db_message.Id,
-                    "content": db_message.Content,
-                    "senderId": user_id,
-                    "senderName": f"{user.FirstName} {user.LastName}",
-                    "timestamp": db_message.SentAt.isoformat(),
-                    "type": "message"
-                }
+                # Queue message for batched persistence
+                db_message = chat_buffer.add(project_id, user_id, message_data.get("content", ""))
                 
-                if project_id in active_connections:
-                    for connection in active_connections[project_id]:
-                        await connection.send_text(json.dumps(response))
+                message = to_chat_payload(db_message, f"{user.FirstName} {user.LastName}")
+                chat_history.append(project_id, message)
+                
+                # Broadcast message to all connected clients
+                await chat_presence.broadcast(project_id, dict(message, type="message"))
                 
         except WebSocketDisconnect:
-            # Remove from active connections
-            if project_id in active_connections and websocket in active_connections[project_id]:
-                active_connections[project_id].remove(websocket)
-                if not active_connections[project_id]:
-                    del active_connections[project_id]
+            pass
                     
         except Exception as e:
             print(f"WebSocket error: {e}")
-            if project_id in active_connections and websocket in active_connections[project_id]:
-                active_connections[project_id].remove(websocket)
-                if not active_connections[project_id]:
-                    del active_connections[project_id]
+        
+        finally:
+            # No-op if the heartbeat already reaped this connection
+            await chat_presence.reap(websocket)
             
     except Exception as e:
         print(f"Authentication error: {e}")
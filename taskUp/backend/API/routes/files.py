@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Request, Query
+from fastapi.responses import FileResponse
+
+from API.services.download_service import file_response
+from API.services.signed_url_service import verify_download_link
+
+# Serves signed download links. There is deliberately no auth or database
+# dependency here: the link's signature is the permission.
+router = APIRouter(
+    prefix="/files",
+    tags=["attachments"],
+    responses={403: {"description": "Invalid or expired link"}, 404: {"description": "Not found"}},
+)
+
+@router.api_route("/{relative_path:path}", methods=["GET", "HEAD"], response_class=FileResponse)
+def download_signed_file(
+    relative_path: str,
+    request: Request,
+    expires: int = Query(...),
+    name: str = Query(...),
+    type: str = Query(""),
+    hash: str = Query(""),
+    sig: str = Query(...)
+):
+    """Download a file through a signed, expiring link"""
+    path = verify_download_link(relative_path, expires, name, type, hash, sig)
+    return file_response(request, path, name, type or None, hash or None)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -8,8 +9,13 @@ from API.Models.User import User
 from API.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectDetailResponse, ProjectListResponse
 from API.services.project_service import (
     get_project_by_id, get_projects, count_projects, create_project, 
-    update_project, delete_project, update_project_progress
+    update_project, delete_project, update_project_progress, has_project_access
 )
+from API.services.archive_service import archive_response, get_project_archive_entries, safe_name
+from API.services.quota_service import get_storage_usage, PROJECT_SCOPE
+from API.schemas.attachment import StorageUsageResponse
+from API.schemas.task import ProjectScheduleResponse
+from API.services.schedule_service import get_project_schedule
 
 router = APIRouter(
     prefix="/projects",
@@ -51,6 +57,45 @@ def read_project(
         raise HTTPException(status_code=404, detail="Project not found")
     return db_project
 
+@router.get("/{project_id}/attachments/archive", response_class=StreamingResponse)
+def download_project_attachments_archive(
+    project_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download the attachments of all tasks in a project as a streamed ZIP archive"""
+    db_project = get_project_by_id(db, project_id)
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not has_project_access(db, project_id, current_user.Id):
+        raise HTTPException(status_code=403, detail="You don't have access to this project")
+    
+    return archive_response(get_project_archive_entries(db, project_id), safe_name(db_project.Name, "project"))
+
+@router.get("/{project_id}/storage-usage", response_model=StorageUsageResponse)
+def read_project_storage_usage(
+    project_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the attachment storage used by a project and its quota"""
+    if not has_project_access(db, project_id, current_user.Id):
+        raise HTTPException(status_code=403, detail="You don't have access to this project")
+    
+    return get_storage_usage(db, PROJECT_SCOPE, project_id)
+
+@router.get("/{project_id}/schedule", response_model=ProjectScheduleResponse)
+def read_project_schedule(
+    project_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the critical path schedule of a project's tasks"""
+    if not has_project_access(db, project_id, current_user.Id):
+        raise HTTPException(status_code=403, detail="You don't have access to this project")
+    
+    return get_project_schedule(db, project_id)
+
 @router.put("/{project_id}", response_model=ProjectResponse)
 def update_project_details(
     project_id: str,
@@ -5,11 +5,17 @@ from typing import List, Optional
 from Db.session import get_db
 from API.utils.dependencies import get_current_active_user
 from API.Models.User import User
-from API.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskDetailResponse, TaskListResponse, TaskAssignmentCreate
+from API.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskDetailResponse, TaskListResponse, TaskAssignmentCreate,
+    TaskDependencyCreate, TaskDependencyResponse, TaskTreeNode
+)
 from API.services.task_service import (
     get_task_by_id, get_tasks, count_tasks, create_task, update_task, delete_task,
     assign_user_to_task, remove_user_from_task
 )
+from API.services.project_service import has_project_access
+from API.services.schedule_service import get_task_dependencies, add_task_dependency, remove_task_dependency
+from API.services.task_tree_service import get_task_tree
 
 router = APIRouter(
     prefix="/tasks",
@@ -73,6 +79,21 @@ def read_task(
         raise HTTPException(status_code=404, detail="Task not found")
     return db_task
 
+@router.get("/{task_id}/tree", response_model=TaskTreeNode)
+def read_task_tree(
+    task_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a task with its whole subtask tree and rolled-up budget, expenses and completion"""
+    db_task = get_task_by_id(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not has_project_access(db, db_task.ProjectId, current_user.Id):
+        raise HTTPException(status_code=403, detail="You don't have access to this project")
+    
+    return get_task_tree(db, task_id)
+
 @router.put("/{task_id}", response_model=TaskResponse)
 def update_task_details(
     task_id: str,
@@ -155,4 +176,52 @@ def remove_user(
     if not success:
         raise HTTPException(status_code=404, detail="Assignment not found")
     
-    return None
\ No newline at end of file
+    return None
+
+@router.get("/{task_id}/dependencies", response_model=List[TaskDependencyResponse])
+def read_task_dependencies(
+    task_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the dependencies a task is part of, on either side"""
+    db_task = get_task_by_id(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return get_task_dependencies(db, task_id)
+
+@router.post("/{task_id}/dependencies", response_model=TaskDependencyResponse, status_code=status.HTTP_201_CREATED)
+def create_task_dependency(
+    task_id: str,
+    dependency: TaskDependencyCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Make a task wait for another task to finish; rejects links that would form a cycle"""
+    db_task = get_task_by_id(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not has_project_access(db, db_task.ProjectId, current_user.Id):
+        raise HTTPException(status_code=403, detail="You don't have access to this project")
+    
+    return add_task_dependency(db, db_task, dependency.PredecessorId, dependency.LagDays, current_user.Id)
+
+@router.delete("/{task_id}/dependencies/{dependency_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_task_dependency(
+    task_id: str,
+    dependency_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Remove a dependency from a task"""
+    db_task = get_task_by_id(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not has_project_access(db, db_task.ProjectId, current_user.Id):
+        raise HTTPException(status_code=403, detail="You don't have access to this project")
+    
+    if not remove_task_dependency(db, db_task, dependency_id):
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    
+    return None
@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, status
+from fastapi.responses import Response
+from starlette.requests import ClientDisconnect
+from sqlalchemy.orm import Session
+
+from Db.session import get_db
+from API.utils.dependencies import get_current_active_user
+from API.Models.User import User
+from API.schemas.attachment import AttachmentResponse, UploadSessionCreate, UploadSessionResponse
+from API.services.task_service import get_task_by_id
+from API.services.quota_service import check_storage_quota
+from API.services.upload_service import (
+    create_upload_session, get_upload_session, append_upload_chunk,
+    finalize_upload_session, discard_upload_session
+)
+
+router = APIRouter(
+    prefix="/tasks/{task_id}/uploads",
+    tags=["attachments"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.post("/", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def start_upload(
+    task_id: str,
+    upload: UploadSessionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Start a resumable attachment upload"""
+    task = get_task_by_id(db, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    check_storage_quota(db, task.ProjectId, current_user.Id, upload.FileSize)
+    
+    return create_upload_session(
+        task_id, current_user.Id, upload.FileName, upload.FileType, upload.FileSize
+    )
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+def read_upload(
+    task_id: str,
+    upload_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the current offset of a resumable upload"""
+    session = get_upload_session(upload_id, task_id, current_user.Id)
+    response.headers["Upload-Offset"] = str(session["Offset"])
+    return session
+
+@router.put("/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    task_id: str,
+    upload_id: str,
+    request: Request,
+    response: Response,
+    offset: int = Query(..., ge=0),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Write the request body to a resumable upload starting at `offset`"""
+    try:
+        session = await append_upload_chunk(
+            upload_id, task_id, current_user.Id, offset, request.stream()
+        )
+    except ClientDisconnect:
+        # Whatever arrived is kept; the client resumes from the stored offset
+        return Response(status_code=status.HTTP_400_BAD_REQUEST)
+    
+    response.headers["Upload-Offset"] = str(session["Offset"])
+    return session
+
+@router.post("/{upload_id}/complete", response_model=AttachmentResponse, status_code=status.HTTP_201_CREATED)
+def complete_upload(
+    task_id: str,
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Finish a resumable upload and create the attachment"""
+    return finalize_upload_session(db, upload_id, task_id, current_user.Id)
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_upload(
+    task_id: str,
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Abandon a resumable upload"""
+    get_upload_session(upload_id, task_id, current_user.Id)
+    discard_upload_session(upload_id)
+    return None
@@ -7,6 +7,8 @@ from API.utils.dependencies import get_current_active_user
 from API.Models.User import User
 from API.schemas.user import UserResponse, UserUpdate, UserPasswordChange, UserListResponse
 from API.services.user_service import get_user_by_id, update_user, change_password, get_users, count_users, delete_user
+from API.services.quota_service import get_storage_usage, USER_SCOPE
+from API.schemas.attachment import StorageUsageResponse
 
 router = APIRouter(
     prefix="/users",
@@ -19,6 +21,14 @@ def read_users_me(current_user: User = Depends(get_current_active_user)):
     """Get current authenticated user"""
     return current_user
 
+@router.get("/me/storage-usage", response_model=StorageUsageResponse)
+def read_users_me_storage_usage(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the attachment storage used by the current user and their quota"""
+    return get_storage_usage(db, USER_SCOPE, current_user.Id)
+
 @router.put("/me", response_model=UserResponse)
 def update_user_me(
     user_update: UserUpdate,
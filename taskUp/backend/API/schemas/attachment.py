@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -10,6 +10,7 @@ class AttachmentResponse(BaseModel):
     FileType: Optional[str]
     FileSize: int
     FilePath: str
+    ContentHash: Optional[str] = None
     UploadedById: str
     UploadedAt: datetime
     UploadedBy: dict  # Basic user info
@@ -17,4 +18,32 @@ class AttachmentResponse(BaseModel):
     HumanReadableSize: str  # Derived property
     
     class Config:
-      from_attributes = True
\ No newline at end of file
+      from_attributes = True
+# Signed download link schema
+class AttachmentDownloadUrlResponse(BaseModel):
+    Url: str
+    ExpiresAt: datetime
+
+# Storage usage schema
+class StorageUsageResponse(BaseModel):
+    ScopeType: str
+    ScopeId: str
+    Bytes: int
+    Files: int
+    QuotaBytes: Optional[int] = None  # None when unlimited
+    RemainingBytes: Optional[int] = None
+
+# Resumable upload schemas
+class UploadSessionCreate(BaseModel):
+    FileName: str
+    FileType: Optional[str] = None
+    FileSize: int = Field(..., ge=0)
+
+class UploadSessionResponse(BaseModel):
+    UploadId: str
+    TaskId: str
+    FileName: str
+    FileType: Optional[str]
+    FileSize: int
+    Offset: int  # Bytes received so far; the next chunk starts here
+    ExpiresAt: datetime
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+# Mark a chat room read up to a point in time
+class ChatReadCursorUpdate(BaseModel):
+    LastReadSentAt: Optional[datetime] = None  # Defaults to now
+
+class ChatReadCursorResponse(BaseModel):
+    ProjectId: str
+    UserId: str
+    LastReadSentAt: datetime
+    
+    class Config:
+      from_attributes = True
+
+class ChatUnreadCount(BaseModel):
+    ProjectId: str
+    UnreadCount: int
+
+class ChatUnreadCountListResponse(BaseModel):
+    items: List[ChatUnreadCount]
+    total: int
@@ -1,16 +1,21 @@
 # taskUp/backend/API/schemas/notification.py
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
 class NotificationResponse(BaseModel):
     Id: str
     Type: str
-    Message: str
+    # Rendered lazily from TemplateCode + Params
+    Message: str = Field(validation_alias=AliasChoices("RenderedMessage", "Message"))
     RelatedEntityId: Optional[str] = None
     RelatedEntityType: Optional[str] = None
     IsRead: bool
     CreatedAt: datetime
+    Count: int = 1  # Number of coalesced events
+    LastActorId: Optional[str] = None
+    UpdatedAt: Optional[datetime] = None
+    LastActivityAt: Optional[datetime] = None
     TimeElapsed: str  # Human-readable time since creation
     
     class Config:
@@ -8,6 +8,7 @@ class TaskBase(BaseModel):
     Title: constr(min_length=1, max_length=100)
     Description: Optional[str] = None
     Deadline: Optional[date] = None
+    DurationDays: Optional[int] = 1
     BudgetAllocated: Optional[Decimal] = 0
     PriorityId: Optional[str] = None
     StatusId: Optional[str] = None
@@ -17,6 +18,12 @@ class TaskBase(BaseModel):
         if v is not None and v < 0:
             raise ValueError('Budget must be a positive value')
         return v
+    
+    @validator('DurationDays')
+    def duration_must_not_be_negative(cls, v):
+        if v is not None and v < 0:
+            raise ValueError('Duration cannot be negative')
+        return v
 
 # Create task schema
 class TaskCreate(TaskBase):
@@ -30,6 +37,7 @@ class TaskUpdate(BaseModel):
     Title: Optional[constr(min_length=1, max_length=100)] = None
     Description: Optional[str] = None
     Deadline: Optional[date] = None
+    DurationDays: Optional[int] = None
     BudgetAllocated: Optional[Decimal] = None
     PriorityId: Optional[str] = None
     StatusId: Optional[str] = None
@@ -42,6 +50,46 @@ class TaskUpdate(BaseModel):
         if v is not None and v < 0:
             raise ValueError('Budget must be a positive value')
         return v
+    
+    @validator('DurationDays')
+    def duration_must_not_be_negative(cls, v):
+        if v is not None and v < 0:
+            raise ValueError('Duration cannot be negative')
+        return v
+
+# Task dependency schemas
+class TaskDependencyCreate(BaseModel):
+    PredecessorId: str
+    LagDays: int = 0  # Days between the predecessor finishing and this task starting; negative for overlap
+
+class TaskDependencyResponse(BaseModel):
+    Id: str
+    PredecessorId: str
+    SuccessorId: str
+    LagDays: int
+    CreatedAt: Optional[datetime] = None
+    
+    class Config:
+     from_attributes = True
+
+# Critical path schemas; times are days from ProjectStart and finishes are exclusive
+class ScheduledTaskResponse(BaseModel):
+    TaskId: str
+    Title: str
+    DurationDays: int
+    EarlyStart: int
+    EarlyFinish: int
+    LateStart: int
+    LateFinish: int
+    Slack: int  # Negative when a deadline cannot be met
+    Critical: bool
+
+class ProjectScheduleResponse(BaseModel):
+    ProjectId: str
+    ProjectStart: date
+    ProjectFinish: int
+    CriticalChain: List[str]  # Task ids from first to last
+    Tasks: List[ScheduledTaskResponse]
 
 # Task assignment schema
 class TaskAssignmentCreate(BaseModel):
@@ -77,6 +125,25 @@ class TaskDetailResponse(TaskResponse):
     class Config:
      from_attributes = True
 
+# Task tree response; the Total* fields and counts include every task below
+class TaskTreeNode(BaseModel):
+    TaskId: str
+    ParentTaskId: Optional[str] = None
+    Title: str
+    Depth: int
+    Deadline: Optional[datetime] = None
+    Completed: bool
+    BudgetAllocated: Decimal
+    Expenses: Decimal
+    TotalBudgetAllocated: Decimal
+    TotalExpenses: Decimal
+    TaskCount: int
+    CompletedCount: int
+    CompletionPercent: float
+    Subtasks: List["TaskTreeNode"] = []
+
+TaskTreeNode.model_rebuild()
+
 # Task list response
 class TaskListResponse(BaseModel):
     items: List[TaskResponse]
@@ -0,0 +1,190 @@
+# taskUp/backend/API/services/archive_service.py
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List, Optional
+from datetime import datetime
+from urllib.parse import quote
+import logging
+import os
+import threading
+import zipfile
+
+from API.Models.Attachment import Attachment
+from API.Models.Task import Task
+from API.utils.config import UPLOAD_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Formats that are already compressed; deflating them again only burns CPU
+STORED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp3", ".aac", ".ogg", ".m4a", ".mp4", ".mov", ".mkv", ".webm", ".avi",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar",
+    ".pdf", ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp",
+}
+STORED_MIME_PREFIXES = ("image/", "video/", "audio/")
+
+
+def get_task_archive_entries(db: Session, task_id: str) -> List[Dict[str, Any]]:
+    """Attachment files of a task, as archive entries"""
+    attachments = Attachment.__table__
+    rows = db.execute(
+        select(
+            attachments.c.FileName, attachments.c.FileType, attachments.c.FilePath,
+            attachments.c.FileSize, attachments.c.UploadedAt
+        )
+        .where(attachments.c.TaskId == task_id)
+        .order_by(attachments.c.UploadedAt)
+    ).mappings().all()
+    return [dict(row, Folder=None) for row in rows]
+
+
+def get_project_archive_entries(db: Session, project_id: str) -> List[Dict[str, Any]]:
+    """Attachment files of every live task in a project, grouped by task folder"""
+    attachments = Attachment.__table__
+    tasks = Task.__table__
+    rows = db.execute(
+        select(
+            attachments.c.FileName, attachments.c.FileType, attachments.c.FilePath,
+            attachments.c.FileSize, attachments.c.UploadedAt,
+            tasks.c.Title.label("Folder")
+        )
+        .join(tasks, tasks.c.Id == attachments.c.TaskId)
+        .where(tasks.c.ProjectId == project_id, tasks.c.IsDeleted == False)
+        .order_by(tasks.c.Title, attachments.c.UploadedAt)
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def compression_for(file_name: str, file_type: Optional[str]) -> int:
+    """Store already-compressed formats, deflate everything else"""
+    extension = os.path.splitext(file_name or "")[1].lower()
+    if extension in STORED_EXTENSIONS or (file_type or "").startswith(STORED_MIME_PREFIXES):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def safe_name(name: Optional[str], fallback: str) -> str:
+    """Archive path component without separators or traversal"""
+    name = (name or "").replace("/", "_").replace("\\", "_").strip().lstrip(".")
+    return name or fallback
+
+
+def unique_name(path: str, used: set) -> str:
+    """Suffix duplicate names the way file managers do: 'a (2).pdf'"""
+    if path not in used:
+        used.add(path)
+        return path
+    root, extension = os.path.splitext(path)
+    counter = 2
+    while f"{root} ({counter}){extension}" in used:
+        counter += 1
+    path = f"{root} ({counter}){extension}"
+    used.add(path)
+    return path
+
+
+class ZipSink:
+    """Write-only file object that collects zip output until it is drained.
+
+    It has tell() but no seek(), so zipfile writes in streaming mode (data
+    descriptors after each entry) and never goes back to patch headers.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def zip_stream(
+    entries: List[Dict[str, Any]],
+    cancelled: Optional[threading.Event] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield a ZIP archive of `entries` piece by piece.
+
+    Memory stays bounded by one chunk per file plus compressor state no matter
+    how large the archive gets. Setting `cancelled` stops the archive at the
+    next chunk boundary. Files missing from disk are skipped.
+    """
+    sink = ZipSink()
+    used_names = set()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for entry in entries:
+            if cancelled is not None and cancelled.is_set():
+                return
+            try:
+                source = open(entry["FilePath"], "rb")
+            except OSError:
+                logger.warning("Skipping missing attachment file: %s", entry["FilePath"])
+                continue
+
+            with source:
+                name = safe_name(entry["FileName"], "attachment")
+                if entry.get("Folder") is not None:
+                    name = f"{safe_name(entry['Folder'], 'task')}/{name}"
+                info = zipfile.ZipInfo(
+                    unique_name(name, used_names),
+                    date_time=(entry["UploadedAt"] or datetime.utcnow()).timetuple()[:6]
+                )
+                info.compress_type = compression_for(entry["FileName"], entry["FileType"])
+                size = entry["FileSize"] or os.fstat(source.fileno()).st_size
+
+                with archive.open(info, mode="w", force_zip64=size >= zipfile.ZIP64_LIMIT) as target:
+                    while True:
+                        if cancelled is not None and cancelled.is_set():
+                            return
+                        chunk = source.read(chunk_size)
+                        if not chunk:
+                            break
+                        target.write(chunk)
+                        if sink.buffer:
+                            yield sink.drain()
+            yield sink.drain()
+    # Central directory
+    yield sink.drain()
+
+
+async def stream_archive(entries: List[Dict[str, Any]]):
+    """Run zip_stream off the event loop, stopping it if the client goes away"""
+    cancelled = threading.Event()
+    try:
+        async for chunk in iterate_in_threadpool(zip_stream(entries, cancelled)):
+            if chunk:
+                yield chunk
+    finally:
+        # Disconnects cancel this generator; tell the worker thread to stop too
+        cancelled.set()
+
+
+def archive_response(entries: List[Dict[str, Any]], archive_name: str) -> StreamingResponse:
+    """Stream a ZIP of the entries as a download"""
+    file_name = f"{archive_name}.zip"
+    quoted = quote(file_name)
+    if quoted != file_name:
+        disposition = f"attachment; filename*=utf-8''{quoted}"
+    else:
+        disposition = f'attachment; filename="{file_name}"'
+    return StreamingResponse(
+        stream_archive(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": disposition, "Cache-Control": "no-store"}
+    )
@@ -0,0 +1,592 @@
+import asyncio
+import atexit
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.orm import Session
+
+from Db.session import SessionLocal
+from API.Models.ChatMessage import ChatMessage
+from API.Models.ChatReadCursor import ChatReadCursor
+from API.Models.User import User
+from API.utils.config import (
+    CHAT_FLUSH_BATCH_SIZE, CHAT_FLUSH_INTERVAL_SECONDS, CHAT_FLUSH_MAX_ATTEMPTS,
+    CHAT_HISTORY_SIZE, CHAT_HISTORY_MAX_ROOMS, CHAT_HISTORY_MAX_BYTES,
+    CHAT_HEARTBEAT_INTERVAL_SECONDS, CHAT_IDLE_TIMEOUT_SECONDS, CHAT_SEND_TIMEOUT_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ChatMessageBuffer:
+    """Write-behind buffer for chat messages.
+
+    Messages get their Id and SentAt as soon as they are added so they can be
+    broadcast right away. A background thread inserts them in batches, either
+    when `batch_size` messages are waiting or every `flush_interval` seconds.
+    Rows that fail to insert go back to the front of the queue and are retried
+    on later flushes, up to `max_attempts` times each.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = CHAT_FLUSH_BATCH_SIZE,
+        flush_interval: float = CHAT_FLUSH_INTERVAL_SECONDS,
+        max_attempts: int = CHAT_FLUSH_MAX_ATTEMPTS
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+
+        self._pending: List[Dict[str, Any]] = []
+        # The batch being written; still served to history loads until it commits
+        self._in_flight: List[Dict[str, Any]] = []
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Serialises flushes so the worker and close() never insert the same batch twice
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background flush thread"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="chat-flush", daemon=True)
+            self._thread.start()
+
+    def add(self, project_id: str, user_id: str, content: str) -> Dict[str, Any]:
+        """Queue a message for persistence and return its row values"""
+        row = {
+            "Id": str(uuid.uuid4()),
+            "ProjectId": project_id,
+            "UserId": user_id,
+            "Content": content,
+            "SentAt": datetime.utcnow(),
+            "IsRead": False
+        }
+
+        if self._thread is None:
+            self.start()
+
+        with self._lock:
+            self._pending.append(row)
+            pending_count = len(self._pending)
+
+        if pending_count >= self.batch_size:
+            self._wakeup.set()
+
+        return row
+
+    def pending_for_project(self, project_id: str) -> List[Dict[str, Any]]:
+        """Get messages for a project that have not been written yet"""
+        with self._lock:
+            return [row for row in self._in_flight + self._pending if row["ProjectId"] == project_id]
+
+    def pending_count(self) -> int:
+        """Count messages waiting to be written"""
+        with self._lock:
+            return len(self._in_flight) + len(self._pending)
+
+    def flush(self) -> int:
+        """Write all pending messages to the database; failed rows are queued again"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._in_flight = batch
+
+            if not batch:
+                return 0
+
+            written, failed = 0, batch
+            try:
+                db = self.session_factory()
+                try:
+                    db.execute(insert(ChatMessage.__table__), batch)
+                    db.commit()
+                    written, failed = len(batch), []
+                except Exception as e:
+                    db.rollback()
+                    logger.warning("Chat batch flush failed, retrying row by row: %s", e)
+                    written, failed = self._flush_rows(db, batch)
+                finally:
+                    db.close()
+            except Exception as e:
+                logger.warning("Chat flush could not reach the database: %s", e)
+            finally:
+                self._requeue(batch, failed)
+            return written
+
+    def _flush_rows(self, db: Session, batch: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Insert rows one at a time so a single bad row cannot block the rest"""
+        written = 0
+        failed = []
+        for row in batch:
+            try:
+                db.execute(insert(ChatMessage.__table__), [row])
+                db.commit()
+                written += 1
+            except Exception as e:
+                db.rollback()
+                logger.warning("Chat message %s not written: %s", row["Id"], e)
+                failed.append(row)
+        return written, failed
+
+    def _requeue(self, batch: List[Dict[str, Any]], failed: List[Dict[str, Any]]):
+        """Put failed rows back ahead of newer ones, giving up on rows out of attempts"""
+        with self._lock:
+            self._in_flight = []
+            if self._attempts:
+                failed_ids = {row["Id"] for row in failed}
+                for row in batch:
+                    if row["Id"] not in failed_ids:
+                        self._attempts.pop(row["Id"], None)
+            
+            retry = []
+            for row in failed:
+                attempts = self._attempts.get(row["Id"], 0) + 1
+                if attempts >= self.max_attempts:
+                    self._attempts.pop(row["Id"], None)
+                    logger.error("Giving up on chat message %s after %d failed writes", row["Id"], attempts)
+                    continue
+                self._attempts[row["Id"]] = attempts
+                retry.append(row)
+            self._pending[:0] = retry
+
+    def close(self):
+        """Stop the flush thread and write everything still pending"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # Keep retrying failed rows; each pass uses up an attempt, so this ends
+        self.flush()
+        while self.pending_count():
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Chat flush error")
+
+
+class ChatHistoryCache:
+    """Bounded ring buffer of recent messages for each active project room.
+
+    Rooms are filled from the database on first join and appended to on every
+    send, so joining a warm room needs no queries. Whole rooms are evicted in
+    least-recently-used order once `max_rooms` or `max_bytes` is exceeded.
+    """
+
+    # Rough per-message overhead of the dict, ids and timestamp
+    MESSAGE_OVERHEAD_BYTES = 256
+
+    def __init__(
+        self,
+        history_size: int = CHAT_HISTORY_SIZE,
+        max_rooms: int = CHAT_HISTORY_MAX_ROOMS,
+        max_bytes: int = CHAT_HISTORY_MAX_BYTES
+    ):
+        self.history_size = history_size
+        self.max_rooms = max_rooms
+        self.max_bytes = max_bytes
+
+        self._rooms: "OrderedDict[str, deque]" = OrderedDict()
+        self._room_bytes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, project_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a room's recent messages, or None if the room is cold"""
+        with self._lock:
+            room = self._rooms.get(project_id)
+            if room is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self._rooms.move_to_end(project_id)
+            return list(room)
+
+    def fill(self, project_id: str, messages: List[Dict[str, Any]]):
+        """Load a room with messages from the database, oldest first"""
+        with self._lock:
+            self._drop(project_id)
+            room = deque(maxlen=self.history_size)
+            self._rooms[project_id] = room
+            self._room_bytes[project_id] = 0
+            for message in messages[-self.history_size:]:
+                self._push(project_id, room, message)
+            self._evict()
+
+    def append(self, project_id: str, message: Dict[str, Any]):
+        """Add a new message to a warm room; cold rooms are filled on next join"""
+        with self._lock:
+            room = self._rooms.get(project_id)
+            if room is None:
+                return
+            
+            self._push(project_id, room, message)
+            self._rooms.move_to_end(project_id)
+            self._evict()
+
+    def invalidate(self, project_id: str):
+        with self._lock:
+            self._drop(project_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "rooms": len(self._rooms),
+                "bytes": self._total_bytes
+            }
+
+    def _push(self, project_id: str, room: deque, message: Dict[str, Any]):
+        if len(room) == room.maxlen:
+            dropped = self._message_size(room[0])
+            self._room_bytes[project_id] -= dropped
+            self._total_bytes -= dropped
+        
+        room.append(message)
+        size = self._message_size(message)
+        self._room_bytes[project_id] += size
+        self._total_bytes += size
+
+    def _drop(self, project_id: str):
+        if project_id in self._rooms:
+            del self._rooms[project_id]
+            self._total_bytes -= self._room_bytes.pop(project_id)
+
+    def _evict(self):
+        # Never evict the room that was just touched
+        while len(self._rooms) > 1 and (
+            len(self._rooms) > self.max_rooms or self._total_bytes > self.max_bytes
+        ):
+            project_id = next(iter(self._rooms))
+            self._drop(project_id)
+            self.evictions += 1
+
+    def _message_size(self, message: Dict[str, Any]) -> int:
+        return (
+            self.MESSAGE_OVERHEAD_BYTES
+            + len(message.get("content") or "")
+            + len(message.get("senderName") or "")
+        )
+
+
+class ChatPresence:
+    """Live chat connections and who is online, per project room.
+
+    Every operation is O(1) per connection. A connection's last activity is
+    refreshed by any frame it sends, including heartbeat pongs, and
+    `sweep` closes connections that have been silent for longer than
+    `idle_timeout`. Only touch this from the event loop.
+    """
+
+    def __init__(
+        self,
+        heartbeat_interval: float = CHAT_HEARTBEAT_INTERVAL_SECONDS,
+        idle_timeout: float = CHAT_IDLE_TIMEOUT_SECONDS,
+        send_timeout: float = CHAT_SEND_TIMEOUT_SECONDS
+    ):
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.send_timeout = send_timeout
+
+        # project_id -> {websocket: user_id}
+        self._rooms: Dict[str, Dict[Any, str]] = {}
+        # project_id -> {user_id: open connection count}
+        self._online: Dict[str, Dict[str, int]] = {}
+        # websocket -> (project_id, user_id)
+        self._owners: Dict[Any, Tuple[str, str]] = {}
+        # websocket -> monotonic time of last frame; insertion order is oldest first
+        self._last_seen: Dict[Any, float] = {}
+
+    def connect(self, project_id: str, user_id: str, websocket) -> bool:
+        """Register a connection; returns True if the user just came online"""
+        self._rooms.setdefault(project_id, {})[websocket] = user_id
+        self._owners[websocket] = (project_id, user_id)
+        self._last_seen[websocket] = time.monotonic()
+        
+        users = self._online.setdefault(project_id, {})
+        users[user_id] = users.get(user_id, 0) + 1
+        return users[user_id] == 1
+
+    def disconnect(self, websocket) -> Optional[Tuple[str, str, bool]]:
+        """Forget a connection; returns (project_id, user_id, went_offline), or None if unknown"""
+        owner = self._owners.pop(websocket, None)
+        if owner is None:
+            return None
+        
+        project_id, user_id = owner
+        self._last_seen.pop(websocket, None)
+        
+        room = self._rooms[project_id]
+        del room[websocket]
+        if not room:
+            del self._rooms[project_id]
+        
+        users = self._online[project_id]
+        users[user_id] -= 1
+        went_offline = users[user_id] == 0
+        if went_offline:
+            del users[user_id]
+            if not users:
+                del self._online[project_id]
+        
+        return project_id, user_id, went_offline
+
+    def touch(self, websocket):
+        """Record activity on a connection"""
+        if websocket in self._last_seen:
+            # Re-insert so the dict stays ordered by last activity
+            del self._last_seen[websocket]
+            self._last_seen[websocket] = time.monotonic()
+
+    def connections(self, project_id: str) -> List[Any]:
+        return list(self._rooms.get(project_id, ()))
+
+    def online_users(self, project_id: str) -> List[str]:
+        return list(self._online.get(project_id, ()))
+
+    def connection_count(self) -> int:
+        return len(self._owners)
+
+    def idle_connections(self) -> List[Any]:
+        """Get connections silent for longer than the idle timeout, oldest first"""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = []
+        for websocket, last_seen in self._last_seen.items():
+            if last_seen > cutoff:
+                break
+            idle.append(websocket)
+        return idle
+
+    async def send(self, websocket, payload: Dict[str, Any]) -> bool:
+        """Send to one connection, reaping it if the send fails or stalls"""
+        try:
+            await asyncio.wait_for(websocket.send_text(json.dumps(payload)), self.send_timeout)
+            return True
+        except Exception:
+            await self.reap(websocket)
+            return False
+
+    async def broadcast(self, project_id: str, payload: Dict[str, Any]):
+        """Send a payload to every live connection in a room"""
+        for websocket in self.connections(project_id):
+            await self.send(websocket, payload)
+
+    async def reap(self, websocket, code: int = 1001):
+        """Drop a dead or idle connection and tell the room if its user went offline"""
+        result = self.disconnect(websocket)
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+        
+        if result and result[2]:
+            await self.broadcast(result[0], {"type": "presence", "userId": result[1], "status": "offline"})
+
+    async def sweep(self) -> int:
+        """Close idle connections and ping the rest; returns how many were reaped"""
+        idle = self.idle_connections()
+        for websocket in idle:
+            await self.reap(websocket)
+        
+        for websocket in list(self._owners):
+            await self.send(websocket, {"type": "ping"})
+        
+        return len(idle)
+
+    async def run_heartbeat(self):
+        """Sweep forever at the heartbeat interval"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Chat heartbeat error")
+
+
+def to_chat_payload(row: Dict[str, Any], sender_name: str) -> Dict[str, Any]:
+    """Convert stored message values into the payload sent to clients"""
+    return {
+        "id": row["Id"],
+        "content": row["Content"],
+        "senderId": row["UserId"],
+        "senderName": sender_name,
+        "timestamp": row["SentAt"].isoformat()
+    }
+
+def load_recent_history(db: Session, project_id: str, limit: int = CHAT_HISTORY_SIZE) -> List[Dict[str, Any]]:
+    """Load a room's latest messages with sender names in one query, oldest first"""
+    rows = (
+        db.query(
+            ChatMessage.Id, ChatMessage.UserId, ChatMessage.Content, ChatMessage.SentAt,
+            User.FirstName, User.LastName
+        )
+        .outerjoin(User, User.Id == ChatMessage.UserId)
+        .filter(ChatMessage.ProjectId == project_id)
+        .order_by(ChatMessage.SentAt.desc())
+        .limit(limit)
+        .all()
+    )
+    
+    history = [
+        to_chat_payload(
+            {"Id": row.Id, "UserId": row.UserId, "Content": row.Content, "SentAt": row.SentAt},
+            f"{row.FirstName} {row.LastName}" if row.FirstName is not None else "Unknown"
+        )
+        for row in reversed(rows)
+    ]
+    
+    # Include messages still waiting in the write-behind buffer
+    pending = chat_buffer.pending_for_project(project_id)
+    if pending:
+        written_ids = {message["id"] for message in history}
+        pending_user_ids = {row["UserId"] for row in pending}
+        names = {
+            user.Id: f"{user.FirstName} {user.LastName}"
+            for user in db.query(User.Id, User.FirstName, User.LastName).filter(User.Id.in_(pending_user_ids))
+        }
+        history.extend(
+            to_chat_payload(row, names.get(row["UserId"], "Unknown"))
+            for row in pending if row["Id"] not in written_ids
+        )
+    
+    return history[-limit:]
+
+
+# Read cursor functions
+def get_read_cursor(db: Session, project_id: str, user_id: str) -> Optional[ChatReadCursor]:
+    """Get a user's read cursor for a project room"""
+    return db.query(ChatReadCursor).filter(
+        ChatReadCursor.ProjectId == project_id,
+        ChatReadCursor.UserId == user_id
+    ).first()
+
+def mark_room_read(
+    db: Session,
+    project_id: str,
+    user_id: str,
+    last_read_sent_at: Optional[datetime] = None
+) -> ChatReadCursor:
+    """Move a user's read cursor forward; it never moves back"""
+    if last_read_sent_at is None:
+        last_read_sent_at = datetime.utcnow()
+    elif last_read_sent_at.tzinfo is not None:
+        # SentAt is stored as naive UTC
+        last_read_sent_at = last_read_sent_at.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    db_cursor = get_read_cursor(db, project_id, user_id)
+    if db_cursor is None:
+        db_cursor = ChatReadCursor(
+            Id=str(uuid.uuid4()),
+            ProjectId=project_id,
+            UserId=user_id,
+            LastReadSentAt=last_read_sent_at
+        )
+        db.add(db_cursor)
+    elif last_read_sent_at > db_cursor.LastReadSentAt:
+        db_cursor.LastReadSentAt = last_read_sent_at
+    
+    db.commit()
+    db.refresh(db_cursor)
+    
+    return db_cursor
+
+def _count_pending_unread(project_id: str, user_id: str, last_read_sent_at: Optional[datetime]) -> int:
+    return sum(
+        1 for row in chat_buffer.pending_for_project(project_id)
+        if row["UserId"] != user_id and (last_read_sent_at is None or row["SentAt"] > last_read_sent_at)
+    )
+
+def count_unread_messages(db: Session, project_id: str, user_id: str) -> int:
+    """Count messages from others sent after the user's cursor, as one index range count"""
+    db_cursor = get_read_cursor(db, project_id, user_id)
+    last_read_sent_at = db_cursor.LastReadSentAt if db_cursor else None
+    
+    query = db.query(func.count(ChatMessage.Id)).filter(
+        ChatMessage.ProjectId == project_id,
+        ChatMessage.UserId != user_id
+    )
+    if last_read_sent_at is not None:
+        query = query.filter(ChatMessage.SentAt > last_read_sent_at)
+    
+    return query.scalar() + _count_pending_unread(project_id, user_id, last_read_sent_at)
+
+def count_unread_messages_by_project(db: Session, user_id: str, project_ids: List[str]) -> Dict[str, int]:
+    """Count unread messages for many rooms in one grouped query"""
+    if not project_ids:
+        return {}
+    
+    rows = (
+        db.query(ChatMessage.ProjectId, func.count(ChatMessage.Id))
+        .outerjoin(
+            ChatReadCursor,
+            and_(
+                ChatReadCursor.ProjectId == ChatMessage.ProjectId,
+                ChatReadCursor.UserId == user_id
+            )
+        )
+        .filter(
+            ChatMessage.ProjectId.in_(project_ids),
+            ChatMessage.UserId != user_id,
+            or_(
+                ChatReadCursor.LastReadSentAt == None,
+                ChatMessage.SentAt > ChatReadCursor.LastReadSentAt
+            )
+        )
+        .group_by(ChatMessage.ProjectId)
+        .all()
+    )
+    counts = {project_id: 0 for project_id in project_ids}
+    counts.update({project_id: count for project_id, count in rows})
+    
+    if chat_buffer.pending_count():
+        cursors = dict(
+            db.query(ChatReadCursor.ProjectId, ChatReadCursor.LastReadSentAt).filter(
+                ChatReadCursor.UserId == user_id,
+                ChatReadCursor.ProjectId.in_(project_ids)
+            ).all()
+        )
+        for project_id in project_ids:
+            counts[project_id] += _count_pending_unread(project_id, user_id, cursors.get(project_id))
+    
+    return counts
+
+
+chat_buffer = ChatMessageBuffer()
+chat_history = ChatHistoryCache()
+chat_presence = ChatPresence()
+
+# Last line of defence if the app exits without running the shutdown hook
+atexit.register(chat_buffer.close)
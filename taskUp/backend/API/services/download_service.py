@@ -0,0 +1,188 @@
+# taskUp/backend/API/services/download_service.py
+from fastapi import HTTPException, Request, status
+from fastapi.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+from typing import Optional, Tuple
+from urllib.parse import quote
+import anyio
+import os
+
+from API.Models.Attachment import Attachment
+from API.utils.config import UPLOAD_DIR, ATTACHMENT_CACHE_CONTROL, ATTACHMENT_ACCEL_REDIRECT_PREFIX
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into an inclusive (start, end) pair.
+
+    Returns None when the whole file should be sent: no header, a unit other
+    than bytes, or several ranges (which a server may answer with the full
+    body). Raises a 416 when the range lies outside the file.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    first, last = (part.strip() for part in spec.split("-", 1))
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start = max(size - length, 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse that can send a single byte range of the file as a 206.
+
+    When the server offers the ASGI zero-copy extension the bytes are handed
+    to sendfile; otherwise they are streamed in chunks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        byte_range: Optional[Tuple[int, int]] = None,
+        **kwargs
+    ):
+        status_code = status.HTTP_200_OK if byte_range is None else status.HTTP_206_PARTIAL_CONTENT
+        super().__init__(path, status_code=status_code, stat_result=stat_result, **kwargs)
+        self.start, self.end = byte_range or (0, stat_result.st_size - 1)
+        if byte_range is not None:
+            self.headers["content-length"] = str(self.end - self.start + 1)
+            self.headers["content-range"] = f"bytes {self.start}-{self.end}/{stat_result.st_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if self.send_header_only or self.end < self.start:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            remaining = self.end - self.start + 1
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                if "http.response.zerocopy" in scope.get("extensions", {}):
+                    await send({
+                        "type": "http.response.zerocopy",
+                        "file": file.wrapped.fileno(),
+                        "offset": self.start,
+                        "count": remaining,
+                        "more_body": False,
+                    })
+                else:
+                    await file.seek(self.start)
+                    while remaining > 0:
+                        chunk = await file.read(min(self.chunk_size, remaining))
+                        if not chunk:
+                            break
+                        remaining -= len(chunk)
+                        await send({
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": remaining > 0,
+                        })
+                    if remaining > 0:
+                        # File shrank underneath us; end the body rather than hang
+                        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
+
+
+def file_etag(content_hash: Optional[str], stat_result: os.stat_result) -> str:
+    """Strong ETag from the content hash, or a weak one from file stats for old files"""
+    if content_hash:
+        return f'"{content_hash}"'
+    return f'W/"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
+
+
+def content_disposition(filename: str) -> str:
+    """Content-Disposition header for downloading a file under its original name"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def file_response(
+    request: Request,
+    path: str,
+    file_name: str,
+    file_type: Optional[str],
+    content_hash: Optional[str] = None
+) -> Response:
+    """Serve a stored file with conditional GET, Range and cache support"""
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Attachment file not found")
+
+    etag = file_etag(content_hash, stat_result)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": ATTACHMENT_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if ATTACHMENT_ACCEL_REDIRECT_PREFIX:
+        # The proxy serves the bytes (including ranges) straight from disk
+        relative_path = os.path.relpath(path, UPLOAD_DIR).replace(os.sep, "/")
+        headers["X-Accel-Redirect"] = ATTACHMENT_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(relative_path)
+        headers["Content-Disposition"] = content_disposition(file_name)
+        return Response(media_type=file_type, headers=headers)
+
+    byte_range = parse_range(request.headers.get("range"), stat_result.st_size)
+    if_range = request.headers.get("if-range")
+    if byte_range is not None and if_range and (if_range.strip() != etag or etag.startswith("W/")):
+        # Resuming against a file that has changed (or only has a weak ETag); send it whole
+        byte_range = None
+
+    return RangeFileResponse(
+        path,
+        stat_result,
+        byte_range,
+        headers=headers,
+        media_type=file_type,
+        filename=file_name,
+        method=request.method,
+    )
+
+
+def attachment_response(request: Request, attachment: Attachment) -> Response:
+    """Serve an attachment with conditional GET, Range and cache support"""
+    return file_response(
+        request, attachment.FilePath, attachment.FileName, attachment.FileType, attachment.ContentHash
+    )
@@ -1,12 +1,20 @@
 # taskUp/backend/API/services/notification_service.py
+from sqlalchemy import and_, delete, insert, or_, select
 from sqlalchemy.orm import Session
 from fastapi import BackgroundTasks
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
 from API.Models.Notification import Notification
+from API.Models.NotificationArchive import NotificationArchive
 from API.Models.User import User
+from API.utils.notification_templates import NOTIFICATION_TEMPLATES, dump_params, render_notification
+from API.utils.config import (
+    NOTIFICATION_READ_RETENTION_DAYS, NOTIFICATION_UNREAD_RETENTION_DAYS, NOTIFICATION_ARCHIVE_BATCH_SIZE,
+    NOTIFICATION_MARK_READ_BATCH_SIZE, NOTIFICATION_COALESCE_WINDOW_SECONDS
+)
 
 # Notification types
 TASK_ASSIGNED = "task_assigned"
@@ -15,27 +23,81 @@ COMMENT_ADDED = "comment_added"
 PROJECT_UPDATED = "project_updated"
 TEAM_ADDED = "team_added"
 
+def find_coalescable_notification(
+    db: Session,
+    user_id: str,
+    notification_type: str,
+    entity_id: Optional[str],
+    window_seconds: int = NOTIFICATION_COALESCE_WINDOW_SECONDS
+) -> Optional[Notification]:
+    """Find an unread notification for the same user, type and entity opened within the window"""
+    if entity_id is None or window_seconds <= 0:
+        return None
+    
+    return db.query(Notification).filter(
+        Notification.UserId == user_id,
+        Notification.Type == notification_type,
+        Notification.RelatedEntityId == entity_id,
+        Notification.IsRead == False,
+        Notification.CreatedAt >= datetime.utcnow() - timedelta(seconds=window_seconds)
+    ).order_by(Notification.CreatedAt.desc()).first()
+
 def create_notification(
     db: Session,
     user_id: str,
     notification_type: str,
-    message: str,
+    message: Optional[str] = None,
     entity_id: Optional[str] = None,
-    entity_type: Optional[str] = None
+    entity_type: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    coalesce: bool = True,
+    params: Optional[Dict[str, Any]] = None
 ) -> Notification:
-    """Create a notification in the database"""
-    notification = Notification(
-        Id=str(uuid.uuid4()),
-        UserId=user_id,
-        Type=notification_type,
-        Message=message,
-        RelatedEntityId=entity_id,
-        RelatedEntityType=entity_type,
-        IsRead=False,
-        CreatedAt=datetime.utcnow()
-    )
+    """Create a notification, or fold it into a recent unread one for the same entity.
+
+    When `params` is given the notification is stored as its type's template
+    code plus the params, and the text is rendered at read time.
+    """
+    template_code = None
+    stored_params = None
+    if params is not None and notification_type in NOTIFICATION_TEMPLATES:
+        template_code = notification_type
+        stored_params = dump_params(params)
+        message = None
+    elif message is None:
+        raise ValueError(f"No message or template for notification type '{notification_type}'")
+    
+    now = datetime.utcnow()
+    notification = None
+    if coalesce:
+        notification = find_coalescable_notification(db, user_id, notification_type, entity_id)
+    
+    if notification is not None:
+        notification.Count = (notification.Count or 1) + 1
+        notification.Message = message
+        notification.TemplateCode = template_code
+        notification.Params = stored_params
+        notification.LastActorId = actor_id
+        notification.UpdatedAt = now
+        notification.LastActivityAt = now
+    else:
+        notification = Notification(
+            Id=str(uuid.uuid4()),
+            UserId=user_id,
+            Type=notification_type,
+            Message=message,
+            TemplateCode=template_code,
+            Params=stored_params,
+            RelatedEntityId=entity_id,
+            RelatedEntityType=entity_type,
+            IsRead=False,
+            CreatedAt=now,
+            LastActivityAt=now,
+            Count=1,
+            LastActorId=actor_id
+        )
+        db.add(notification)
     
-    db.add(notification)
     db.commit()
     db.refresh(notification)
     
@@ -54,7 +116,35 @@ def get_user_notifications(
     if unread_only:
         query = query.filter(Notification.IsRead == False)
     
-    return query.order_by(Notification.CreatedAt.desc()).offset(skip).limit(limit).all()
+    notifications = query.order_by(Notification.LastActivityAt.desc()).offset(skip).limit(limit).all()
+    return render_notifications(db, notifications)
+
+def render_notifications(db: Session, notifications: List[Notification]) -> List[Notification]:
+    """Render templated notifications, using the current title of their related tasks"""
+    from API.Models.Task import Task
+    
+    task_ids = {
+        n.RelatedEntityId for n in notifications
+        if n.TemplateCode and n.RelatedEntityType == "Task" and n.RelatedEntityId
+    }
+    titles = {}
+    if task_ids:
+        tasks = Task.__table__
+        titles = dict(db.execute(
+            select(tasks.c.Id, tasks.c.Title).where(tasks.c.Id.in_(task_ids))
+        ).all())
+    
+    for notification in notifications:
+        if not notification.TemplateCode:
+            continue
+        title = titles.get(notification.RelatedEntityId)
+        overrides = {"task_title": title} if title is not None else None
+        # Plain instance attribute, not a column, so the session never flushes it
+        notification.__dict__["_rendered_message"] = render_notification(
+            notification.TemplateCode, notification.Params, notification.Message, overrides
+        )
+    
+    return notifications
 
 def mark_notification_as_read(db: Session, notification_id: str) -> bool:
     """Mark a notification as read"""
@@ -68,16 +158,32 @@ def mark_notification_as_read(db: Session, notification_id: str) -> bool:
     
     return True
 
-def mark_all_notifications_as_read(db: Session, user_id: str) -> int:
-    """Mark all notifications for a user as read"""
-    result = db.query(Notification).filter(
-        Notification.UserId == user_id,
-        Notification.IsRead == False
-    ).update({"IsRead": True})
-    
-    db.commit()
+def mark_all_notifications_as_read(
+    db: Session,
+    user_id: str,
+    batch_size: int = NOTIFICATION_MARK_READ_BATCH_SIZE
+) -> int:
+    """Mark all notifications for a user as read, committing in small batches"""
+    total = 0
+    while True:
+        ids = [
+            notification_id for (notification_id,) in db.query(Notification.Id).filter(
+                Notification.UserId == user_id,
+                Notification.IsRead == False
+            ).limit(batch_size).all()
+        ]
+        if not ids:
+            break
+        
+        total += db.query(Notification).filter(Notification.Id.in_(ids)).update(
+            {"IsRead": True}, synchronize_session=False
+        )
+        db.commit()
+        
+        if len(ids) < batch_size:
+            break
     
-    return result
+    return total
 
 def count_unread_notifications(db: Session, user_id: str) -> int:
     """Count unread notifications for a user"""
@@ -86,6 +192,78 @@ def count_unread_notifications(db: Session, user_id: str) -> int:
         Notification.IsRead == False
     ).count()
 
+# Retention functions
+ARCHIVED_COLUMNS = [
+    "Id", "UserId", "Type", "Message", "TemplateCode", "Params", "RelatedEntityId", "RelatedEntityType",
+    "IsRead", "CreatedAt", "Count", "LastActorId", "UpdatedAt", "LastActivityAt"
+]
+
+def retention_filter(
+    read_days: int = NOTIFICATION_READ_RETENTION_DAYS,
+    unread_days: int = NOTIFICATION_UNREAD_RETENTION_DAYS,
+    now: Optional[datetime] = None
+):
+    """Build the filter for notifications whose latest event is past their retention period"""
+    now = now or datetime.utcnow()
+    return or_(
+        and_(Notification.IsRead == True, Notification.LastActivityAt < now - timedelta(days=read_days)),
+        and_(Notification.IsRead == False, Notification.LastActivityAt < now - timedelta(days=unread_days))
+    )
+
+def archive_notifications(
+    db: Session,
+    read_days: int = NOTIFICATION_READ_RETENTION_DAYS,
+    unread_days: int = NOTIFICATION_UNREAD_RETENTION_DAYS,
+    batch_size: int = NOTIFICATION_ARCHIVE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    pause_seconds: float = 0.0
+) -> int:
+    """Move expired notifications into NotificationArchive.
+
+    Each batch copies and deletes at most `batch_size` rows in its own short
+    transaction, oldest first, so the live table is never locked for long.
+    """
+    notifications = Notification.__table__
+    archive = NotificationArchive.__table__
+    expired = retention_filter(read_days, unread_days)
+    
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = [
+            notification_id for (notification_id,) in db.query(Notification.Id)
+            .filter(expired)
+            .order_by(Notification.LastActivityAt)
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            break
+        
+        try:
+            columns = [notifications.c[name] for name in ARCHIVED_COLUMNS]
+            db.execute(
+                insert(archive).from_select(
+                    ARCHIVED_COLUMNS,
+                    select(*columns).where(notifications.c.Id.in_(ids))
+                )
+            )
+            db.execute(delete(notifications).where(notifications.c.Id.in_(ids)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        moved += len(ids)
+        batches += 1
+        
+        if len(ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    
+    return moved
+
 # Background task functions
 def notify_task_assignment(
     background_tasks: BackgroundTasks,
@@ -96,16 +274,17 @@ def notify_task_assignment(
     assigner_name: str
 ):
     """Send task assignment notification"""
-    message = f"{assigner_name} assigned you to task '{task_title}'"
+    params = {"actor_name": assigner_name, "task_title": task_title}
     
     background_tasks.add_task(
         create_notification,
         db=db,
         user_id=user_id,
         notification_type=TASK_ASSIGNED,
-        message=message,
+        params=params,
         entity_id=task_id,
-        entity_type="Task"
+        entity_type="Task",
+        coalesce=False
     )
 
 def notify_task_completed(
@@ -124,19 +303,21 @@ def notify_task_completed(
     if not task:
         return
     
+    params = {"actor_name": completer_name, "task_title": task_title}
+    
     # Notify task creator if not the completer
     if task.CreatedBy != completer_id:
         creator = db.query(User).filter(User.Id == task.CreatedBy).first()
         if creator:
-            message = f"{completer_name} completed the task '{task_title}'"
             background_tasks.add_task(
                 create_notification,
                 db=db,
                 user_id=creator.Id,
                 notification_type=TASK_COMPLETED,
-                message=message,
+                params=params,
                 entity_id=task_id,
-                entity_type="Task"
+                entity_type="Task",
+                actor_id=completer_id
             )
     
     # Notify other assigned users
@@ -145,16 +326,16 @@ def notify_task_completed(
         User.Id != completer_id
     ).all()
     
-    message = f"{completer_name} completed the task '{task_title}'"
     for user in assigned_users:
         background_tasks.add_task(
             create_notification,
             db=db,
             user_id=user.Id,
             notification_type=TASK_COMPLETED,
-            message=message,
+            params=params,
             entity_id=task_id,
-            entity_type="Task"
+            entity_type="Task",
+            actor_id=completer_id
         )
 
 def notify_comment_added(
@@ -186,7 +367,7 @@ def notify_comment_added(
             assigned_users.append(task_creator)
     
     # Create notifications
-    message = f"{comment_user_name} commented on task '{task_title}'"
+    params = {"actor_name": comment_user_name, "task_title": task_title}
     
     for user in assigned_users:
         background_tasks.add_task(
@@ -194,7 +375,8 @@ def notify_comment_added(
             db=db,
             user_id=user.Id,
             notification_type=COMMENT_ADDED,
-            message=message,
+            params=params,
             entity_id=task_id,
-            entity_type="Task"
+            entity_type="Task",
+            actor_id=comment_user_id
         )
\ No newline at end of file
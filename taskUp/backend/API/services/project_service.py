@@ -1,6 +1,9 @@
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from fastapi import HTTPException, status
+import threading
+import time
 import uuid
 from datetime import datetime
 
@@ -8,9 +11,141 @@ from API.Models.Project import Project
 from API.Models.User import User
 from API.Models.ProjectScope import ProjectScope
 from API.Models.ProjectStakeholder import ProjectStakeholder
+from API.Models.Team import Team
+from API.Models.TeamMember import TeamMember
+from API.Models.TeamProject import TeamProject
 from API.schemas.project import ProjectCreate, ProjectUpdate
 from API.schemas.project_scope import ProjectScopeCreate, ProjectScopeUpdate
 from API.schemas.project_stakeholder import ProjectStakeholderCreate, ProjectStakeholderUpdate
+from API.utils.config import PROJECT_ACCESS_CACHE_TTL_SECONDS
+
+# Project access functions
+class ProjectAccessCache:
+    """Short-lived per-project cache of which users can and cannot access a project.
+
+    Entries expire after `ttl` seconds and are dropped early whenever a
+    stakeholder, team membership or team assignment of the project changes.
+    """
+
+    def __init__(self, ttl: float = PROJECT_ACCESS_CACHE_TTL_SECONDS, max_projects: int = 1024):
+        self.ttl = ttl
+        self.max_projects = max_projects
+        # project_id -> (expires_at, members, non_members)
+        self._entries: Dict[str, Tuple[float, Set[str], Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str, user_id: str) -> Optional[bool]:
+        """Get a cached access decision, or None if unknown"""
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None:
+                return None
+            
+            expires_at, members, non_members = entry
+            if expires_at <= time.monotonic():
+                del self._entries[project_id]
+                return None
+            
+            if user_id in members:
+                return True
+            if user_id in non_members:
+                return False
+            return None
+
+    def set(self, project_id: str, user_id: str, allowed: bool):
+        """Record an access decision"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or entry[0] <= now:
+                if len(self._entries) >= self.max_projects:
+                    self._prune(now)
+                entry = (now + self.ttl, set(), set())
+                self._entries[project_id] = entry
+            
+            (entry[1] if allowed else entry[2]).add(user_id)
+
+    def invalidate(self, project_id: str):
+        """Forget everything cached for a project"""
+        with self._lock:
+            self._entries.pop(project_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _prune(self, now: float):
+        expired = [pid for pid, entry in self._entries.items() if entry[0] <= now]
+        for pid in expired:
+            del self._entries[pid]
+        
+        # Still full, drop the entries closest to expiry
+        if len(self._entries) >= self.max_projects:
+            oldest = sorted(self._entries, key=lambda pid: self._entries[pid][0])
+            for pid in oldest[:len(self._entries) - self.max_projects + 1]:
+                del self._entries[pid]
+
+project_access_cache = ProjectAccessCache()
+
+def has_project_access(db: Session, project_id: str, user_id: str) -> bool:
+    """Check if a user is the creator, a stakeholder or a team member of a live project"""
+    cached = project_access_cache.get(project_id, user_id)
+    if cached is not None:
+        return cached
+    
+    is_stakeholder = db.query(ProjectStakeholder.Id).filter(
+        ProjectStakeholder.ProjectId == project_id,
+        ProjectStakeholder.UserId == user_id
+    ).exists()
+    
+    is_team_member = db.query(TeamMember.Id).join(
+        TeamProject, TeamProject.TeamId == TeamMember.TeamId
+    ).join(
+        Team, Team.Id == TeamMember.TeamId
+    ).filter(
+        TeamProject.ProjectId == project_id,
+        TeamMember.UserId == user_id,
+        TeamMember.IsActive == True,
+        Team.IsDeleted == False
+    ).exists()
+    
+    # Single round trip: EXISTS over creator, stakeholder and team membership
+    access_query = db.query(Project.Id).filter(
+        Project.Id == project_id,
+        Project.IsDeleted == False,
+        or_(Project.CreatedBy == user_id, is_stakeholder, is_team_member)
+    )
+    allowed = bool(db.query(access_query.exists()).scalar())
+    
+    project_access_cache.set(project_id, user_id, allowed)
+    return allowed
+
+def get_accessible_project_ids(db: Session, user_id: str) -> List[str]:
+    """Get IDs of live projects a user created, holds a stake in, or works on through a team"""
+    stakeholder_projects = db.query(ProjectStakeholder.ProjectId).filter(
+        ProjectStakeholder.UserId == user_id
+    )
+    
+    team_projects = db.query(TeamProject.ProjectId).join(
+        TeamMember, TeamMember.TeamId == TeamProject.TeamId
+    ).join(
+        Team, Team.Id == TeamProject.TeamId
+    ).filter(
+        TeamMember.UserId == user_id,
+        TeamMember.IsActive == True,
+        Team.IsDeleted == False
+    )
+    
+    rows = db.query(Project.Id).filter(
+        Project.IsDeleted == False,
+        or_(
+            Project.CreatedBy == user_id,
+            Project.Id.in_(stakeholder_projects),
+            Project.Id.in_(team_projects)
+        )
+    ).all()
+    
+    return [project_id for (project_id,) in rows]
 
 # Project functions
 def get_project_by_id(db: Session, project_id: str) -> Optional[Project]:
@@ -116,6 +251,7 @@ def delete_project(db: Session, project_id: str) -> bool:
     
     db_project.IsDeleted = True
     db.commit()
+    project_access_cache.invalidate(project_id)
     
     return True
 
@@ -236,6 +372,7 @@ def create_project_stakeholder(
     db.add(db_stakeholder)
     db.commit()
     db.refresh(db_stakeholder)
+    project_access_cache.invalidate(stakeholder.ProjectId)
     
     return db_stakeholder
 
@@ -266,7 +403,9 @@ def delete_project_stakeholder(db: Session, stakeholder_id: str) -> bool:
     if not db_stakeholder:
         return False
     
+    project_id = db_stakeholder.ProjectId
     db.delete(db_stakeholder)
     db.commit()
+    project_access_cache.invalidate(project_id)
     
     return True
\ No newline at end of file
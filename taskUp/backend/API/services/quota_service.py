@@ -0,0 +1,199 @@
+# taskUp/backend/API/services/quota_service.py
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+
+from API.Models.Attachment import Attachment
+from API.Models.StorageUsage import StorageUsage
+from API.Models.Task import Task
+from API.utils.config import PROJECT_STORAGE_QUOTA_BYTES, USER_STORAGE_QUOTA_BYTES
+
+# Storage usage is kept as running totals per project and per uploader, so
+# reading it is a primary-key lookup instead of a SUM over Attachment.
+# Counters track the logical size of each attachment; deduplicated blobs are
+# still charged to every attachment that uses them.
+PROJECT_SCOPE = "project"
+USER_SCOPE = "user"
+
+
+def quota_for(scope_type: str) -> int:
+    return PROJECT_STORAGE_QUOTA_BYTES if scope_type == PROJECT_SCOPE else USER_STORAGE_QUOTA_BYTES
+
+
+def usage_scopes(project_id: Optional[str], user_id: Optional[str]) -> List[Tuple[str, str]]:
+    scopes = []
+    if project_id:
+        scopes.append((PROJECT_SCOPE, project_id))
+    if user_id:
+        scopes.append((USER_SCOPE, user_id))
+    return scopes
+
+
+def quota_exceeded(scope_type: str, quota: int) -> HTTPException:
+    """413 error for an upload that would go over a storage quota"""
+    owner = "Project" if scope_type == PROJECT_SCOPE else "User"
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"{owner} storage quota of {quota} bytes exceeded"
+    )
+
+
+def get_task_project_id(db: Session, task_id: str) -> Optional[str]:
+    tasks = Task.__table__
+    return db.execute(select(tasks.c.ProjectId).where(tasks.c.Id == task_id)).scalar()
+
+
+def read_usage(db: Session, scope_type: str, scope_id: str) -> Dict[str, int]:
+    usage = StorageUsage.__table__
+    row = db.execute(
+        select(usage.c.Bytes, usage.c.Files)
+        .where(usage.c.ScopeType == scope_type, usage.c.ScopeId == scope_id)
+    ).first()
+    return {"Bytes": row.Bytes, "Files": row.Files} if row else {"Bytes": 0, "Files": 0}
+
+
+def check_storage_quota(db: Session, project_id: Optional[str], user_id: Optional[str], size: int) -> None:
+    """Reject an upload of `size` bytes up front if it cannot fit in its quotas.
+
+    This only saves streaming a file that is bound to be refused; the
+    authoritative check is the conditional increment in add_storage_usage.
+    """
+    for scope_type, scope_id in usage_scopes(project_id, user_id):
+        quota = quota_for(scope_type)
+        if quota and read_usage(db, scope_type, scope_id)["Bytes"] + size > quota:
+            raise quota_exceeded(scope_type, quota)
+
+
+def ensure_usage_row(db: Session, scope_type: str, scope_id: str) -> None:
+    usage = StorageUsage.__table__
+    exists = db.execute(
+        select(usage.c.ScopeId).where(usage.c.ScopeType == scope_type, usage.c.ScopeId == scope_id)
+    ).first()
+    if exists:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(usage.insert().values(
+                ScopeType=scope_type, ScopeId=scope_id, Bytes=0, Files=0, UpdatedAt=datetime.utcnow()
+            ))
+    except IntegrityError:
+        # Created concurrently by another upload
+        pass
+
+
+def add_storage_usage(
+    db: Session,
+    project_id: Optional[str],
+    user_id: Optional[str],
+    size: int,
+    files: int = 1,
+    enforce: bool = True
+) -> None:
+    """Charge an attachment to its project and uploader.
+
+    Each counter moves with a single UPDATE that only matches while the new
+    total stays within the quota, so concurrent uploads cannot overshoot it
+    together. Changes are flushed but not committed; the caller commits with
+    the Attachment row, and a rollback undoes a partial charge.
+    """
+    usage = StorageUsage.__table__
+    for scope_type, scope_id in usage_scopes(project_id, user_id):
+        ensure_usage_row(db, scope_type, scope_id)
+        statement = (
+            update(usage)
+            .where(usage.c.ScopeType == scope_type, usage.c.ScopeId == scope_id)
+            .values(Bytes=usage.c.Bytes + size, Files=usage.c.Files + files, UpdatedAt=datetime.utcnow())
+        )
+        quota = quota_for(scope_type)
+        if enforce and quota and size > 0:
+            statement = statement.where(usage.c.Bytes + size <= quota)
+        if not db.execute(statement).rowcount:
+            raise quota_exceeded(scope_type, quota)
+
+
+def release_storage_usage(
+    db: Session,
+    project_id: Optional[str],
+    user_id: Optional[str],
+    size: int,
+    files: int = 1
+) -> None:
+    """Give back the storage of a deleted attachment; not committed"""
+    usage = StorageUsage.__table__
+    for scope_type, scope_id in usage_scopes(project_id, user_id):
+        db.execute(
+            update(usage)
+            .where(usage.c.ScopeType == scope_type, usage.c.ScopeId == scope_id)
+            .values(Bytes=usage.c.Bytes - size, Files=usage.c.Files - files, UpdatedAt=datetime.utcnow())
+        )
+
+
+def get_storage_usage(db: Session, scope_type: str, scope_id: str) -> Dict[str, Any]:
+    """Current usage and quota of a project or user"""
+    usage = read_usage(db, scope_type, scope_id)
+    quota = quota_for(scope_type)
+    return {
+        "ScopeType": scope_type,
+        "ScopeId": scope_id,
+        "Bytes": usage["Bytes"],
+        "Files": usage["Files"],
+        "QuotaBytes": quota or None,
+        "RemainingBytes": max(quota - usage["Bytes"], 0) if quota else None,
+    }
+
+
+def repair_storage_usage(db: Session) -> int:
+    """Recompute every counter from the Attachment table, returning how many were wrong.
+
+    Counters can drift when attachments go away without the service layer,
+    e.g. a task removed by a cascading delete. Run it during a quiet period:
+    uploads committed while it runs may be counted twice or not at all.
+    """
+    attachments = Attachment.__table__
+    tasks = Task.__table__
+    usage = StorageUsage.__table__
+
+    actual = {}
+    project_totals = db.execute(
+        select(tasks.c.ProjectId, func.coalesce(func.sum(attachments.c.FileSize), 0), func.count())
+        .join(tasks, tasks.c.Id == attachments.c.TaskId)
+        .group_by(tasks.c.ProjectId)
+    ).all()
+    for project_id, total, count in project_totals:
+        actual[(PROJECT_SCOPE, project_id)] = (int(total), count)
+
+    user_totals = db.execute(
+        select(attachments.c.UploadedById, func.coalesce(func.sum(attachments.c.FileSize), 0), func.count())
+        .group_by(attachments.c.UploadedById)
+    ).all()
+    for user_id, total, count in user_totals:
+        actual[(USER_SCOPE, user_id)] = (int(total), count)
+
+    stored = {
+        (row.ScopeType, row.ScopeId): (row.Bytes, row.Files)
+        for row in db.execute(select(usage.c.ScopeType, usage.c.ScopeId, usage.c.Bytes, usage.c.Files))
+    }
+
+    fixed = 0
+    now = datetime.utcnow()
+    for key in set(actual) | set(stored):
+        expected = actual.get(key, (0, 0))
+        if stored.get(key) == expected:
+            continue
+        fixed += 1
+        if key in stored:
+            db.execute(
+                update(usage)
+                .where(usage.c.ScopeType == key[0], usage.c.ScopeId == key[1])
+                .values(Bytes=expected[0], Files=expected[1], UpdatedAt=now)
+            )
+        else:
+            db.execute(usage.insert().values(
+                ScopeType=key[0], ScopeId=key[1], Bytes=expected[0], Files=expected[1], UpdatedAt=now
+            ))
+    db.commit()
+
+    return fixed
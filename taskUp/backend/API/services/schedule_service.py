@@ -0,0 +1,474 @@
+# taskUp/backend/API/services/schedule_service.py
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List, Optional, Set, Tuple
+from datetime import date, datetime
+import heapq
+import threading
+
+from API.Models.Project import Project
+from API.Models.Task import Task
+from API.Models.TaskDependency import TaskDependency
+
+# Critical path scheduling over finish-to-start task dependencies.
+#
+# Times are whole days from the project's start (the day it was created). A
+# task occupies [EarlyStart, EarlyFinish), so a successor with no lag can start
+# on its predecessor's EarlyFinish. A deadline caps a task's LateFinish, which
+# can leave negative slack when the deadline cannot be met. Tasks with zero or
+# negative slack are critical.
+
+DEFAULT_DURATION_DAYS = 1
+
+
+class DependencyCycleError(ValueError):
+    pass
+
+
+class ProjectSchedule:
+    """In-memory CPM graph of one project that can be updated incrementally.
+
+    Changing one task's duration only revisits the tasks downstream of it (and
+    upstream for late times); the full backward pass reruns only when the
+    project finish moves. Adding a dependency that would close a loop raises
+    DependencyCycleError. Hold `lock` while changing or reading a shared one.
+    """
+
+    def __init__(
+        self,
+        durations: Dict[str, int],
+        deadlines: Dict[str, Optional[int]],
+        dependencies: List[Tuple[str, str, int]]
+    ):
+        self.durations = dict(durations)
+        self.deadlines = {task_id: deadlines.get(task_id) for task_id in self.durations}
+        self.successors: Dict[str, Dict[str, int]] = {task_id: {} for task_id in self.durations}
+        self.predecessors: Dict[str, Dict[str, int]] = {task_id: {} for task_id in self.durations}
+        for predecessor, successor, lag in dependencies:
+            if predecessor in self.durations and successor in self.durations:
+                self.successors[predecessor][successor] = lag
+                self.predecessors[successor][predecessor] = lag
+
+        self.early_start: Dict[str, int] = {}
+        self.early_finish: Dict[str, int] = {}
+        self.late_start: Dict[str, int] = {}
+        self.late_finish: Dict[str, int] = {}
+        self.project_finish = 0
+        self.lock = threading.RLock()
+        self._order_tasks()
+        self.recompute()
+
+    # Full passes
+
+    def recompute(self):
+        for task_id in self.order:
+            self._update_early(task_id)
+        self.project_finish = max(self.early_finish.values(), default=0)
+        self._backward_pass()
+
+    def _order_tasks(self):
+        """Topological order (Kahn); raises DependencyCycleError if there is none"""
+        remaining = {task_id: len(preds) for task_id, preds in self.predecessors.items()}
+        ready = sorted(task_id for task_id, count in remaining.items() if count == 0)
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            task_id = heapq.heappop(ready)
+            order.append(task_id)
+            for successor in self.successors[task_id]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    heapq.heappush(ready, successor)
+        if len(order) != len(self.durations):
+            raise DependencyCycleError("Task dependencies contain a cycle")
+        self.order = order
+        self.position = {task_id: index for index, task_id in enumerate(order)}
+
+    def _backward_pass(self):
+        for task_id in reversed(self.order):
+            self._update_late(task_id)
+
+    # Single-node updates; each returns whether anything changed
+
+    def _update_early(self, task_id: str) -> bool:
+        start = max(
+            (self.early_finish[pred] + lag for pred, lag in self.predecessors[task_id].items()),
+            default=0
+        )
+        finish = start + self.durations[task_id]
+        changed = self.early_start.get(task_id) != start or self.early_finish.get(task_id) != finish
+        self.early_start[task_id] = start
+        self.early_finish[task_id] = finish
+        return changed
+
+    def _update_late(self, task_id: str) -> bool:
+        finish = min(
+            (self.late_start[succ] - lag for succ, lag in self.successors[task_id].items()),
+            default=self.project_finish
+        )
+        if self.deadlines[task_id] is not None:
+            finish = min(finish, self.deadlines[task_id])
+        start = finish - self.durations[task_id]
+        changed = self.late_finish.get(task_id) != finish or self.late_start.get(task_id) != start
+        self.late_finish[task_id] = finish
+        self.late_start[task_id] = start
+        return changed
+
+    # Incremental propagation
+
+    def _propagate_early(self, task_ids) -> Set[str]:
+        """Recompute early times from these tasks downstream, in topological order"""
+        heap = [(self.position[task_id], task_id) for task_id in set(task_ids)]
+        heapq.heapify(heap)
+        queued = set(task_ids)
+        touched = set()
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            queued.discard(task_id)
+            touched.add(task_id)
+            if self._update_early(task_id):
+                for successor in self.successors[task_id]:
+                    if successor not in queued:
+                        queued.add(successor)
+                        heapq.heappush(heap, (self.position[successor], successor))
+        return touched
+
+    def _propagate_late(self, task_ids) -> Set[str]:
+        """Recompute late times from these tasks upstream, in reverse topological order"""
+        heap = [(-self.position[task_id], task_id) for task_id in set(task_ids)]
+        heapq.heapify(heap)
+        queued = set(task_ids)
+        touched = set()
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            queued.discard(task_id)
+            touched.add(task_id)
+            if self._update_late(task_id):
+                for predecessor in self.predecessors[task_id]:
+                    if predecessor not in queued:
+                        queued.add(predecessor)
+                        heapq.heappush(heap, (-self.position[predecessor], predecessor))
+        return touched
+
+    def _settle(self, early_from, late_from) -> Set[str]:
+        touched = self._propagate_early(early_from)
+        finish = max(self.early_finish.values(), default=0)
+        if finish != self.project_finish:
+            # Every task's late times hang off the project finish
+            self.project_finish = finish
+            self._backward_pass()
+            return set(self.durations)
+        return touched | self._propagate_late(late_from)
+
+    # Public changes; each returns the ids of the tasks it revisited
+
+    def set_duration(self, task_id: str, duration: int) -> Set[str]:
+        if self.durations[task_id] == duration:
+            return set()
+        self.durations[task_id] = duration
+        return self._settle([task_id], [task_id])
+
+    def set_deadline(self, task_id: str, deadline: Optional[int]) -> Set[str]:
+        if self.deadlines[task_id] == deadline:
+            return set()
+        self.deadlines[task_id] = deadline
+        return self._propagate_late([task_id])
+
+    def creates_cycle(self, predecessor: str, successor: str) -> bool:
+        """Whether predecessor -> successor would close a loop"""
+        if predecessor == successor:
+            return True
+        stack = [successor]
+        seen = {successor}
+        while stack:
+            task_id = stack.pop()
+            for following in self.successors[task_id]:
+                if following == predecessor:
+                    return True
+                if following not in seen:
+                    seen.add(following)
+                    stack.append(following)
+        return False
+
+    def add_dependency(self, predecessor: str, successor: str, lag: int = 0) -> Set[str]:
+        if self.creates_cycle(predecessor, successor):
+            raise DependencyCycleError("This dependency would create a cycle")
+        self.successors[predecessor][successor] = lag
+        self.predecessors[successor][predecessor] = lag
+        if self.position[predecessor] > self.position[successor]:
+            self._order_tasks()
+        return self._settle([successor], [predecessor])
+
+    def remove_dependency(self, predecessor: str, successor: str) -> Set[str]:
+        if self.successors[predecessor].pop(successor, None) is None:
+            return set()
+        self.predecessors[successor].pop(predecessor, None)
+        return self._settle([successor], [predecessor])
+
+    # Results
+
+    def slack(self, task_id: str) -> int:
+        return self.late_start[task_id] - self.early_start[task_id]
+
+    def critical_chain(self) -> List[str]:
+        """The chain of critical tasks that ends last, from its first task to its last"""
+        critical = [task_id for task_id in self.order if self.slack(task_id) <= 0]
+        if not critical:
+            return []
+        current = max(critical, key=lambda task_id: (self.early_finish[task_id], -self.position[task_id]))
+        chain = [current]
+        while True:
+            driving = [
+                pred for pred, lag in self.predecessors[current].items()
+                if self.slack(pred) <= 0 and self.early_finish[pred] + lag == self.early_start[current]
+            ]
+            if not driving:
+                break
+            current = min(driving, key=lambda task_id: self.position[task_id])
+            chain.append(current)
+        chain.reverse()
+        return chain
+
+
+class ScheduleCache:
+    """Per-project ProjectSchedule objects, trusted only while the project's
+    tasks and dependencies still match the stamp they were built from"""
+
+    def __init__(self, max_projects: int = 256):
+        self.max_projects = max_projects
+        self._entries: Dict[str, Tuple[tuple, date, ProjectSchedule]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str, stamp: tuple) -> Optional[Tuple[date, ProjectSchedule]]:
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or entry[0] != stamp:
+                return None
+            return entry[1], entry[2]
+
+    def set(self, project_id: str, stamp: tuple, origin: date, schedule: ProjectSchedule):
+        with self._lock:
+            if project_id not in self._entries and len(self._entries) >= self.max_projects:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[project_id] = (stamp, origin, schedule)
+
+    def invalidate(self, project_id: str):
+        with self._lock:
+            self._entries.pop(project_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+schedule_cache = ScheduleCache()
+
+
+def schedule_stamp(db: Session, project_id: str) -> tuple:
+    """Cheap summary of a project's tasks and dependencies that changes with any write to them"""
+    tasks = Task.__table__
+    dependencies = TaskDependency.__table__
+    task_ids = select(tasks.c.Id).where(tasks.c.ProjectId == project_id)
+    task_stamp = db.execute(
+        select(func.count(), func.max(tasks.c.UpdatedAt), func.max(tasks.c.CreatedAt))
+        .where(tasks.c.ProjectId == project_id, tasks.c.IsDeleted == False)
+    ).one()
+    dependency_stamp = db.execute(
+        select(func.count(), func.max(dependencies.c.CreatedAt))
+        .where(dependencies.c.SuccessorId.in_(task_ids))
+    ).one()
+    return tuple(task_stamp) + tuple(dependency_stamp)
+
+
+def day_offset(origin: date, deadline: Optional[datetime]) -> Optional[int]:
+    """Deadline as the exclusive day index a task must finish by"""
+    if deadline is None:
+        return None
+    day = deadline.date() if isinstance(deadline, datetime) else deadline
+    return (day - origin).days + 1
+
+
+def build_project_schedule(db: Session, project_id: str) -> Tuple[date, ProjectSchedule]:
+    """Load a project's tasks and dependencies in two queries and run the full CPM passes"""
+    tasks = Task.__table__
+    dependencies = TaskDependency.__table__
+    created_at = db.execute(select(Project.__table__.c.CreatedAt).where(Project.__table__.c.Id == project_id)).scalar()
+    origin = (created_at or datetime.utcnow()).date()
+
+    rows = db.execute(
+        select(tasks.c.Id, tasks.c.DurationDays, tasks.c.Deadline)
+        .where(tasks.c.ProjectId == project_id, tasks.c.IsDeleted == False)
+    ).all()
+    durations = {row.Id: row.DurationDays if row.DurationDays is not None else DEFAULT_DURATION_DAYS for row in rows}
+    deadlines = {row.Id: day_offset(origin, row.Deadline) for row in rows}
+
+    links = db.execute(
+        select(dependencies.c.PredecessorId, dependencies.c.SuccessorId, dependencies.c.LagDays)
+        .where(dependencies.c.SuccessorId.in_(list(durations)))
+    ).all() if durations else []
+
+    return origin, ProjectSchedule(durations, deadlines, [(link[0], link[1], link[2] or 0) for link in links])
+
+
+def get_cached_schedule(db: Session, project_id: str) -> Tuple[date, ProjectSchedule]:
+    stamp = schedule_stamp(db, project_id)
+    cached = schedule_cache.get(project_id, stamp)
+    if cached is not None:
+        return cached
+    try:
+        origin, schedule = build_project_schedule(db, project_id)
+    except DependencyCycleError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+    schedule_cache.set(project_id, stamp, origin, schedule)
+    return origin, schedule
+
+
+def get_project_schedule(db: Session, project_id: str) -> Dict[str, Any]:
+    """Early/late start and finish, slack and the critical chain of every task in a project"""
+    origin, schedule = get_cached_schedule(db, project_id)
+    titles = dict(db.execute(
+        select(Task.__table__.c.Id, Task.__table__.c.Title)
+        .where(Task.__table__.c.ProjectId == project_id, Task.__table__.c.IsDeleted == False)
+    ).all())
+
+    with schedule.lock:
+        return {
+            "ProjectId": project_id,
+            "ProjectStart": origin,
+            "ProjectFinish": schedule.project_finish,
+            "CriticalChain": schedule.critical_chain(),
+            "Tasks": [
+                {
+                    "TaskId": task_id,
+                    "Title": titles.get(task_id, ""),
+                    "DurationDays": schedule.durations[task_id],
+                    "EarlyStart": schedule.early_start[task_id],
+                    "EarlyFinish": schedule.early_finish[task_id],
+                    "LateStart": schedule.late_start[task_id],
+                    "LateFinish": schedule.late_finish[task_id],
+                    "Slack": schedule.slack(task_id),
+                    "Critical": schedule.slack(task_id) <= 0,
+                }
+                for task_id in schedule.order
+            ],
+        }
+
+
+def apply_task_schedule_change(db: Session, task: Task, stamp_before: tuple, changed: Set[str]) -> None:
+    """Carry a committed duration/deadline change into the cached schedule.
+
+    Only applied when the cache was current just before the change, otherwise
+    the next read rebuilds it.
+    """
+    cached = schedule_cache.get(task.ProjectId, stamp_before)
+    if cached is None or task.Id not in cached[1].durations:
+        schedule_cache.invalidate(task.ProjectId)
+        return
+    origin, schedule = cached
+    with schedule.lock:
+        if "DurationDays" in changed:
+            schedule.set_duration(task.Id, task.DurationDays if task.DurationDays is not None else DEFAULT_DURATION_DAYS)
+        if "Deadline" in changed:
+            schedule.set_deadline(task.Id, day_offset(origin, task.Deadline))
+    schedule_cache.set(task.ProjectId, schedule_stamp(db, task.ProjectId), origin, schedule)
+
+
+def get_task_dependencies(db: Session, task_id: str) -> List[TaskDependency]:
+    """Dependencies where the task is either side"""
+    return db.query(TaskDependency).filter(
+        (TaskDependency.PredecessorId == task_id) | (TaskDependency.SuccessorId == task_id)
+    ).all()
+
+
+def dependency_creates_cycle(db: Session, predecessor_id: str, successor_id: str) -> bool:
+    """Whether the committed links lead from the successor back to the predecessor"""
+    dependencies = TaskDependency.__table__
+    reachable = (
+        select(dependencies.c.SuccessorId.label("TaskId"))
+        .where(dependencies.c.PredecessorId == successor_id)
+        .cte("Reachable", recursive=True)
+    )
+    reachable = reachable.union(
+        select(dependencies.c.SuccessorId).where(dependencies.c.PredecessorId == reachable.c.TaskId)
+    )
+    return db.execute(select(reachable.c.TaskId).where(reachable.c.TaskId == predecessor_id).limit(1)).first() is not None
+
+
+def add_task_dependency(
+    db: Session,
+    successor: Task,
+    predecessor_id: str,
+    lag_days: int,
+    user_id: Optional[str]
+) -> TaskDependency:
+    """Make `successor` wait for another task of the same project, refusing cycles"""
+    predecessor = db.query(Task).filter(Task.Id == predecessor_id, Task.IsDeleted == False).first()
+    if not predecessor:
+        raise HTTPException(status_code=404, detail="Predecessor task not found")
+    if predecessor.ProjectId != successor.ProjectId:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Dependencies must link tasks of the same project"
+        )
+
+    origin, schedule = get_cached_schedule(db, successor.ProjectId)
+    with schedule.lock:
+        cycle = schedule.creates_cycle(predecessor.Id, successor.Id)
+    if cycle:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This dependency would create a cycle")
+
+    dependency = TaskDependency(
+        PredecessorId=predecessor.Id,
+        SuccessorId=successor.Id,
+        LagDays=lag_days,
+        CreatedBy=user_id
+    )
+    db.add(dependency)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="These tasks are already linked")
+    db.refresh(dependency)
+
+    with schedule.lock:
+        try:
+            schedule.add_dependency(predecessor.Id, successor.Id, lag_days)
+            cycle = False
+        except DependencyCycleError:
+            cycle = True
+    if cycle or dependency_creates_cycle(db, predecessor.Id, successor.Id):
+        # A concurrent request closed a loop after the check above; take this link back out
+        db.delete(dependency)
+        db.commit()
+        schedule_cache.invalidate(successor.ProjectId)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This dependency would create a cycle")
+    schedule_cache.set(successor.ProjectId, schedule_stamp(db, successor.ProjectId), origin, schedule)
+    return dependency
+
+
+def remove_task_dependency(db: Session, task: Task, dependency_id: str) -> bool:
+    """Delete one of a task's dependencies"""
+    dependency = db.query(TaskDependency).filter(
+        TaskDependency.Id == dependency_id,
+        (TaskDependency.PredecessorId == task.Id) | (TaskDependency.SuccessorId == task.Id)
+    ).first()
+    if not dependency:
+        return False
+    
+    stamp_before = schedule_stamp(db, task.ProjectId)
+    predecessor_id, successor_id = dependency.PredecessorId, dependency.SuccessorId
+    db.delete(dependency)
+    db.commit()
+    
+    cached = schedule_cache.get(task.ProjectId, stamp_before)
+    if cached is None:
+        schedule_cache.invalidate(task.ProjectId)
+        return True
+    origin, schedule = cached
+    with schedule.lock:
+        schedule.remove_dependency(predecessor_id, successor_id)
+    schedule_cache.set(task.ProjectId, schedule_stamp(db, task.ProjectId), origin, schedule)
+    return True
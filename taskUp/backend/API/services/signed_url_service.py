@@ -0,0 +1,89 @@
+# taskUp/backend/API/services/signed_url_service.py
+from fastapi import HTTPException, status
+from typing import Dict, Any, Optional
+from datetime import datetime
+import base64
+import hashlib
+import hmac
+import os
+import time
+
+from API.Models.Attachment import Attachment
+from API.utils.config import UPLOAD_DIR, DOWNLOAD_URL_SECRET, DOWNLOAD_URL_TTL_SECONDS
+
+# A download link carries everything needed to serve the file:
+#   /files/<path under UPLOAD_DIR>?expires=<unix time>&name=..&type=..&hash=..&sig=..
+# `sig` is an HMAC-SHA256 over the path and the other parameters, so the
+# serving route only checks the signature and the clock; it never queries the
+# database. Links cannot be revoked before they expire, so keep the TTL short.
+
+
+def download_signature(
+    relative_path: str,
+    expires: int,
+    file_name: str,
+    file_type: Optional[str],
+    content_hash: Optional[str],
+    secret: str = DOWNLOAD_URL_SECRET
+) -> str:
+    """URL-safe HMAC-SHA256 of a download link's parameters"""
+    if not secret:
+        raise RuntimeError("DOWNLOAD_URL_SECRET is not set")
+    message = "\n".join([relative_path, str(expires), file_name, file_type or "", content_hash or ""])
+    digest = hmac.new(secret.encode(), message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def create_download_link(
+    attachment: Attachment,
+    ttl_seconds: int = DOWNLOAD_URL_TTL_SECONDS,
+    upload_dir: str = UPLOAD_DIR,
+    secret: str = DOWNLOAD_URL_SECRET,
+    now: Optional[float] = None
+) -> Dict[str, Any]:
+    """Path and signed query parameters for a time-limited download of an attachment"""
+    relative_path = os.path.relpath(attachment.FilePath, upload_dir).replace(os.sep, "/")
+    if relative_path.startswith("../"):
+        raise HTTPException(status_code=404, detail="Attachment file not found")
+
+    expires = int(now or time.time()) + ttl_seconds
+    params = {
+        "expires": expires,
+        "name": attachment.FileName,
+        "type": attachment.FileType or "",
+        "hash": attachment.ContentHash or "",
+    }
+    params["sig"] = download_signature(
+        relative_path, expires, attachment.FileName, attachment.FileType, attachment.ContentHash, secret
+    )
+    return {
+        "path": relative_path,
+        "params": params,
+        "expires_at": datetime.utcfromtimestamp(expires),
+    }
+
+
+def verify_download_link(
+    relative_path: str,
+    expires: int,
+    file_name: str,
+    file_type: Optional[str],
+    content_hash: Optional[str],
+    signature: str,
+    upload_dir: str = UPLOAD_DIR,
+    secret: str = DOWNLOAD_URL_SECRET,
+    now: Optional[float] = None
+) -> str:
+    """Check a signed download link, returning the file path it grants access to"""
+    expected = download_signature(relative_path, expires, file_name, file_type, content_hash, secret)
+    if not hmac.compare_digest(expected, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid download link")
+    if expires < (now or time.time()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Download link expired")
+
+    # Signed paths come from our own rows, but never let one escape the upload directory
+    root = os.path.realpath(upload_dir)
+    path = os.path.realpath(os.path.join(root, relative_path))
+    if os.path.commonpath([root, path]) != root:
+        raise HTTPException(status_code=404, detail="Attachment file not found")
+    return path
@@ -0,0 +1,259 @@
+# taskUp/backend/API/services/storage_gc_service.py
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from datetime import timezone
+import os
+import time
+
+from API.Models.Attachment import Attachment
+from API.Models.AttachmentBlob import AttachmentBlob
+from API.services.storage_service import RELEASED_SUFFIX, blob_path, remove_quietly, restore_blob, set_aside_blob
+from API.utils.config import (
+    UPLOAD_DIR, BLOB_DIR, UPLOAD_SESSION_DIR, STORAGE_GC_GRACE_SECONDS, STORAGE_GC_BATCH_SIZE
+)
+
+# Storage garbage collection.
+#
+# Uploads write their file before the row that references it is committed, so
+# nothing younger than the grace period is ever removed. Reference counts are
+# only corrected with compare-and-set updates, so an upload that takes a
+# reference while the collector runs always wins.
+
+
+def new_report() -> Dict[str, int]:
+    return {
+        "FilesScanned": 0,
+        "FilesRemoved": 0,
+        "FilesSkipped": 0,
+        "BytesReclaimed": 0,
+        "BlobsRemoved": 0,
+        "RefCountsFixed": 0,
+    }
+
+
+def batched(items: Iterator, batch_size: int) -> Iterator[List]:
+    """Split an iterator into lists of at most batch_size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def walk_files(root: str, skip_dirs: Tuple[str, ...] = ()) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (path, stat) for regular files under root, skipping some directories"""
+    skip = {os.path.abspath(path) for path in skip_dirs}
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [
+            name for name in subdirectories if os.path.abspath(os.path.join(directory, name)) not in skip
+        ]
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                yield path, os.stat(path)
+            except OSError:
+                continue
+
+
+def remove_file(path: str, size: int, report: Dict[str, int], dry_run: bool) -> None:
+    if not dry_run:
+        remove_quietly(path)
+    report["FilesRemoved"] += 1
+    report["BytesReclaimed"] += size
+
+
+def reconcile_blob_refcounts(
+    db: Session,
+    report: Dict[str, int],
+    cutoff: float,
+    batch_size: int = STORAGE_GC_BATCH_SIZE,
+    dry_run: bool = False,
+    blob_dir: str = BLOB_DIR
+) -> None:
+    """Fix drifted RefCounts and remove blobs no attachment points at"""
+    blobs = AttachmentBlob.__table__
+    attachments = Attachment.__table__
+
+    last_hash = ""
+    while True:
+        rows = db.execute(
+            select(blobs.c.Hash, blobs.c.RefCount, blobs.c.Path, blobs.c.Size, blobs.c.CreatedAt)
+            .where(blobs.c.Hash > last_hash)
+            .order_by(blobs.c.Hash)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_hash = rows[-1].Hash
+
+        # Only attachments stored in the blob count; older ones have a hash but their own file
+        hashes = [row.Hash for row in rows]
+        actual = {
+            (content_hash, file_path): count for content_hash, file_path, count in db.execute(
+                select(attachments.c.ContentHash, attachments.c.FilePath, func.count())
+                .where(attachments.c.ContentHash.in_(hashes))
+                .group_by(attachments.c.ContentHash, attachments.c.FilePath)
+            ).all()
+        }
+
+        for row in rows:
+            references = actual.get((row.Hash, row.Path), 0)
+            if references == row.RefCount:
+                continue
+            # CreatedAt is naive UTC; without the tzinfo, timestamp() would read it as local time
+            if references == 0 and row.CreatedAt and row.CreatedAt.replace(tzinfo=timezone.utc).timestamp() > cutoff:
+                # Possibly an upload whose attachment row is not committed yet
+                continue
+
+            report["RefCountsFixed"] += 1
+            if dry_run:
+                if references == 0:
+                    report["BlobsRemoved"] += 1
+                    report["FilesRemoved"] += 1
+                    report["BytesReclaimed"] += row.Size or 0
+                continue
+
+            fixed = db.execute(
+                update(blobs)
+                .where(blobs.c.Hash == row.Hash, blobs.c.RefCount == row.RefCount)
+                .values(RefCount=references)
+            ).rowcount
+            released_path = None
+            if fixed and references == 0:
+                removed = db.execute(
+                    delete(blobs).where(blobs.c.Hash == row.Hash, blobs.c.RefCount <= 0)
+                ).rowcount
+                if removed:
+                    # Set aside now, removed only once the delete has committed
+                    released_path = set_aside_blob(row.Path or blob_path(row.Hash, blob_dir))
+                    report["BlobsRemoved"] += 1
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()
+                if released_path:
+                    restore_blob(released_path)
+                raise
+            if released_path:
+                remove_file(released_path, row.Size or 0, report, dry_run)
+
+        if len(rows) < batch_size:
+            break
+
+
+def collect_orphan_blob_files(
+    db: Session,
+    report: Dict[str, int],
+    cutoff: float,
+    batch_size: int = STORAGE_GC_BATCH_SIZE,
+    dry_run: bool = False,
+    blob_dir: str = BLOB_DIR
+) -> None:
+    """Remove blob files with no AttachmentBlob row, and stale upload temp files"""
+    blobs = AttachmentBlob.__table__
+    temp_dir = os.path.join(blob_dir, "tmp")
+
+    for path, stat_result in walk_files(temp_dir):
+        report["FilesScanned"] += 1
+        if stat_result.st_mtime < cutoff:
+            remove_file(path, stat_result.st_size, report, dry_run)
+
+    candidates = (
+        (path, stat_result) for path, stat_result in walk_files(blob_dir, skip_dirs=(temp_dir,))
+    )
+    for batch in batched(candidates, batch_size):
+        report["FilesScanned"] += len(batch)
+        # Set-aside files are named after the hash they were released from
+        old = [
+            (os.path.basename(path).split(RELEASED_SUFFIX, 1)[0], path, stat_result)
+            for path, stat_result in batch if stat_result.st_mtime < cutoff
+        ]
+        if not old:
+            continue
+        known = set(db.execute(
+            select(blobs.c.Hash).where(blobs.c.Hash.in_({content_hash for content_hash, _, _ in old}))
+        ).scalars())
+        for content_hash, path, stat_result in old:
+            if content_hash not in known:
+                remove_file(path, stat_result.st_size, report, dry_run)
+            elif RELEASED_SUFFIX in os.path.basename(path):
+                # Left by a delete that never committed; put it back unless the blob was re-placed
+                if os.path.exists(blob_path(content_hash, blob_dir)):
+                    remove_file(path, stat_result.st_size, report, dry_run)
+                elif not dry_run:
+                    restore_blob(path)
+
+
+def referenced_task_files(db: Session, upload_dir: str, batch_size: int = STORAGE_GC_BATCH_SIZE) -> Set[str]:
+    """Real paths of the attachment files stored under upload_dir"""
+    attachments = Attachment.__table__
+    root = os.path.realpath(upload_dir)
+
+    paths = set()
+    rows = db.execute(
+        select(attachments.c.FilePath)
+        .where(attachments.c.FilePath.isnot(None))
+        .execution_options(yield_per=batch_size)
+    )
+    for (file_path,) in rows:
+        # Rows may hold relative paths or another spelling of the upload root
+        path = os.path.realpath(file_path)
+        if path.startswith(root + os.sep):
+            paths.add(path)
+    return paths
+
+
+def collect_orphan_task_files(
+    db: Session,
+    report: Dict[str, int],
+    cutoff: float,
+    batch_size: int = STORAGE_GC_BATCH_SIZE,
+    dry_run: bool = False,
+    upload_dir: str = UPLOAD_DIR,
+    skip_dirs: Tuple[str, ...] = (BLOB_DIR, UPLOAD_SESSION_DIR)
+) -> None:
+    """Remove files in the pre-blob per-task directories that no attachment references.
+
+    Paths are compared by their real path on both sides. A batch in which no
+    file matches any attachment is left alone: that is what a mismatch between
+    stored paths and the directory looks like, and removing it could wipe out
+    every legacy file.
+    """
+    referenced = referenced_task_files(db, upload_dir, batch_size)
+
+    candidates = walk_files(upload_dir, skip_dirs=skip_dirs)
+    for batch in batched(candidates, batch_size):
+        report["FilesScanned"] += len(batch)
+        real_paths = [(os.path.realpath(path), path, stat_result) for path, stat_result in batch]
+        if not any(real_path in referenced for real_path, _, _ in real_paths):
+            report["FilesSkipped"] += len(batch)
+            continue
+        for real_path, path, stat_result in real_paths:
+            if real_path not in referenced and stat_result.st_mtime < cutoff:
+                remove_file(path, stat_result.st_size, report, dry_run)
+
+
+def collect_storage_garbage(
+    db: Session,
+    grace_seconds: int = STORAGE_GC_GRACE_SECONDS,
+    batch_size: int = STORAGE_GC_BATCH_SIZE,
+    dry_run: bool = False,
+    now: Optional[float] = None
+) -> Dict[str, int]:
+    """Reconcile UPLOAD_DIR against Attachment rows and reclaim unreferenced files.
+
+    Returns counts of scanned and removed files, reclaimed bytes, removed blobs
+    and corrected reference counts. With dry_run nothing is changed.
+    """
+    report = new_report()
+    cutoff = (now or time.time()) - grace_seconds
+
+    reconcile_blob_refcounts(db, report, cutoff, batch_size, dry_run)
+    collect_orphan_blob_files(db, report, cutoff, batch_size, dry_run)
+    collect_orphan_task_files(db, report, cutoff, batch_size, dry_run)
+
+    return report
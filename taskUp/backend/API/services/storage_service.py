@@ -0,0 +1,284 @@
+# taskUp/backend/API/services/storage_service.py
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import BinaryIO, Dict, Any, Optional
+from datetime import datetime
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+
+from API.Models.AttachmentBlob import AttachmentBlob
+from API.utils.config import MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE, BLOB_DIR
+
+# Blob files whose last reference is being deleted wait under this suffix
+# until the delete commits
+RELEASED_SUFFIX = ".released-"
+
+
+def upload_too_large(max_size: int = MAX_UPLOAD_SIZE) -> HTTPException:
+    """413 error for uploads over the size limit"""
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the maximum upload size of {max_size} bytes"
+    )
+
+
+def remove_quietly(path: str) -> None:
+    """Remove a file, ignoring it if it is already gone"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def stream_to_temp(
+    source: BinaryIO,
+    dest_dir: str,
+    max_size: int = MAX_UPLOAD_SIZE,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    expected_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Copy `source` to a temp file in `dest_dir`, hashing and size-checking each chunk.
+
+    The checks only see bytes as fast as `source` yields them. For a multipart
+    UploadFile, Starlette has already spooled the whole body before the route
+    runs, so the limit bounds what reaches the blob store rather than what the
+    server receives; resumable uploads pass the request stream itself.
+
+    Any failure, including the upload going over `max_size`, removes the temp
+    file. Returns the temp path, size in bytes and SHA-256 hex digest; the
+    caller is responsible for moving or removing the temp file.
+    """
+    if expected_size is not None and expected_size > max_size:
+        raise upload_too_large(max_size)
+
+    os.makedirs(dest_dir, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise upload_too_large(max_size)
+                digest.update(chunk)
+                buffer.write(chunk)
+            buffer.flush()
+            os.fsync(buffer.fileno())
+    except BaseException:
+        remove_quietly(temp_path)
+        raise
+
+    return {"path": temp_path, "size": size, "sha256": digest.hexdigest()}
+
+
+def stream_to_file(
+    source: BinaryIO,
+    dest_path: str,
+    max_size: int = MAX_UPLOAD_SIZE,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    expected_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Copy `source` to `dest_path` in chunks, hashing and size-checking each chunk.
+
+    Bytes go to a temp file in the destination directory, which is renamed
+    into place only once the whole upload has been written and flushed, so
+    readers never see a partial file.
+
+    Returns the final path, size in bytes and SHA-256 hex digest.
+    """
+    stored = stream_to_temp(source, os.path.dirname(dest_path), max_size, chunk_size, expected_size)
+    try:
+        os.replace(stored["path"], dest_path)
+    except BaseException:
+        remove_quietly(stored["path"])
+        raise
+
+    return {**stored, "path": dest_path}
+
+
+# Blob store functions
+def blob_path(content_hash: str, blob_dir: str = BLOB_DIR) -> str:
+    """Location of a blob on disk, fanned out by hash prefix"""
+    return os.path.join(blob_dir, content_hash[:2], content_hash[2:4], content_hash)
+
+
+def acquire_blob(db: Session, content_hash: str, size: int, blob_dir: str = BLOB_DIR) -> Dict[str, Any]:
+    """Add a reference to the blob for `content_hash`, creating its row if needed.
+
+    The increment is a single UPDATE so concurrent uploads of the same content
+    never lose a reference. Changes are flushed but not committed; the caller
+    commits together with the Attachment row that holds the reference.
+    Returns the blob path and whether this call created the blob row.
+    """
+    blobs = AttachmentBlob.__table__
+    path = blob_path(content_hash, blob_dir)
+
+    while True:
+        result = db.execute(
+            update(blobs)
+            .where(blobs.c.Hash == content_hash)
+            .values(RefCount=blobs.c.RefCount + 1)
+        )
+        if result.rowcount:
+            return {"path": path, "created": False}
+
+        try:
+            with db.begin_nested():
+                db.execute(blobs.insert().values(
+                    Hash=content_hash,
+                    Size=size,
+                    Path=path,
+                    RefCount=1,
+                    CreatedAt=datetime.utcnow()
+                ))
+            return {"path": path, "created": True}
+        except IntegrityError:
+            # Another upload created the row first; take a reference on it instead
+            continue
+
+
+def hash_file(path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Dict[str, Any]:
+    """Size and SHA-256 of a file already on disk, read in chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as source:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+    return {"path": path, "size": size, "sha256": digest.hexdigest()}
+
+
+def place_blob(
+    db: Session,
+    stored: Dict[str, Any],
+    blob_dir: str = BLOB_DIR,
+    keep_source: bool = False
+) -> Dict[str, Any]:
+    """Take a reference on the blob for a hashed temp file, moving it in if it is new.
+
+    `stored` is the result of `stream_to_temp` or `hash_file`; the temp file is
+    consumed unless `keep_source` is set, in which case a new blob is linked
+    (or copied) from it and the source is left for the caller. Content that is
+    already stored is not written again. Returns the blob path, size, SHA-256
+    and whether a new blob file was placed (so the caller can undo it on failure).
+    """
+    try:
+        blob = acquire_blob(db, stored["sha256"], stored["size"], blob_dir)
+
+        placed = False
+        if os.path.exists(blob["path"]):
+            if not keep_source:
+                remove_quietly(stored["path"])
+        else:
+            # New blob, or a row whose file went missing; put the content in place
+            os.makedirs(os.path.dirname(blob["path"]), exist_ok=True)
+            if not keep_source:
+                os.replace(stored["path"], blob["path"])
+                placed = True
+            else:
+                try:
+                    link_or_copy(stored["path"], blob["path"])
+                    placed = True
+                except FileExistsError:
+                    # A concurrent upload of the same content got there first
+                    pass
+    except BaseException:
+        if not keep_source:
+            remove_quietly(stored["path"])
+        raise
+
+    return {"path": blob["path"], "size": stored["size"], "sha256": stored["sha256"], "placed": placed}
+
+
+def link_or_copy(source_path: str, dest_path: str) -> None:
+    """Hard-link a file into place, copying it when the link cannot be made"""
+    try:
+        os.link(source_path, dest_path)
+        return
+    except FileExistsError:
+        raise
+    except OSError:
+        # Different filesystem, or links not supported
+        pass
+
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(dest_path), prefix=".copy-", suffix=".part")
+    try:
+        with open(source_path, "rb") as source, os.fdopen(fd, "wb") as buffer:
+            shutil.copyfileobj(source, buffer, UPLOAD_CHUNK_SIZE)
+            buffer.flush()
+            os.fsync(buffer.fileno())
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        remove_quietly(temp_path)
+        raise
+
+
+def store_blob(
+    db: Session,
+    source: BinaryIO,
+    max_size: int = MAX_UPLOAD_SIZE,
+    expected_size: Optional[int] = None,
+    blob_dir: str = BLOB_DIR
+) -> Dict[str, Any]:
+    """Stream an upload into the blob store and take a reference on its blob"""
+    stored = stream_to_temp(source, os.path.join(blob_dir, "tmp"), max_size, expected_size=expected_size)
+    return place_blob(db, stored, blob_dir)
+
+
+def release_blob(db: Session, content_hash: str) -> Optional[str]:
+    """Drop a reference to a blob, deleting the row with the last one.
+
+    With the last reference the blob file is renamed aside in the same step
+    (see `set_aside_blob`) and the new path returned; otherwise None. The
+    caller removes that file after its commit, or puts it back with
+    `restore_blob` if the transaction rolls back. Renaming it before the
+    commit means an upload of the same content that recreates the row once
+    the commit releases it places a fresh file, which the later removal
+    cannot touch.
+    """
+    blobs = AttachmentBlob.__table__
+
+    result = db.execute(
+        update(blobs)
+        .where(blobs.c.Hash == content_hash)
+        .values(RefCount=blobs.c.RefCount - 1)
+    )
+    if not result.rowcount:
+        return None
+
+    path = db.execute(
+        select(blobs.c.Path).where(blobs.c.Hash == content_hash, blobs.c.RefCount <= 0)
+    ).scalar()
+    if path is None:
+        return None
+
+    db.execute(delete(blobs).where(blobs.c.Hash == content_hash))
+    return set_aside_blob(path)
+
+
+def set_aside_blob(path: str) -> Optional[str]:
+    """Rename a blob file whose row is being deleted; None if it is already gone"""
+    released_path = f"{path}{RELEASED_SUFFIX}{uuid.uuid4().hex}"
+    try:
+        os.replace(path, released_path)
+    except FileNotFoundError:
+        return None
+    return released_path
+
+
+def restore_blob(released_path: str) -> None:
+    """Put a set-aside blob file back after the delete of its row rolled back"""
+    os.replace(released_path, released_path.rsplit(RELEASED_SUFFIX, 1)[0])
@@ -4,7 +4,6 @@ from fastapi import HTTPException, status, UploadFile
 import uuid
 from datetime import datetime
 import os
-import shutil
 
 from API.Models.Task import Task
 from API.Models.Comment import Comment
@@ -16,7 +15,11 @@ from API.Models.TaskAssignment import TaskAssignment
 from API.Models.AssignmentType import AssignmentType
 from API.schemas.task import TaskCreate, TaskUpdate, TaskAssignmentCreate
 from API.schemas.comment import CommentCreate, CommentUpdate
-from API.utils.config import UPLOAD_DIR
+from API.services.storage_service import store_blob, release_blob, restore_blob, blob_path, remove_quietly
+from API.services.schedule_service import schedule_stamp, apply_task_schedule_change
+from API.services.quota_service import (
+    check_storage_quota, add_storage_usage, release_storage_usage, get_task_project_id
+)
 
 # Task functions
 def get_task_by_id(db: Session, task_id: str) -> Optional[Task]:
@@ -140,6 +143,7 @@ def create_task(db: Session, task: TaskCreate, user_id: str) -> Task:
         IsSubtask=task.ParentTaskId is not None,
         ParentTaskId=task.ParentTaskId,
         Deadline=task.Deadline,
+        DurationDays=task.DurationDays,
         BudgetAllocated=task.BudgetAllocated,
         PriorityId=task.PriorityId,
         StatusId=task.StatusId,
@@ -185,12 +189,16 @@ def update_task(db: Session, task_id: str, task_update: TaskUpdate) -> Optional[
             if completed_status:
                 update_data["StatusId"] = completed_status.Id
     
+    stamp_before = schedule_stamp(db, db_task.ProjectId)
     for key, value in update_data.items():
         setattr(db_task, key, value)
     
     db.commit()
     db.refresh(db_task)
     
+    # Durations and deadlines move the critical path; apply them to the cached schedule in place
+    apply_task_schedule_change(db, db_task, stamp_before, set(update_data))
+    
     return db_task
 
 def delete_task(db: Session, task_id: str) -> bool:
@@ -332,45 +340,57 @@ def save_attachment(
     user_id: str, 
     db: Session
 ) -> Attachment:
-    """Save an uploaded file as an attachment to a task"""
+    """Save an uploaded file as an attachment to a task.
+
+    The multipart body has already been received in full by the time this
+    runs, so the size limit here only keeps oversized files out of the blob
+    store. Large files should go through the resumable uploads, which enforce
+    the limit on the request stream.
+    """
     # Check if task exists
     db_task = get_task_by_id(db, task_id)
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Create a unique filename
-    unique_id = uuid.uuid4()
-    original_filename = file.filename
-    filename_parts = os.path.splitext(original_filename)
-    extension = filename_parts[1] if len(filename_parts) > 1 else ""
-    safe_filename = f"{unique_id}{extension}"
-    
-    # Create task-specific directory if it doesn't exist
-    task_upload_dir = os.path.join(UPLOAD_DIR, task_id)
-    os.makedirs(task_upload_dir, exist_ok=True)
-    
-    # Save the file
-    file_path = os.path.join(task_upload_dir, safe_filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Refuse before copying if the spooled size cannot fit in the quotas
+    check_storage_quota(db, db_task.ProjectId, user_id, file.size or 0)
     
-    # Get file size
-    file_size = os.path.getsize(file_path)
+    # Copy the spooled file into the blob store; identical content is stored only once
+    stored = store_blob(db, file.file, expected_size=file.size)
     
-    # Create attachment record
+    return create_attachment_record(db, task_id, user_id, file.filename, file.content_type, stored)
+
+def create_attachment_record(
+    db: Session,
+    task_id: str,
+    user_id: str,
+    file_name: str,
+    file_type: Optional[str],
+    stored: Dict[str, Any]
+) -> Attachment:
+    """Create the Attachment row for a file placed in the blob store"""
     db_attachment = Attachment(
-        Id=str(unique_id),
+        Id=str(uuid.uuid4()),
         TaskId=task_id,
-        FileName=original_filename,
-        FileType=file.content_type,
-        FileSize=file_size,
-        FilePath=file_path,
+        FileName=file_name,
+        FileType=file_type,
+        FileSize=stored["size"],
+        FilePath=stored["path"],
+        ContentHash=stored["sha256"],
         UploadedById=user_id,
         UploadedAt=datetime.utcnow()
     )
     
-    db.add(db_attachment)
-    db.commit()
+    try:
+        db.add(db_attachment)
+        # Raises 413 when the upload does not fit; the rollback below undoes everything
+        add_storage_usage(db, get_task_project_id(db, task_id), user_id, stored["size"])
+        db.commit()
+    except Exception:
+        db.rollback()
+        if stored["placed"]:
+            os.remove(stored["path"])
+        raise
     db.refresh(db_attachment)
     
     return db_attachment
@@ -390,15 +410,30 @@ def delete_attachment(db: Session, attachment_id: str, user_id: str) -> bool:
             detail="You don't have permission to delete this attachment"
         )
     
-    # Delete the file
+    released_path = None
+    unused_path = None
     try:
-        if os.path.exists(db_attachment.FilePath):
-            os.remove(db_attachment.FilePath)
-    except Exception as e:
-        # Log the error but continue with record deletion
-        print(f"Error deleting file: {e}")
-    
-    db.delete(db_attachment)
-    db.commit()
+        # Drop the blob reference; the file only goes with the last attachment using it
+        if db_attachment.ContentHash and db_attachment.FilePath == blob_path(db_attachment.ContentHash):
+            released_path = release_blob(db, db_attachment.ContentHash)
+        else:
+            # Files uploaded before the blob store live in per-task directories
+            unused_path = db_attachment.FilePath
+        
+        release_storage_usage(
+            db, get_task_project_id(db, db_attachment.TaskId), db_attachment.UploadedById, db_attachment.FileSize or 0
+        )
+        db.delete(db_attachment)
+        db.commit()
+    except Exception:
+        db.rollback()
+        if released_path:
+            restore_blob(released_path)
+        raise
+    
+    # Only once the rows are gone, so a failed commit leaves the file in place
+    for path in (released_path, unused_path):
+        if path:
+            remove_quietly(path)
     
     return True
\ No newline at end of file
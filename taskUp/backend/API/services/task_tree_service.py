@@ -0,0 +1,88 @@
+# taskUp/backend/API/services/task_tree_service.py
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional
+from decimal import Decimal
+
+from API.Models.Task import Task
+from API.Models.Expense import Expense
+from API.utils.config import TASK_TREE_MAX_DEPTH
+
+# Subtask trees.
+#
+# Task.Subtasks loads one level per lazy query. Here a recursive CTE walks the
+# whole subtree of a task in one statement, joined to the expenses of every
+# task in it. The rows come back ordered by depth, so parents are seen before
+# their children when nesting and children before their parents when rolling
+# budgets, expenses and completion up the tree. Deleted tasks hide their whole
+# subtree, and TASK_TREE_MAX_DEPTH stops the walk if ParentTaskId ever loops.
+
+
+def get_task_tree(db: Session, task_id: str) -> Optional[Dict[str, Any]]:
+    """Get a task and all its subtasks as a nested tree with rolled-up totals"""
+    tasks = Task.__table__
+    expenses = Expense.__table__
+
+    root = select(
+        tasks.c.Id, tasks.c.ParentTaskId, tasks.c.Title, tasks.c.Completed,
+        tasks.c.BudgetAllocated, tasks.c.Deadline, tasks.c.CreatedAt, literal(0).label("Depth")
+    ).where(tasks.c.Id == task_id, tasks.c.IsDeleted == False)
+    tree = root.cte("TaskTree", recursive=True)
+    children = tasks.alias("Child")
+    tree = tree.union_all(
+        select(
+            children.c.Id, children.c.ParentTaskId, children.c.Title, children.c.Completed,
+            children.c.BudgetAllocated, children.c.Deadline, children.c.CreatedAt, tree.c.Depth + 1
+        ).where(
+            children.c.ParentTaskId == tree.c.Id,
+            children.c.IsDeleted == False,
+            tree.c.Depth < TASK_TREE_MAX_DEPTH
+        )
+    )
+
+    rows = db.execute(
+        select(tree, func.coalesce(func.sum(expenses.c.Amount), 0).label("Spent"))
+        .outerjoin(expenses, expenses.c.TaskId == tree.c.Id)
+        .group_by(*tree.c)
+        .order_by(tree.c.Depth, tree.c.CreatedAt, tree.c.Id)
+    ).all()
+    if not rows:
+        return None
+
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        if row.Id in nodes:
+            continue
+        budget = Decimal(str(row.BudgetAllocated or 0))
+        spent = Decimal(str(row.Spent or 0))
+        node = {
+            "TaskId": row.Id,
+            "ParentTaskId": row.ParentTaskId if row.Depth else None,
+            "Title": row.Title,
+            "Depth": row.Depth,
+            "Deadline": row.Deadline,
+            "Completed": bool(row.Completed),
+            "BudgetAllocated": budget,
+            "Expenses": spent,
+            "TotalBudgetAllocated": budget,
+            "TotalExpenses": spent,
+            "TaskCount": 1,
+            "CompletedCount": 1 if row.Completed else 0,
+            "CompletionPercent": 0.0,
+            "Subtasks": [],
+        }
+        nodes[row.Id] = node
+        if row.Depth:
+            nodes[row.ParentTaskId]["Subtasks"].append(node)
+
+    # Deepest first, so every node is complete before it is added to its parent
+    for node in reversed(list(nodes.values())):
+        node["CompletionPercent"] = round(100.0 * node["CompletedCount"] / node["TaskCount"], 2)
+        parent = nodes.get(node["ParentTaskId"]) if node["ParentTaskId"] else None
+        if parent is not None:
+            parent["TotalBudgetAllocated"] += node["TotalBudgetAllocated"]
+            parent["TotalExpenses"] += node["TotalExpenses"]
+            parent["TaskCount"] += node["TaskCount"]
+            parent["CompletedCount"] += node["CompletedCount"]
+
+    return nodes[task_id]
@@ -11,6 +11,13 @@ from API.Models.TeamProject import TeamProject
 from API.Models.Project import Project
 from API.schemas.team import TeamCreate, TeamUpdate
 from API.schemas.team_member import TeamMemberCreate, TeamMemberUpdate
+from API.services.project_service import project_access_cache
+
+def invalidate_team_project_access(db: Session, team_id: str):
+    """Drop cached project access for every project the team works on"""
+    project_ids = db.query(TeamProject.ProjectId).filter(TeamProject.TeamId == team_id).all()
+    for (project_id,) in project_ids:
+        project_access_cache.invalidate(project_id)
 
 # Team functions
 def get_team_by_id(db: Session, team_id: str) -> Optional[Team]:
@@ -109,6 +116,7 @@ def delete_team(db: Session, team_id: str) -> bool:
     
     db_team.IsDeleted = True
     db.commit()
+    invalidate_team_project_access(db, team_id)
     
     return True
 
@@ -163,6 +171,7 @@ def add_member_to_team(db: Session, team_member: TeamMemberCreate) -> TeamMember
     db.add(db_team_member)
     db.commit()
     db.refresh(db_team_member)
+    invalidate_team_project_access(db, team_member.TeamId)
     
     return db_team_member
 
@@ -239,6 +248,7 @@ def remove_member_from_team(db: Session, team_id: str, user_id: str) -> bool:
     # Soft delete by setting IsActive to False
     db_team_member.IsActive = False
     db.commit()
+    invalidate_team_project_access(db, team_id)
     
     return True
 
@@ -278,6 +288,7 @@ def add_project_to_team(db: Session, team_id: str, project_id: str) -> TeamProje
     db.add(db_team_project)
     db.commit()
     db.refresh(db_team_project)
+    project_access_cache.invalidate(project_id)
     
     return db_team_project
 
@@ -294,5 +305,6 @@ def remove_project_from_team(db: Session, team_id: str, project_id: str) -> bool
     
     db.delete(db_team_project)
     db.commit()
+    project_access_cache.invalidate(project_id)
     
     return True
\ No newline at end of file
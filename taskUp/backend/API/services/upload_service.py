@@ -0,0 +1,233 @@
+# taskUp/backend/API/services/upload_service.py
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import AsyncIterator, Dict, Any, Optional
+from datetime import datetime, timedelta
+import asyncio
+import json
+import logging
+import os
+import shutil
+import uuid
+
+from API.Models.Attachment import Attachment
+from API.services.storage_service import hash_file, place_blob, upload_too_large
+from API.utils.config import (
+    MAX_UPLOAD_SIZE, UPLOAD_SESSION_DIR, UPLOAD_SESSION_TTL_SECONDS, UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Resumable uploads keep their state on local disk, one directory per session:
+#   <UPLOAD_SESSION_DIR>/<upload_id>/session.json  - task, owner and declared file info
+#   <UPLOAD_SESSION_DIR>/<upload_id>/data.part     - bytes received so far
+# The current offset is simply the size of data.part, so it survives restarts.
+SESSION_FILE = "session.json"
+DATA_FILE = "data.part"
+
+# Serializes chunk writes per session within this process
+_session_locks: Dict[str, asyncio.Lock] = {}
+
+
+def session_path(upload_id: str, session_dir: str = UPLOAD_SESSION_DIR) -> str:
+    """Directory of an upload session, rejecting ids that are not UUIDs"""
+    try:
+        upload_id = str(uuid.UUID(upload_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return os.path.join(session_dir, upload_id)
+
+
+def session_state(path: str) -> Dict[str, Any]:
+    """Session metadata plus the current offset and expiry"""
+    with open(os.path.join(path, SESSION_FILE)) as meta_file:
+        session = json.load(meta_file)
+
+    data_path = os.path.join(path, DATA_FILE)
+    session["Offset"] = os.path.getsize(data_path)
+    last_activity = datetime.utcfromtimestamp(os.path.getmtime(data_path))
+    session["ExpiresAt"] = last_activity + timedelta(seconds=UPLOAD_SESSION_TTL_SECONDS)
+    return session
+
+
+def create_upload_session(
+    task_id: str,
+    user_id: str,
+    file_name: str,
+    file_type: Optional[str],
+    file_size: int,
+    session_dir: str = UPLOAD_SESSION_DIR
+) -> Dict[str, Any]:
+    """Start a resumable upload for a file of a declared size"""
+    if file_size > MAX_UPLOAD_SIZE:
+        raise upload_too_large()
+
+    upload_id = str(uuid.uuid4())
+    path = os.path.join(session_dir, upload_id)
+    os.makedirs(path)
+
+    session = {
+        "UploadId": upload_id,
+        "TaskId": task_id,
+        "UserId": user_id,
+        "FileName": file_name,
+        "FileType": file_type,
+        "FileSize": file_size,
+        "CreatedAt": datetime.utcnow().isoformat()
+    }
+    with open(os.path.join(path, SESSION_FILE), "w") as meta_file:
+        json.dump(session, meta_file)
+    open(os.path.join(path, DATA_FILE), "wb").close()
+
+    return session_state(path)
+
+
+def get_upload_session(
+    upload_id: str,
+    task_id: str,
+    user_id: str,
+    session_dir: str = UPLOAD_SESSION_DIR
+) -> Dict[str, Any]:
+    """Get an upload session owned by the user, or raise 404"""
+    path = session_path(upload_id, session_dir)
+    try:
+        session = session_state(path)
+    except (OSError, ValueError):
+        raise HTTPException(status_code=404, detail="Upload session not found")
+
+    if session["TaskId"] != task_id or session["UserId"] != user_id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if session["ExpiresAt"] < datetime.utcnow():
+        raise HTTPException(status_code=404, detail="Upload session expired")
+
+    return session
+
+
+def offset_mismatch(offset: int) -> HTTPException:
+    """409 error telling the client where to resume from"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Upload offset mismatch; resume from byte {offset}",
+        headers={"Upload-Offset": str(offset)}
+    )
+
+
+async def append_upload_chunk(
+    upload_id: str,
+    task_id: str,
+    user_id: str,
+    offset: int,
+    chunks: AsyncIterator[bytes],
+    session_dir: str = UPLOAD_SESSION_DIR
+) -> Dict[str, Any]:
+    """Append a chunk at `offset`, writing each piece off the event loop.
+
+    The chunk is only accepted at the session's current offset. Bytes that
+    arrive before a dropped connection stay written, so the client can resume
+    from the new offset; a chunk running past the declared size is rolled back.
+    """
+    lock = _session_locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        session = get_upload_session(upload_id, task_id, user_id, session_dir)
+        if offset != session["Offset"]:
+            raise offset_mismatch(session["Offset"])
+
+        data_path = os.path.join(session_path(upload_id, session_dir), DATA_FILE)
+        remaining = session["FileSize"] - offset
+        buffer = await run_in_threadpool(open, data_path, "ab")
+        try:
+            written = 0
+            async for piece in chunks:
+                if not piece:
+                    continue
+                written += len(piece)
+                if written > remaining:
+                    await run_in_threadpool(buffer.truncate, offset)
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Chunk runs past the declared file size"
+                    )
+                await run_in_threadpool(buffer.write, piece)
+        finally:
+            await run_in_threadpool(buffer.close)
+
+    return get_upload_session(upload_id, task_id, user_id, session_dir)
+
+
+def finalize_upload_session(
+    db: Session,
+    upload_id: str,
+    task_id: str,
+    user_id: str,
+    session_dir: str = UPLOAD_SESSION_DIR
+) -> Attachment:
+    """Turn a fully received upload into a normal Attachment"""
+    from API.services.task_service import get_task_by_id, create_attachment_record
+
+    session = get_upload_session(upload_id, task_id, user_id, session_dir)
+    if session["Offset"] != session["FileSize"]:
+        raise offset_mismatch(session["Offset"])
+
+    if not get_task_by_id(db, task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    path = session_path(upload_id, session_dir)
+    # The received data stays in the session until the attachment commits, so a
+    # failed finalize (quota, database error) can simply be retried
+    stored = place_blob(db, hash_file(os.path.join(path, DATA_FILE)), keep_source=True)
+    attachment = create_attachment_record(
+        db, task_id, user_id, session["FileName"], session["FileType"], stored
+    )
+
+    discard_upload_session(upload_id, session_dir)
+    return attachment
+
+
+def discard_upload_session(upload_id: str, session_dir: str = UPLOAD_SESSION_DIR) -> None:
+    """Remove an upload session and its chunk data"""
+    shutil.rmtree(session_path(upload_id, session_dir), ignore_errors=True)
+    _session_locks.pop(upload_id, None)
+
+
+def sweep_expired_upload_sessions(
+    session_dir: str = UPLOAD_SESSION_DIR,
+    now: Optional[datetime] = None
+) -> int:
+    """Remove sessions with no activity within the TTL, returning how many went"""
+    if not os.path.isdir(session_dir):
+        return 0
+
+    now = now or datetime.utcnow()
+    removed = 0
+    for upload_id in os.listdir(session_dir):
+        path = os.path.join(session_dir, upload_id)
+        try:
+            expires_at = session_state(path)["ExpiresAt"]
+        except (OSError, ValueError, KeyError):
+            # Half-created or corrupt session; fall back to the directory age
+            try:
+                expires_at = datetime.utcfromtimestamp(os.path.getmtime(path)) + timedelta(
+                    seconds=UPLOAD_SESSION_TTL_SECONDS
+                )
+            except OSError:
+                continue
+
+        if expires_at < now and not (upload_id in _session_locks and _session_locks[upload_id].locked()):
+            shutil.rmtree(path, ignore_errors=True)
+            _session_locks.pop(upload_id, None)
+            removed += 1
+
+    return removed
+
+
+async def run_upload_session_sweeper(interval: float = UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS):
+    """Periodically remove abandoned upload sessions until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await run_in_threadpool(sweep_expired_upload_sessions)
+            if removed:
+                logger.info("Removed %d expired upload sessions", removed)
+        except Exception:
+            logger.exception("Upload session sweep failed")
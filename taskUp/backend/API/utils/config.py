@@ -14,6 +14,53 @@ APP_DESCRIPTION = "TaskUp - Project and Task Management API"
 # File storage settings
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 1MB
+BLOB_DIR = os.path.join(UPLOAD_DIR, "blobs")  # Content-addressed attachment storage
+UPLOAD_SESSION_DIR = os.path.join(UPLOAD_DIR, "sessions")  # Resumable upload chunk state
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 60 * 60)))  # 1 day
+UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS = int(os.getenv("UPLOAD_SESSION_SWEEP_INTERVAL_SECONDS", "600"))
+# Storage garbage collection never touches files younger than this, so in-flight uploads are safe
+STORAGE_GC_GRACE_SECONDS = int(os.getenv("STORAGE_GC_GRACE_SECONDS", str(24 * 60 * 60)))  # 1 day
+STORAGE_GC_BATCH_SIZE = int(os.getenv("STORAGE_GC_BATCH_SIZE", "500"))
+# Attachment storage quotas in bytes; 0 means unlimited
+PROJECT_STORAGE_QUOTA_BYTES = int(os.getenv("PROJECT_STORAGE_QUOTA_BYTES", "0"))
+USER_STORAGE_QUOTA_BYTES = int(os.getenv("USER_STORAGE_QUOTA_BYTES", "0"))
+
+# Attachment download settings
+# Attachment content never changes for a given Id, so clients may cache it for a year
+ATTACHMENT_CACHE_CONTROL = os.getenv("ATTACHMENT_CACHE_CONTROL", "private, max-age=31536000, immutable")
+# When set (e.g. "/protected-uploads/"), downloads are handed to the front proxy with an
+# X-Accel-Redirect to this internal location mapped onto UPLOAD_DIR
+ATTACHMENT_ACCEL_REDIRECT_PREFIX = os.getenv("ATTACHMENT_ACCEL_REDIRECT_PREFIX")
+# Signed download links: minted by the authenticated API, verified by the /files route
+# (or a front proxy sharing the secret) without a database lookup. There is no default;
+# the app refuses to start without it, since a known secret lets anyone forge links
+DOWNLOAD_URL_SECRET = os.getenv("DOWNLOAD_URL_SECRET")
+DOWNLOAD_URL_TTL_SECONDS = int(os.getenv("DOWNLOAD_URL_TTL_SECONDS", "300"))  # 5 minutes
+
+# Task tree settings
+# Deepest subtask level the tree endpoint follows; also stops a ParentTaskId loop
+TASK_TREE_MAX_DEPTH = int(os.getenv("TASK_TREE_MAX_DEPTH", "100"))
 
 # Create upload directory if it doesn't exist
-os.makedirs(UPLOAD_DIR, exist_ok=True)
\ No newline at end of file
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Chat settings
+CHAT_FLUSH_BATCH_SIZE = int(os.getenv("CHAT_FLUSH_BATCH_SIZE", "100"))
+CHAT_FLUSH_INTERVAL_SECONDS = float(os.getenv("CHAT_FLUSH_INTERVAL_SECONDS", "0.5"))
+# A message that keeps failing to insert is retried on this many flushes before it is given up
+CHAT_FLUSH_MAX_ATTEMPTS = int(os.getenv("CHAT_FLUSH_MAX_ATTEMPTS", "20"))
+PROJECT_ACCESS_CACHE_TTL_SECONDS = float(os.getenv("PROJECT_ACCESS_CACHE_TTL_SECONDS", "30"))
+CHAT_HISTORY_SIZE = int(os.getenv("CHAT_HISTORY_SIZE", "50"))
+CHAT_HISTORY_MAX_ROOMS = int(os.getenv("CHAT_HISTORY_MAX_ROOMS", "500"))
+CHAT_HISTORY_MAX_BYTES = int(os.getenv("CHAT_HISTORY_MAX_BYTES", str(32 * 1024 * 1024)))  # 32MB
+CHAT_HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("CHAT_HEARTBEAT_INTERVAL_SECONDS", "20"))
+CHAT_IDLE_TIMEOUT_SECONDS = float(os.getenv("CHAT_IDLE_TIMEOUT_SECONDS", "60"))
+CHAT_SEND_TIMEOUT_SECONDS = float(os.getenv("CHAT_SEND_TIMEOUT_SECONDS", "5"))
+
+# Notification retention settings
+NOTIFICATION_READ_RETENTION_DAYS = int(os.getenv("NOTIFICATION_READ_RETENTION_DAYS", "30"))
+NOTIFICATION_UNREAD_RETENTION_DAYS = int(os.getenv("NOTIFICATION_UNREAD_RETENTION_DAYS", "180"))
+NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.getenv("NOTIFICATION_ARCHIVE_BATCH_SIZE", "500"))
+NOTIFICATION_MARK_READ_BATCH_SIZE = int(os.getenv("NOTIFICATION_MARK_READ_BATCH_SIZE", "500"))
+NOTIFICATION_COALESCE_WINDOW_SECONDS = int(os.getenv("NOTIFICATION_COALESCE_WINDOW_SECONDS", "900"))  # 15 minutes
@@ -0,0 +1,64 @@
+# taskUp/backend/API/utils/notification_templates.py
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# Notification message templates, keyed by the TemplateCode stored on each row.
+# Rows only keep the code and a small JSON params payload; the text is rendered
+# when the notification is read.
+NOTIFICATION_TEMPLATES = {
+    "task_assigned": "{actor_name} assigned you to task '{task_title}'",
+    "task_completed": "{actor_name} completed the task '{task_title}'",
+    "comment_added": "{actor_name} commented on task '{task_title}'",
+}
+
+RENDER_CACHE_SIZE = 4096
+
+
+def dump_params(params: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Serialize template params compactly and deterministically"""
+    if not params:
+        return None
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+def load_params(params: Optional[str]) -> Dict[str, Any]:
+    """Parse a stored params payload"""
+    if not params:
+        return {}
+    try:
+        return json.loads(params)
+    except ValueError:
+        return {}
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_template(template_code: str, params: Optional[str]) -> Optional[str]:
+    """Render a template code with its serialized params.
+
+    Recipients of the same event share the exact same (code, params) pair,
+    so rendered strings are cached on that key.
+    """
+    template = NOTIFICATION_TEMPLATES.get(template_code)
+    if template is None:
+        return None
+    try:
+        return template.format(**load_params(params))
+    except (KeyError, IndexError):
+        return None
+
+
+def render_notification(
+    template_code: Optional[str],
+    params: Optional[str],
+    fallback: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None
+) -> str:
+    """Render a notification message, falling back to the legacy stored text"""
+    if template_code:
+        if overrides:
+            params = dump_params({**load_params(params), **overrides})
+        message = render_template(template_code, params)
+        if message is not None:
+            return message
+    return fallback or ""
@@ -6,6 +6,9 @@ import API.Models as Models
 from API.Models.AssignmentType import AssignmentType
 from API.Models.Priority import Priority
 from API.Models.Status import Status
+from API.Models.Notification import Notification
+from API.Models.NotificationArchive import NotificationArchive
+from API.Models.StorageUsage import StorageUsage
 
 def create_tables():
     """Create all database tables"""
@@ -63,12 +66,91 @@ def setup_initial_data():
     finally:
         db.close()
 
+def archive_notifications(read_days=None, unread_days=None, batch_size=None, pause_seconds=0.0):
+    """Move notifications past their retention period into the archive table"""
+    from API.services.notification_service import archive_notifications as run_archive
+    from API.utils.config import (
+        NOTIFICATION_READ_RETENTION_DAYS, NOTIFICATION_UNREAD_RETENTION_DAYS, NOTIFICATION_ARCHIVE_BATCH_SIZE
+    )
+    
+    db = SessionLocal()
+    
+    try:
+        moved = run_archive(
+            db,
+            read_days=read_days if read_days is not None else NOTIFICATION_READ_RETENTION_DAYS,
+            unread_days=unread_days if unread_days is not None else NOTIFICATION_UNREAD_RETENTION_DAYS,
+            batch_size=batch_size or NOTIFICATION_ARCHIVE_BATCH_SIZE,
+            pause_seconds=pause_seconds
+        )
+        print(f"Archived {moved} notifications.")
+    except Exception as e:
+        print(f"Error archiving notifications: {e}")
+    finally:
+        db.close()
+
+def collect_storage_garbage(grace_seconds=None, batch_size=None, dry_run=False):
+    """Remove attachment files and blobs that nothing references any more"""
+    from API.services.storage_gc_service import collect_storage_garbage as run_gc
+    from API.utils.config import STORAGE_GC_GRACE_SECONDS, STORAGE_GC_BATCH_SIZE
+    
+    db = SessionLocal()
+    
+    try:
+        report = run_gc(
+            db,
+            grace_seconds=grace_seconds if grace_seconds is not None else STORAGE_GC_GRACE_SECONDS,
+            batch_size=batch_size or STORAGE_GC_BATCH_SIZE,
+            dry_run=dry_run
+        )
+        action = "Would reclaim" if dry_run else "Reclaimed"
+        print(
+            f"{action} {report['BytesReclaimed']} bytes: {report['FilesRemoved']} of "
+            f"{report['FilesScanned']} files, {report['BlobsRemoved']} blobs, "
+            f"{report['RefCountsFixed']} reference counts fixed."
+        )
+        if report["FilesSkipped"]:
+            print(
+                f"Left {report['FilesSkipped']} legacy files alone: no attachment path matched their batch. "
+                "Check that UPLOAD_DIR matches the paths stored on attachments."
+            )
+    except Exception as e:
+        db.rollback()
+        print(f"Error collecting storage garbage: {e}")
+    finally:
+        db.close()
+
+def repair_storage_usage():
+    """Recompute project and user storage counters from the attachments"""
+    from API.services.quota_service import repair_storage_usage as run_repair
+    
+    StorageUsage.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    
+    try:
+        fixed = run_repair(db)
+        print(f"Repaired {fixed} storage usage counters.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error repairing storage usage: {e}")
+    finally:
+        db.close()
+
 def main():
     """Main entry point for database management"""
     parser = argparse.ArgumentParser(description="TaskUp Database Management")
     parser.add_argument("--init", action="store_true", help="Initialize the database with tables")
     parser.add_argument("--reset", action="store_true", help="Reset the database (drop and recreate all tables)")
     parser.add_argument("--seed", action="store_true", help="Seed the database with initial data")
+    parser.add_argument("--archive-notifications", action="store_true", help="Move old notifications to the archive table")
+    parser.add_argument("--read-days", type=int, help="Retention in days for read notifications")
+    parser.add_argument("--unread-days", type=int, help="Retention in days for unread notifications")
+    parser.add_argument("--batch-size", type=int, help="Rows moved per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--collect-garbage", action="store_true", help="Remove unreferenced attachment files and blobs")
+    parser.add_argument("--grace-seconds", type=int, help="Only remove files older than this many seconds")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without removing it")
+    parser.add_argument("--repair-storage-usage", action="store_true", help="Recompute storage usage counters from attachments")
     
     args = parser.parse_args()
     
@@ -81,6 +163,12 @@ def main():
         setup_initial_data()
     elif args.seed:
         setup_initial_data()
+    elif args.archive_notifications:
+        archive_notifications(args.read_days, args.unread_days, args.batch_size, args.pause)
+    elif args.collect_garbage:
+        collect_storage_garbage(args.grace_seconds, args.batch_size, args.dry_run)
+    elif args.repair_storage_usage:
+        repair_storage_usage()
     else:
         parser.print_help()
 
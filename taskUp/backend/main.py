@@ -1,5 +1,7 @@
 # taskUp/backend/main.py
+import asyncio
 from fastapi import FastAPI, Depends, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
@@ -10,11 +12,13 @@ from Db.session import engine, Base
 import API.Models
 Base.metadata.create_all(bind=engine)
 
-from API.utils.config import APP_NAME, APP_DESCRIPTION, API_VERSION
+from API.utils.config import APP_NAME, APP_DESCRIPTION, API_VERSION, DOWNLOAD_URL_SECRET
 from API.utils.exceptions import BaseAppException
+from API.services.chat_service import chat_buffer, chat_presence
+from API.services.upload_service import run_upload_session_sweeper
 
 # Import API routes
-from API.routes import auth, users, projects, tasks, teams, comments, attachments, project_scopes, project_stakeholders, team_members, team_projects, chat
+from API.routes import auth, users, projects, tasks, teams, comments, attachments, uploads, files, project_scopes, project_stakeholders, team_members, team_projects, chat
 from API.routes import notifications  
 
 app = FastAPI(
@@ -35,19 +39,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+chat_heartbeat_task = None
+upload_sweeper_task = None
+
+@app.on_event("startup")
+async def check_required_settings():
+    if not DOWNLOAD_URL_SECRET:
+        raise RuntimeError("DOWNLOAD_URL_SECRET must be set; download links are signed with it")
+
+@app.on_event("startup")
+async def start_chat_workers():
+    global chat_heartbeat_task
+    chat_buffer.start()
+    chat_heartbeat_task = asyncio.create_task(chat_presence.run_heartbeat())
+
+@app.on_event("startup")
+async def start_upload_sweeper():
+    global upload_sweeper_task
+    upload_sweeper_task = asyncio.create_task(run_upload_session_sweeper())
+
+@app.on_event("shutdown")
+async def stop_upload_sweeper():
+    if upload_sweeper_task is not None:
+        upload_sweeper_task.cancel()
+
+@app.on_event("shutdown")
+async def stop_chat_workers():
+    if chat_heartbeat_task is not None:
+        chat_heartbeat_task.cancel()
+    # Write any buffered chat messages before the process exits; this can wait
+    # out several flush retries, so keep it off the event loop
+    await run_in_threadpool(chat_buffer.close)
+
 # Exception handlers
 @app.exception_handler(BaseAppException)
 async def app_exception_handler(request: Request, exc: BaseAppException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)
     )
 
 # Root endpoint
@@ -84,6 +122,8 @@ app.include_router(project_stakeholders.router, prefix=API_V1_PREFIX)
 app.include_router(tasks.router, prefix=API_V1_PREFIX)
 app.include_router(comments.router, prefix=API_V1_PREFIX)
 app.include_router(attachments.router, prefix=API_V1_PREFIX)
+app.include_router(uploads.router, prefix=API_V1_PREFIX)
+app.include_router(files.router, prefix=API_V1_PREFIX)
 app.include_router(teams.router, prefix=API_V1_PREFIX)
 app.include_router(team_members.router, prefix=API_V1_PREFIX)
 app.include_router(team_projects.router, prefix=API_V1_PREFIX)
@@ -0,0 +1,98 @@
+"""notification coalescing
+
+Revision ID: a1c3e5f70032
+Revises: f0a2c4e60031
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f70032'
+down_revision: Union[str, None] = 'f0a2c4e60031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COALESCE_COLUMNS = [
+    ("Count", lambda: sa.Column("Count", sa.Integer(), nullable=False, server_default="1")),
+    ("LastActorId", lambda: sa.Column("LastActorId", sa.String(length=36), nullable=True)),
+    ("UpdatedAt", lambda: sa.Column("UpdatedAt", sa.DateTime(), nullable=True)),
+    ("LastActivityAt", lambda: sa.Column("LastActivityAt", sa.DateTime(), nullable=True)),
+]
+
+# Listing and retention order by the latest coalesced event instead of the first
+REPLACED_INDEXES = [
+    ("ix_Notification_UserId_CreatedAt", ["UserId", "CreatedAt"]),
+    ("ix_Notification_CreatedAt", ["CreatedAt"]),
+]
+ACTIVITY_INDEXES = [
+    ("ix_Notification_UserId_LastActivityAt", ["UserId", "LastActivityAt"]),
+    ("ix_Notification_LastActivityAt", ["LastActivityAt"]),
+    ("ix_Notification_Coalesce", ["UserId", "Type", "RelatedEntityId", "CreatedAt"]),
+]
+
+
+def _add_missing_columns(inspector, table_name: str) -> None:
+    if not inspector.has_table(table_name):
+        return
+    existing = {column["name"] for column in inspector.get_columns(table_name)}
+    with op.batch_alter_table(table_name) as batch_op:
+        for name, make_column in COALESCE_COLUMNS:
+            if name not in existing:
+                batch_op.add_column(make_column())
+
+
+def _backfill_last_activity(table_name: str) -> None:
+    table = sa.table(
+        table_name,
+        sa.column("CreatedAt", sa.DateTime),
+        sa.column("UpdatedAt", sa.DateTime),
+        sa.column("LastActivityAt", sa.DateTime),
+    )
+    op.execute(
+        table.update()
+        .where(table.c.LastActivityAt.is_(None))
+        .values(LastActivityAt=sa.func.coalesce(table.c.UpdatedAt, table.c.CreatedAt))
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table_name in ("Notification", "NotificationArchive"):
+        if inspector.has_table(table_name):
+            _add_missing_columns(inspector, table_name)
+            _backfill_last_activity(table_name)
+
+    if inspector.has_table("Notification"):
+        indexes = {index["name"] for index in inspector.get_indexes("Notification")}
+        for name, _ in REPLACED_INDEXES:
+            if name in indexes:
+                op.drop_index(name, table_name="Notification")
+        for name, columns in ACTIVITY_INDEXES:
+            if name not in indexes:
+                op.create_index(name, "Notification", columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("Notification"):
+        indexes = {index["name"] for index in inspector.get_indexes("Notification")}
+        for name, _ in reversed(ACTIVITY_INDEXES):
+            if name in indexes:
+                op.drop_index(name, table_name="Notification")
+        for name, columns in REPLACED_INDEXES:
+            if name not in indexes:
+                op.create_index(name, "Notification", columns)
+    for table_name in ("NotificationArchive", "Notification"):
+        if not inspector.has_table(table_name):
+            continue
+        with op.batch_alter_table(table_name) as batch_op:
+            for name, _ in reversed(COALESCE_COLUMNS):
+                batch_op.drop_column(name)
@@ -0,0 +1,49 @@
+"""chat read cursors
+
+Revision ID: a7c9e1f30038
+Revises: f6b8d0e20037
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1f30038'
+down_revision: Union[str, None] = 'f6b8d0e20037'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("ChatReadCursor"):
+        op.create_table(
+            "ChatReadCursor",
+            sa.Column("Id", sa.String(length=36), primary_key=True),
+            sa.Column("ProjectId", sa.String(length=36), sa.ForeignKey("Project.Id", ondelete="CASCADE"), nullable=False),
+            sa.Column("UserId", sa.String(length=36), sa.ForeignKey("User.Id", ondelete="CASCADE"), nullable=False),
+            sa.Column("LastReadSentAt", sa.DateTime(), nullable=False),
+            sa.Column("UpdatedAt", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint("ProjectId", "UserId", name="uq_chat_read_cursor_project_user"),
+        )
+
+    if inspector.has_table("ChatMessage"):
+        existing = {index["name"] for index in inspector.get_indexes("ChatMessage")}
+        if "ix_ChatMessage_ProjectId_SentAt" not in existing:
+            op.create_index("ix_ChatMessage_ProjectId_SentAt", "ChatMessage", ["ProjectId", "SentAt"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("ChatMessage"):
+        existing = {index["name"] for index in inspector.get_indexes("ChatMessage")}
+        if "ix_ChatMessage_ProjectId_SentAt" in existing:
+            op.drop_index("ix_ChatMessage_ProjectId_SentAt", table_name="ChatMessage")
+    if inspector.has_table("ChatReadCursor"):
+        op.drop_table("ChatReadCursor")
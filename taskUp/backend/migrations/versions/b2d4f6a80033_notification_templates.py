@@ -0,0 +1,176 @@
+"""notification templates
+
+Revision ID: b2d4f6a80033
+Revises: a1c3e5f70032
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a80033'
+down_revision: Union[str, None] = 'a1c3e5f70032'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of the templates at this revision, so later template edits
+# cannot change what this migration parses or renders
+TEMPLATES = {
+    "task_assigned": "{actor_name} assigned you to task '{task_title}'",
+    "task_completed": "{actor_name} completed the task '{task_title}'",
+    "comment_added": "{actor_name} commented on task '{task_title}'",
+}
+
+BATCH_SIZE = 1000
+
+
+def _message_table(table_name: str):
+    return sa.table(
+        table_name,
+        sa.column("Id", sa.String),
+        sa.column("Type", sa.String),
+        sa.column("Message", sa.Text),
+        sa.column("TemplateCode", sa.String),
+        sa.column("Params", sa.Text),
+    )
+
+
+notification = _message_table("Notification")
+
+
+def _pattern(template: str):
+    parts = re.split(r"\{(\w+)\}", template)
+    regex = "".join(
+        f"(?P<{part}>.*)" if index % 2 else re.escape(part)
+        for index, part in enumerate(parts)
+    )
+    return re.compile(f"^{regex}$", re.DOTALL)
+
+
+PATTERNS = {code: _pattern(template) for code, template in TEMPLATES.items()}
+
+
+def _add_template_columns(inspector, table_name: str) -> None:
+    if not inspector.has_table(table_name):
+        return
+    existing = {column["name"] for column in inspector.get_columns(table_name)}
+    with op.batch_alter_table(table_name) as batch_op:
+        if "TemplateCode" not in existing:
+            batch_op.add_column(sa.Column("TemplateCode", sa.String(length=50), nullable=True))
+        if "Params" not in existing:
+            batch_op.add_column(sa.Column("Params", sa.Text(), nullable=True))
+        batch_op.alter_column("Message", existing_type=sa.Text(), nullable=True)
+
+
+def _convert_messages(bind) -> None:
+    """Parse legacy rendered messages into template code + params, in batches"""
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(notification.c.Id, notification.c.Type, notification.c.Message)
+            .where(
+                notification.c.Id > last_id,
+                notification.c.TemplateCode.is_(None),
+                notification.c.Type.in_(list(PATTERNS)),
+            )
+            .order_by(notification.c.Id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        updates = []
+        for row_id, code, message in rows:
+            match = PATTERNS[code].match(message or "")
+            if match:
+                updates.append({
+                    "row_id": row_id,
+                    "code": code,
+                    "params": json.dumps(match.groupdict(), sort_keys=True, separators=(",", ":")),
+                })
+        if updates:
+            bind.execute(
+                notification.update()
+                .where(notification.c.Id == sa.bindparam("row_id"))
+                .values(TemplateCode=sa.bindparam("code"), Params=sa.bindparam("params"), Message=None),
+                updates,
+            )
+
+        last_id = rows[-1][0]
+        if len(rows) < BATCH_SIZE:
+            break
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    _add_template_columns(inspector, "Notification")
+    _add_template_columns(inspector, "NotificationArchive")
+
+    if inspector.has_table("Notification"):
+        _convert_messages(bind)
+
+
+class _BlankParams(dict):
+    def __missing__(self, key):
+        return ""
+
+
+def _render_message(code, params) -> str:
+    """Render a template row back into legacy text; missing params render empty"""
+    template = TEMPLATES.get(code)
+    try:
+        values = json.loads(params) if params else {}
+    except ValueError:
+        values = {}
+    if template is None or not isinstance(values, dict):
+        return ""
+    return template.format_map(_BlankParams(values))
+
+
+def _render_messages(bind, table) -> None:
+    """Write rendered text into Message for every templated row, in batches"""
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.Id, table.c.TemplateCode, table.c.Params)
+            .where(table.c.Id > last_id, table.c.Message.is_(None))
+            .order_by(table.c.Id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        bind.execute(
+            table.update()
+            .where(table.c.Id == sa.bindparam("row_id"))
+            .values(Message=sa.bindparam("message")),
+            [{"row_id": row_id, "message": _render_message(code, params)} for row_id, code, params in rows],
+        )
+
+        last_id = rows[-1][0]
+        if len(rows) < BATCH_SIZE:
+            break
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table_name in ("NotificationArchive", "Notification"):
+        if not inspector.has_table(table_name):
+            continue
+        # Message goes back to NOT NULL, so every row needs text before the columns go
+        _render_messages(bind, _message_table(table_name))
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("Params")
+            batch_op.drop_column("TemplateCode")
+            batch_op.alter_column("Message", existing_type=sa.Text(), nullable=False)
@@ -0,0 +1,35 @@
+"""attachment content hash
+
+Revision ID: c3e5a7b90034
+Revises: b2d4f6a80033
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b90034'
+down_revision: Union[str, None] = 'b2d4f6a80033'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("Attachment"):
+        return
+    existing = {column["name"] for column in inspector.get_columns("Attachment")}
+    if "ContentHash" not in existing:
+        with op.batch_alter_table("Attachment") as batch_op:
+            batch_op.add_column(sa.Column("ContentHash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("Attachment") as batch_op:
+        batch_op.drop_column("ContentHash")
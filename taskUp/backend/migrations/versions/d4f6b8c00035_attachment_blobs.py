@@ -0,0 +1,43 @@
+"""attachment blobs
+
+Revision ID: d4f6b8c00035
+Revises: c3e5a7b90034
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c00035'
+down_revision: Union[str, None] = 'c3e5a7b90034'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("AttachmentBlob"):
+        op.create_table(
+            "AttachmentBlob",
+            sa.Column("Hash", sa.String(length=64), primary_key=True),
+            sa.Column("Size", sa.Integer(), nullable=False),
+            sa.Column("Path", sa.String(length=500), nullable=False),
+            sa.Column("RefCount", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("CreatedAt", sa.DateTime(), nullable=True),
+        )
+
+    if inspector.has_table("Attachment"):
+        indexes = {index["name"] for index in inspector.get_indexes("Attachment")}
+        if "ix_Attachment_ContentHash" not in indexes:
+            op.create_index("ix_Attachment_ContentHash", "Attachment", ["ContentHash"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_Attachment_ContentHash", table_name="Attachment")
+    op.drop_table("AttachmentBlob")
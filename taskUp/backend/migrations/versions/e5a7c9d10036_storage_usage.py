@@ -0,0 +1,75 @@
+"""storage usage counters
+
+Revision ID: e5a7c9d10036
+Revises: d4f6b8c00035
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d10036'
+down_revision: Union[str, None] = 'd4f6b8c00035'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+attachment = sa.table(
+    "Attachment",
+    sa.column("TaskId", sa.String),
+    sa.column("UploadedById", sa.String),
+    sa.column("FileSize", sa.Integer),
+)
+task = sa.table("Task", sa.column("Id", sa.String), sa.column("ProjectId", sa.String))
+storage_usage = sa.table(
+    "StorageUsage",
+    sa.column("ScopeType", sa.String),
+    sa.column("ScopeId", sa.String),
+    sa.column("Bytes", sa.BigInteger),
+    sa.column("Files", sa.Integer),
+    sa.column("UpdatedAt", sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("StorageUsage"):
+        return
+
+    op.create_table(
+        "StorageUsage",
+        sa.Column("ScopeType", sa.String(length=10), primary_key=True),
+        sa.Column("ScopeId", sa.String(length=36), primary_key=True),
+        sa.Column("Bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("Files", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("UpdatedAt", sa.DateTime(), nullable=True),
+    )
+
+    if inspector.has_table("Attachment") and inspector.has_table("Task"):
+        # Seed the counters from the attachments that already exist
+        bind = op.get_bind()
+        for scope_type, scope_id, source in (
+            ("project", task.c.ProjectId, attachment.join(task, task.c.Id == attachment.c.TaskId)),
+            ("user", attachment.c.UploadedById, attachment),
+        ):
+            bind.execute(storage_usage.insert().from_select(
+                ["ScopeType", "ScopeId", "Bytes", "Files", "UpdatedAt"],
+                sa.select(
+                    sa.literal(scope_type),
+                    scope_id,
+                    sa.func.coalesce(sa.func.sum(attachment.c.FileSize), 0),
+                    sa.func.count(),
+                    sa.func.current_timestamp(),
+                ).select_from(source).group_by(scope_id)
+            ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("StorageUsage"):
+        op.drop_table("StorageUsage")
@@ -0,0 +1,65 @@
+"""notification archive
+
+Revision ID: f0a2c4e60031
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0a2c4e60031'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFICATION_INDEXES = [
+    ("ix_Notification_UserId_CreatedAt", ["UserId", "CreatedAt"]),
+    ("ix_Notification_CreatedAt", ["CreatedAt"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("NotificationArchive"):
+        op.create_table(
+            "NotificationArchive",
+            sa.Column("Id", sa.String(length=36), primary_key=True),
+            sa.Column("UserId", sa.String(length=36), nullable=False),
+            sa.Column("Type", sa.String(length=50), nullable=False),
+            sa.Column("Message", sa.Text(), nullable=False),
+            sa.Column("RelatedEntityId", sa.String(length=36), nullable=True),
+            sa.Column("RelatedEntityType", sa.String(length=50), nullable=True),
+            sa.Column("IsRead", sa.Boolean(), nullable=True),
+            sa.Column("CreatedAt", sa.DateTime(), nullable=True),
+            sa.Column("ArchivedAt", sa.DateTime(), nullable=True),
+        )
+        op.create_index(
+            "ix_NotificationArchive_UserId_CreatedAt",
+            "NotificationArchive",
+            ["UserId", "CreatedAt"],
+        )
+
+    if inspector.has_table("Notification"):
+        existing = {index["name"] for index in inspector.get_indexes("Notification")}
+        for name, columns in NOTIFICATION_INDEXES:
+            if name not in existing:
+                op.create_index(name, "Notification", columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("Notification"):
+        existing = {index["name"] for index in inspector.get_indexes("Notification")}
+        for name, _ in reversed(NOTIFICATION_INDEXES):
+            if name in existing:
+                op.drop_index(name, table_name="Notification")
+    if inspector.has_table("NotificationArchive"):
+        op.drop_table("NotificationArchive")
@@ -0,0 +1,55 @@
+"""task dependencies and durations
+
+Revision ID: f6b8d0e20037
+Revises: e5a7c9d10036
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b8d0e20037'
+down_revision: Union[str, None] = 'e5a7c9d10036'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("Task"):
+        existing = {column["name"] for column in inspector.get_columns("Task")}
+        if "DurationDays" not in existing:
+            with op.batch_alter_table("Task") as batch_op:
+                batch_op.add_column(sa.Column("DurationDays", sa.Integer(), nullable=True, server_default="1"))
+
+    if not inspector.has_table("TaskDependency"):
+        op.create_table(
+            "TaskDependency",
+            sa.Column("Id", sa.String(length=36), primary_key=True),
+            sa.Column("PredecessorId", sa.String(length=36), sa.ForeignKey("Task.Id", ondelete="CASCADE"), nullable=False),
+            sa.Column("SuccessorId", sa.String(length=36), sa.ForeignKey("Task.Id", ondelete="CASCADE"), nullable=False),
+            sa.Column("LagDays", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("CreatedAt", sa.DateTime(), nullable=True),
+            sa.Column("CreatedBy", sa.String(length=36), sa.ForeignKey("User.Id"), nullable=True),
+            sa.UniqueConstraint("PredecessorId", "SuccessorId", name="uq_task_dependency"),
+            sa.CheckConstraint("PredecessorId <> SuccessorId", name="check_task_dependency_not_self"),
+        )
+        op.create_index("ix_TaskDependency_PredecessorId", "TaskDependency", ["PredecessorId"])
+        op.create_index("ix_TaskDependency_SuccessorId", "TaskDependency", ["SuccessorId"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("TaskDependency"):
+        op.drop_table("TaskDependency")
+    if inspector.has_table("Task"):
+        existing = {column["name"] for column in inspector.get_columns("Task")}
+        if "DurationDays" in existing:
+            with op.batch_alter_table("Task") as batch_op:
+                batch_op.drop_column("DurationDays")
@@ -5,6 +5,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 import os
 
+# Required setting the app refuses to start without
+os.environ.setdefault("DOWNLOAD_URL_SECRET", "test-download-secret")
+
 from Db.session import Base, get_db
 from main import app
 import uuid
@@ -0,0 +1,61 @@
+# taskUp/backend/tests/test_archive_service.py
+import io
+import os
+import threading
+import zipfile
+from datetime import datetime
+
+from API.services.archive_service import zip_stream
+
+def make_entry(tmp_path, name, data, folder=None, file_type=None):
+    path = os.path.join(tmp_path, f"{len(os.listdir(tmp_path))}-{name}")
+    with open(path, "wb") as handle:
+        handle.write(data)
+    return {
+        "FileName": name,
+        "FileType": file_type,
+        "FilePath": path,
+        "FileSize": len(data),
+        "UploadedAt": datetime(2024, 1, 2, 3, 4, 5),
+        "Folder": folder,
+    }
+
+def test_zip_stream_builds_valid_archive(tmp_path):
+    """Test the streamed archive opens with every file and picks compression per type"""
+    text = b"plain text " * 5000
+    photo = os.urandom(20000)
+    entries = [
+        make_entry(tmp_path, "notes.txt", text, folder="Design"),
+        make_entry(tmp_path, "photo.jpg", photo, folder="Design", file_type="image/jpeg"),
+        make_entry(tmp_path, "notes.txt", b"second", folder="Design"),
+    ]
+    
+    chunks = list(zip_stream(entries, chunk_size=4096))
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    
+    assert archive.namelist() == ["Design/notes.txt", "Design/photo.jpg", "Design/notes (2).txt"]
+    assert archive.read("Design/notes.txt") == text
+    assert archive.read("Design/photo.jpg") == photo
+    assert archive.getinfo("Design/notes.txt").compress_type == zipfile.ZIP_DEFLATED
+    assert archive.getinfo("Design/photo.jpg").compress_type == zipfile.ZIP_STORED
+    assert max(len(chunk) for chunk in chunks) < 64 * 1024
+
+def test_zip_stream_skips_missing_files(tmp_path):
+    """Test attachments whose file is gone are left out instead of failing the archive"""
+    entry = make_entry(tmp_path, "a.txt", b"a")
+    missing = dict(entry, FileName="gone.txt", FilePath=os.path.join(tmp_path, "nope"))
+    
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(zip_stream([missing, entry]))))
+    
+    assert archive.namelist() == ["a.txt"]
+
+def test_zip_stream_stops_when_cancelled(tmp_path):
+    """Test cancelling stops reading further files"""
+    entries = [make_entry(tmp_path, f"{i}.bin", os.urandom(10000)) for i in range(5)]
+    cancelled = threading.Event()
+    
+    stream = zip_stream(entries, cancelled, chunk_size=1024)
+    next(stream)
+    cancelled.set()
+    
+    assert sum(1 for _ in stream) <= 2
@@ -0,0 +1,243 @@
+# taskUp/backend/tests/test_chat_service.py
+import asyncio
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from API.Models.ChatMessage import ChatMessage
+from API.Models.ChatReadCursor import ChatReadCursor
+from API.services import chat_service
+from API.services.chat_service import (
+    ChatMessageBuffer, ChatHistoryCache, ChatPresence,
+    mark_room_read, count_unread_messages, count_unread_messages_by_project
+)
+
+def make_buffer(**kwargs):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    ChatMessage.__table__.create(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    return ChatMessageBuffer(session_factory=session_factory, **kwargs), engine
+
+def count_messages(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(ChatMessage.__table__)).scalar()
+
+def test_add_assigns_id_and_timestamp_before_flush():
+    """Test messages are usable for broadcast before they are written"""
+    buffer, engine = make_buffer(flush_interval=60)
+    row = buffer.add("project-1", "user-1", "hello")
+    
+    assert row["Id"]
+    assert row["SentAt"] is not None
+    assert buffer.pending_for_project("project-1") == [row]
+    
+    assert count_messages(engine) == 0
+    buffer.close()
+
+def test_close_flushes_pending_messages():
+    """Test shutdown writes everything still buffered"""
+    buffer, engine = make_buffer(flush_interval=60)
+    for i in range(5):
+        buffer.add("project-1", "user-1", f"message {i}")
+    
+    buffer.close()
+    
+    assert count_messages(engine) == 5
+    assert buffer.pending_count() == 0
+
+def test_batch_size_triggers_flush():
+    """Test reaching the batch size wakes the flush thread"""
+    buffer, engine = make_buffer(batch_size=3, flush_interval=60)
+    for i in range(3):
+        buffer.add("project-1", "user-1", f"message {i}")
+    
+    for _ in range(100):
+        if count_messages(engine) == 3:
+            break
+        time.sleep(0.01)
+    
+    assert count_messages(engine) == 3
+    buffer.close()
+
+def flaky_session_factory(engine, failures):
+    """Session factory whose first `failures` sessions fail on insert, like a locked database"""
+    session_factory = sessionmaker(bind=engine)
+    calls = {"count": 0}
+    
+    def factory():
+        db = session_factory()
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            def locked(*args, **kwargs):
+                raise OperationalError("INSERT", {}, Exception("database is locked"))
+            db.execute = locked
+        return db
+    
+    return factory
+
+def test_failed_flush_requeues_rows_and_keeps_them_visible():
+    """Test a transient write failure keeps messages queued, visible and in order"""
+    buffer, engine = make_buffer(flush_interval=60)
+    buffer.session_factory = flaky_session_factory(engine, failures=2)
+    first = buffer.add("project-1", "user-1", "first")
+    
+    assert buffer.flush() == 0
+    second = buffer.add("project-1", "user-1", "second")
+    assert buffer.pending_for_project("project-1") == [first, second]
+    assert buffer.flush() == 0
+    assert buffer.pending_count() == 2
+    
+    assert buffer.flush() == 2
+    assert count_messages(engine) == 2
+    assert buffer.pending_count() == 0
+    buffer.close()
+
+def test_rows_are_given_up_after_max_attempts():
+    """Test a row that can never be written does not stay queued forever"""
+    buffer, engine = make_buffer(flush_interval=0.01, max_attempts=3)
+    buffer.session_factory = flaky_session_factory(engine, failures=100)
+    buffer.add("project-1", "user-1", "doomed")
+    
+    assert buffer.flush() == 0
+    assert buffer.flush() == 0
+    assert buffer.pending_count() == 1
+    assert buffer.flush() == 0
+    assert buffer.pending_count() == 0
+    buffer.close()
+
+def make_message(i, content="hi"):
+    return {"id": str(i), "content": content, "senderId": "user-1", "senderName": "Test User", "timestamp": ""}
+
+def test_history_cache_keeps_latest_messages():
+    """Test a warm room serves its ring buffer and counts hits and misses"""
+    cache = ChatHistoryCache(history_size=3)
+    assert cache.get("project-1") is None
+    
+    cache.fill("project-1", [make_message(i) for i in range(2)])
+    cache.append("project-1", make_message(2))
+    cache.append("project-1", make_message(3))
+    
+    assert [m["id"] for m in cache.get("project-1")] == ["1", "2", "3"]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_history_cache_evicts_least_recently_used_room():
+    """Test rooms are evicted in LRU order when over the memory cap"""
+    message_size = ChatHistoryCache.MESSAGE_OVERHEAD_BYTES + len("hi") + len("Test User")
+    cache = ChatHistoryCache(history_size=10, max_bytes=2 * message_size)
+    cache.fill("project-1", [make_message(1)])
+    cache.fill("project-2", [make_message(2)])
+    cache.get("project-1")
+    cache.fill("project-3", [make_message(3)])
+    
+    assert cache.get("project-2") is None
+    assert cache.get("project-1") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 2 * message_size
+
+class FakeWebSocket:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+        self.closed = False
+    
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        self.sent.append(text)
+    
+    async def close(self, code=1000):
+        self.closed = True
+
+def test_presence_tracks_users_across_connections():
+    """Test a user stays online until their last connection leaves"""
+    presence = ChatPresence()
+    first, second = FakeWebSocket(), FakeWebSocket()
+    
+    assert presence.connect("project-1", "user-1", first) is True
+    assert presence.connect("project-1", "user-1", second) is False
+    assert presence.online_users("project-1") == ["user-1"]
+    
+    assert presence.disconnect(first) == ("project-1", "user-1", False)
+    assert presence.disconnect(second) == ("project-1", "user-1", True)
+    assert presence.disconnect(second) is None
+    assert presence.online_users("project-1") == []
+
+def test_sweep_reaps_idle_and_dead_connections():
+    """Test idle sockets are closed and failing sockets are dropped on ping"""
+    presence = ChatPresence(idle_timeout=0.05)
+    idle, dead, live = FakeWebSocket(), FakeWebSocket(fail=True), FakeWebSocket()
+    presence.connect("project-1", "user-1", idle)
+    time.sleep(0.1)
+    presence.connect("project-1", "user-2", dead)
+    presence.connect("project-1", "user-3", live)
+    
+    reaped = asyncio.run(presence.sweep())
+    
+    assert reaped == 1
+    assert idle.closed and dead.closed and not live.closed
+    assert presence.online_users("project-1") == ["user-3"]
+    assert presence.connection_count() == 1
+
+def make_read_session(monkeypatch):
+    buffer, engine = make_buffer(flush_interval=60)
+    ChatReadCursor.__table__.create(bind=engine)
+    monkeypatch.setattr(chat_service, "chat_buffer", buffer)
+    return sessionmaker(bind=engine)(), buffer
+
+def add_message(db, message_id, project_id, user_id, sent_at):
+    db.execute(ChatMessage.__table__.insert().values(
+        Id=message_id, ProjectId=project_id, UserId=user_id, Content="hi", SentAt=sent_at, IsRead=False
+    ))
+
+def test_unread_counts_follow_the_read_cursor(monkeypatch):
+    """Test unread counts skip own messages and everything up to the cursor"""
+    db, buffer = make_read_session(monkeypatch)
+    start = datetime(2024, 1, 1)
+    for i in range(4):
+        add_message(db, f"m{i}", "p1", "u2", start + timedelta(minutes=i))
+    add_message(db, "own", "p1", "u1", start + timedelta(minutes=5))
+    add_message(db, "other-room", "p2", "u2", start)
+    db.commit()
+    
+    assert count_unread_messages(db, "p1", "u1") == 4
+    
+    mark_room_read(db, "p1", "u1", start + timedelta(minutes=1))
+    assert count_unread_messages(db, "p1", "u1") == 2
+    
+    # The cursor never moves back
+    cursor = mark_room_read(db, "p1", "u1", start)
+    assert cursor.LastReadSentAt == start + timedelta(minutes=1)
+    assert count_unread_messages(db, "p1", "u1") == 2
+    
+    # Buffered messages from others count; the reader's own do not
+    buffer.add("p1", "u2", "not flushed yet")
+    buffer.add("p1", "u1", "mine")
+    assert count_unread_messages(db, "p1", "u1") == 3
+    buffer.close()
+
+def test_unread_counts_for_many_rooms(monkeypatch):
+    """Test the grouped count matches the per-room count, including empty rooms"""
+    db, buffer = make_read_session(monkeypatch)
+    start = datetime(2024, 1, 1)
+    for i in range(3):
+        add_message(db, f"a{i}", "p1", "u2", start + timedelta(minutes=i))
+        add_message(db, f"b{i}", "p2", "u2", start + timedelta(minutes=i))
+    db.commit()
+    mark_room_read(db, "p2", "u1", start + timedelta(minutes=2))
+    buffer.add("p2", "u2", "late")
+    
+    counts = count_unread_messages_by_project(db, "u1", ["p1", "p2", "p3"])
+    
+    assert counts == {"p1": 3, "p2": 1, "p3": 0}
+    assert counts == {project_id: count_unread_messages(db, project_id, "u1") for project_id in counts}
+    assert count_unread_messages_by_project(db, "u1", []) == {}
+    buffer.close()
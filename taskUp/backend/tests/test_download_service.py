@@ -0,0 +1,73 @@
+# taskUp/backend/tests/test_download_service.py
+import hashlib
+from types import SimpleNamespace
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from API.services.download_service import attachment_response
+
+DATA = bytes(range(256)) * 40
+
+def make_client(tmp_path):
+    path = tmp_path / "blob"
+    path.write_bytes(DATA)
+    attachment = SimpleNamespace(
+        FilePath=str(path),
+        FileName="clip.mp4",
+        FileType="video/mp4",
+        ContentHash=hashlib.sha256(DATA).hexdigest()
+    )
+    
+    app = FastAPI()
+    
+    @app.get("/download")
+    def download(request: Request):
+        return attachment_response(request, attachment)
+    
+    return TestClient(app), f'"{attachment.ContentHash}"'
+
+def test_full_download_has_strong_etag_and_cache_headers(tmp_path):
+    """Test a plain GET returns the whole file with caching headers"""
+    client, etag = make_client(tmp_path)
+    response = client.get("/download")
+    
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert response.headers["etag"] == etag
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "max-age" in response.headers["cache-control"]
+
+def test_if_none_match_returns_304(tmp_path):
+    """Test a matching ETag short-circuits with 304"""
+    client, etag = make_client(tmp_path)
+    response = client.get("/download", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_range_requests_return_partial_content(tmp_path):
+    """Test explicit, open-ended and suffix ranges"""
+    client, etag = make_client(tmp_path)
+    
+    response = client.get("/download", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == DATA[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(DATA)}"
+    
+    response = client.get("/download", headers={"Range": "bytes=10000-"})
+    assert response.content == DATA[10000:]
+    
+    response = client.get("/download", headers={"Range": "bytes=-5"})
+    assert response.content == DATA[-5:]
+
+def test_unsatisfiable_range_and_stale_if_range(tmp_path):
+    """Test out-of-bounds ranges get 416 and a stale If-Range gets the full file"""
+    client, etag = make_client(tmp_path)
+    
+    response = client.get("/download", headers={"Range": f"bytes={len(DATA)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(DATA)}"
+    
+    response = client.get("/download", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert response.status_code == 200
+    assert response.content == DATA
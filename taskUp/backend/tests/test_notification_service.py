@@ -0,0 +1,146 @@
+# taskUp/backend/tests/test_notification_service.py
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.Notification import Notification
+from API.Models.NotificationArchive import NotificationArchive
+from API.services.notification_service import (
+    archive_notifications, create_notification, get_user_notifications, mark_all_notifications_as_read
+)
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Notification.__table__.create(bind=engine)
+    NotificationArchive.__table__.create(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def add_notification(db, notification_id, user_id="u1", age_days=0, is_read=False, **values):
+    created_at = datetime.utcnow() - timedelta(days=age_days)
+    values.setdefault("LastActivityAt", created_at)
+    db.execute(Notification.__table__.insert().values(
+        Id=notification_id, UserId=user_id, Type="task_assigned", Message=notification_id,
+        IsRead=is_read, CreatedAt=created_at, Count=1, **values
+    ))
+
+def ids(db, table):
+    return {row_id for (row_id,) in db.execute(select(table.c.Id)).all()}
+
+def test_archive_moves_only_expired_notifications_in_batches():
+    """Test read and unread rows expire on their own schedules and are moved whole"""
+    db = make_session()
+    add_notification(db, "read-old", age_days=40, is_read=True, TemplateCode="task_assigned", Params="{}")
+    add_notification(db, "read-new", age_days=10, is_read=True)
+    add_notification(db, "unread-mid", age_days=40)
+    add_notification(db, "unread-old", age_days=200)
+    add_notification(db, "read-older", age_days=50, is_read=True)
+    db.commit()
+    
+    moved = archive_notifications(db, read_days=30, unread_days=180, batch_size=2)
+    
+    assert moved == 3
+    assert ids(db, Notification.__table__) == {"read-new", "unread-mid"}
+    assert ids(db, NotificationArchive.__table__) == {"read-old", "unread-old", "read-older"}
+    archived = db.execute(
+        select(NotificationArchive.__table__).where(NotificationArchive.__table__.c.Id == "read-old")
+    ).one()
+    assert (archived.TemplateCode, archived.Params, archived.IsRead) == ("task_assigned", "{}", True)
+    assert archived.ArchivedAt is not None
+
+def test_archive_stops_after_max_batches_oldest_first():
+    """Test a capped run archives the oldest rows and leaves the rest for the next run"""
+    db = make_session()
+    for age in range(40, 45):
+        add_notification(db, f"n{age}", age_days=age, is_read=True)
+    db.commit()
+    
+    assert archive_notifications(db, read_days=30, batch_size=2, max_batches=1) == 2
+    assert ids(db, NotificationArchive.__table__) == {"n44", "n43"}
+    assert archive_notifications(db, read_days=30, batch_size=2) == 3
+    assert ids(db, Notification.__table__) == set()
+
+def test_mark_all_read_commits_in_batches():
+    """Test every unread row of the user is marked read, leaving other users alone"""
+    db = make_session()
+    for i in range(5):
+        add_notification(db, f"mine{i}")
+    add_notification(db, "theirs", user_id="u2")
+    add_notification(db, "already", is_read=True)
+    db.commit()
+    
+    assert mark_all_notifications_as_read(db, "u1", batch_size=2) == 5
+    
+    unread = db.execute(
+        select(Notification.__table__.c.Id).where(Notification.__table__.c.IsRead == False)
+    ).all()
+    assert unread == [("theirs",)]
+
+def test_repeats_within_the_window_are_coalesced():
+    """Test repeat events for the same user and entity update one unread row"""
+    db = make_session()
+    
+    first = create_notification(db, "u1", "comment_added", "Ann commented", entity_id="t1", actor_id="ann")
+    second = create_notification(db, "u1", "comment_added", "Bo commented", entity_id="t1", actor_id="bo")
+    
+    assert second.Id == first.Id
+    assert second.Count == 2
+    assert second.Message == "Bo commented"
+    assert second.LastActorId == "bo"
+    assert second.UpdatedAt is not None
+    
+    # Other entities, other users and explicit opt-outs get their own rows
+    assert create_notification(db, "u1", "comment_added", "x", entity_id="t2").Id != first.Id
+    assert create_notification(db, "u2", "comment_added", "x", entity_id="t1").Id != first.Id
+    assert create_notification(db, "u1", "comment_added", "x", entity_id="t1", coalesce=False).Id != first.Id
+    assert create_notification(db, "u1", "comment_added", "x").Count == 1
+
+def test_coalesced_repeats_count_as_recent_activity():
+    """Test a repeat moves the row to the top of the list and restarts its retention"""
+    db = make_session()
+    first = create_notification(db, "u1", "comment_added", "Ann commented", entity_id="t1")
+    create_notification(db, "u1", "comment_added", "Bo commented", entity_id="t2")
+    repeated = create_notification(db, "u1", "comment_added", "Cy commented", entity_id="t1")
+    
+    assert repeated.Id == first.Id
+    assert repeated.LastActivityAt > repeated.CreatedAt
+    assert get_user_notifications(db, "u1")[0].Id == first.Id
+    
+    # Retention goes by the latest event, not the first one
+    add_notification(db, "busy", age_days=40, LastActivityAt=datetime.utcnow())
+    db.commit()
+    archive_notifications(db, unread_days=30)
+    assert "busy" in ids(db, Notification.__table__)
+
+def test_read_or_old_notifications_are_not_coalesced():
+    """Test a repeat after the row was read or the window passed starts a new row"""
+    db = make_session()
+    for notification_id, is_read, age in [("read", True, timedelta(0)), ("stale", False, timedelta(hours=1))]:
+        db.execute(Notification.__table__.insert().values(
+            Id=notification_id, UserId="u1", Type="comment_added", Message=notification_id, IsRead=is_read,
+            Count=1, RelatedEntityId="t1", CreatedAt=datetime.utcnow() - age
+        ))
+    db.commit()
+    
+    created = create_notification(db, "u1", "comment_added", "new", entity_id="t1")
+    
+    assert created.Id not in ("read", "stale")
+    assert created.Count == 1
+
+def test_templated_notifications_render_with_the_current_task_title():
+    """Test template rows store params only and render the task's current title"""
+    db = make_session()
+    db.execute(text("CREATE TABLE Task (Id VARCHAR(36) PRIMARY KEY, Title VARCHAR(100))"))
+    db.execute(text("INSERT INTO Task (Id, Title) VALUES ('t1', 'Renamed plan')"))
+    db.commit()
+    
+    created = create_notification(
+        db, "u1", "task_assigned", params={"actor_name": "Ann", "task_title": "Plan"},
+        entity_id="t1", entity_type="Task"
+    )
+    
+    assert created.Message is None
+    assert created.TemplateCode == "task_assigned"
+    assert json.loads(created.Params) == {"actor_name": "Ann", "task_title": "Plan"}
+    [listed] = get_user_notifications(db, "u1")
+    assert listed.RenderedMessage == "Ann assigned you to task 'Renamed plan'"
@@ -0,0 +1,113 @@
+# taskUp/backend/tests/test_notification_templates.py
+import importlib.util
+import json
+import os
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, text
+
+from API.utils.notification_templates import dump_params, load_params, render_notification, render_template
+
+MIGRATION_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "migrations", "versions", "b2d4f6a80033_notification_templates.py"
+)
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("notification_templates_migration", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_params_are_compact_and_deterministic():
+    """Test the same params always serialize to the same cache key"""
+    assert dump_params({"task_title": "Plan", "actor_name": "Ann"}) == '{"actor_name":"Ann","task_title":"Plan"}'
+    assert dump_params({}) is None
+    assert load_params(None) == {}
+    assert load_params("not json") == {}
+
+def test_render_template_and_fallbacks():
+    """Test rendering, overrides and the legacy text fallback"""
+    params = dump_params({"actor_name": "Ann", "task_title": "Plan"})
+    
+    assert render_template("task_assigned", params) == "Ann assigned you to task 'Plan'"
+    assert render_template("unknown", params) is None
+    assert render_template("task_assigned", dump_params({"actor_name": "Ann"})) is None
+    assert render_notification("task_completed", params, overrides={"task_title": "Renamed"}) == \
+        "Ann completed the task 'Renamed'"
+    assert render_notification(None, None, "Legacy text") == "Legacy text"
+    assert render_notification("task_assigned", "{}", "Legacy text") == "Legacy text"
+    assert render_notification(None, None) == ""
+
+def test_migration_patterns_parse_rendered_messages():
+    """Test every template parses back into the params it was rendered from"""
+    migration = load_migration()
+    params = {"actor_name": "Ann Lee", "task_title": "Fix 'quotes' {and} braces"}
+    
+    for code, template in migration.TEMPLATES.items():
+        match = migration.PATTERNS[code].match(template.format(**params))
+        assert match.groupdict() == params
+    assert migration.PATTERNS["task_assigned"].match("Someone did something else") is None
+
+def make_legacy_database():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        for table_name in ("Notification", "NotificationArchive"):
+            conn.execute(text(
+                f"CREATE TABLE {table_name} (Id VARCHAR(36) PRIMARY KEY, Type VARCHAR(50) NOT NULL, "
+                "Message TEXT NOT NULL)"
+            ))
+        conn.execute(text(
+            "INSERT INTO Notification (Id, Type, Message) VALUES "
+            "('n1', 'task_assigned', 'Ann assigned you to task ''Plan'''), "
+            "('n2', 'project_updated', 'Project renamed'), "
+            "('n3', 'comment_added', 'Free text that matches no template')"
+        ))
+        conn.execute(text(
+            "INSERT INTO NotificationArchive (Id, Type, Message) VALUES ('a1', 'task_completed', 'Bo')"
+        ))
+    return engine
+
+def run_migration(engine, step):
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            step()
+
+def test_migration_round_trip_restores_messages():
+    """Test upgrade parses legacy text and downgrade renders it back before dropping the columns"""
+    migration = load_migration()
+    engine = make_legacy_database()
+    
+    run_migration(engine, migration.upgrade)
+    
+    with engine.connect() as conn:
+        rows = {row.Id: row for row in conn.execute(text("SELECT * FROM Notification"))}
+    assert rows["n1"].Message is None
+    assert rows["n1"].TemplateCode == "task_assigned"
+    assert json.loads(rows["n1"].Params) == {"actor_name": "Ann", "task_title": "Plan"}
+    assert rows["n2"].TemplateCode is None
+    assert rows["n3"].TemplateCode is None
+    
+    # Rows written after the upgrade only have a template, in both tables
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO NotificationArchive (Id, Type, Message, TemplateCode, Params) VALUES "
+            "('a2', 'comment_added', NULL, 'comment_added', '{\"actor_name\":\"Cy\",\"task_title\":\"Ship\"}'), "
+            "('a3', 'task_assigned', NULL, 'task_assigned', '{\"actor_name\":\"Di\"}')"
+        ))
+    
+    run_migration(engine, migration.downgrade)
+    
+    with engine.connect() as conn:
+        messages = dict(conn.execute(text("SELECT Id, Message FROM Notification")).all())
+        archived = dict(conn.execute(text("SELECT Id, Message FROM NotificationArchive")).all())
+    assert messages == {
+        "n1": "Ann assigned you to task 'Plan'",
+        "n2": "Project renamed",
+        "n3": "Free text that matches no template",
+    }
+    assert archived == {"a1": "Bo", "a2": "Cy commented on task 'Ship'", "a3": "Di assigned you to task ''"}
+    for table_name in ("Notification", "NotificationArchive"):
+        columns = {column["name"]: column for column in inspect(engine).get_columns(table_name)}
+        assert "TemplateCode" not in columns and "Params" not in columns
+        assert columns["Message"]["nullable"] is False
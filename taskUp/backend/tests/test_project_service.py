@@ -0,0 +1,106 @@
+# taskUp/backend/tests/test_project_service.py
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.Project import Project
+from API.Models.ProjectStakeholder import ProjectStakeholder
+from API.Models.Team import Team
+from API.Models.TeamMember import TeamMember
+from API.Models.TeamProject import TeamProject
+from API.services import project_service
+from API.services.project_service import ProjectAccessCache, has_project_access, project_access_cache
+from API.services.team_service import remove_member_from_team
+
+def make_session():
+    engine = create_engine("sqlite://")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    for model in (Project, ProjectStakeholder, Team, TeamMember, TeamProject):
+        model.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.execute(Project.__table__.insert(), [
+        {"Id": "p1", "Name": "Live", "CreatedBy": "owner", "IsDeleted": False},
+        {"Id": "p2", "Name": "Gone", "CreatedBy": "owner", "IsDeleted": True},
+    ])
+    db.execute(ProjectStakeholder.__table__.insert().values(Id="s1", ProjectId="p1", UserId="stake", Percentage=0))
+    db.execute(Team.__table__.insert(), [
+        {"Id": "t1", "Name": "Crew", "CreatedBy": "owner", "IsDeleted": False},
+        {"Id": "t2", "Name": "Old crew", "CreatedBy": "owner", "IsDeleted": True},
+    ])
+    db.execute(TeamProject.__table__.insert(), [
+        {"Id": "tp1", "TeamId": "t1", "ProjectId": "p1"},
+        {"Id": "tp2", "TeamId": "t2", "ProjectId": "p1"},
+    ])
+    db.execute(TeamMember.__table__.insert(), [
+        {"Id": "m1", "TeamId": "t1", "UserId": "member", "IsActive": True, "IsLeader": False},
+        {"Id": "m2", "TeamId": "t1", "UserId": "left", "IsActive": False, "IsLeader": False},
+        {"Id": "m3", "TeamId": "t2", "UserId": "disbanded", "IsActive": True, "IsLeader": False},
+        {"Id": "m4", "TeamId": "t1", "UserId": "lead", "IsActive": True, "IsLeader": True},
+    ])
+    db.commit()
+    project_access_cache.clear()
+    return db, statements
+
+def test_access_cache_expires_and_invalidates(monkeypatch):
+    """Test cached decisions are served until they expire or the project changes"""
+    clock = [100.0]
+    monkeypatch.setattr(project_service.time, "monotonic", lambda: clock[0])
+    cache = ProjectAccessCache(ttl=10)
+    
+    cache.set("p1", "u1", True)
+    cache.set("p1", "u2", False)
+    assert cache.get("p1", "u1") is True
+    assert cache.get("p1", "u2") is False
+    assert cache.get("p1", "u3") is None
+    
+    clock[0] = 110.0
+    assert cache.get("p1", "u1") is None
+    
+    cache.set("p1", "u1", True)
+    cache.invalidate("p1")
+    assert cache.get("p1", "u1") is None
+
+def test_access_cache_stays_within_its_project_limit(monkeypatch):
+    """Test a full cache drops expired entries first, then those closest to expiry"""
+    clock = [0.0]
+    monkeypatch.setattr(project_service.time, "monotonic", lambda: clock[0])
+    cache = ProjectAccessCache(ttl=10, max_projects=2)
+    
+    cache.set("p1", "u1", True)
+    clock[0] = 1.0
+    cache.set("p2", "u1", True)
+    clock[0] = 2.0
+    cache.set("p3", "u1", True)
+    
+    assert cache.get("p1", "u1") is None
+    assert cache.get("p2", "u1") is True
+    assert cache.get("p3", "u1") is True
+
+def test_has_project_access_covers_every_route_in_one_query():
+    """Test creator, stakeholder and active team members get in with a single statement each"""
+    db, statements = make_session()
+    
+    for user_id, expected in [
+        ("owner", True), ("stake", True), ("member", True),
+        ("left", False), ("disbanded", False), ("stranger", False)
+    ]:
+        statements.clear()
+        assert has_project_access(db, "p1", user_id) is expected
+        assert len(statements) == 1
+    
+    assert has_project_access(db, "p2", "owner") is False
+    
+    # The second check is served from the cache
+    statements.clear()
+    assert has_project_access(db, "p1", "member") is True
+    assert statements == []
+
+def test_team_changes_invalidate_cached_access():
+    """Test removing a member drops the cached decision of every project of the team"""
+    db, _ = make_session()
+    assert has_project_access(db, "p1", "member") is True
+    
+    assert remove_member_from_team(db, "t1", "member")
+    
+    assert project_access_cache.get("p1", "member") is None
+    assert has_project_access(db, "p1", "member") is False
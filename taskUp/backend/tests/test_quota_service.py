@@ -0,0 +1,78 @@
+# taskUp/backend/tests/test_quota_service.py
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.Attachment import Attachment
+from API.Models.StorageUsage import StorageUsage
+from API.services import quota_service
+from API.services.quota_service import (
+    add_storage_usage, release_storage_usage, check_storage_quota, get_storage_usage,
+    repair_storage_usage, PROJECT_SCOPE, USER_SCOPE
+)
+
+def make_session():
+    engine = create_engine("sqlite://")
+    StorageUsage.__table__.create(bind=engine)
+    Attachment.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.execute(text("CREATE TABLE Task (Id VARCHAR(36) PRIMARY KEY, ProjectId VARCHAR(36))"))
+    db.execute(text("INSERT INTO Task (Id, ProjectId) VALUES ('t1', 'p1'), ('t2', 'p2')"))
+    db.commit()
+    return db
+
+def add_attachment(db, attachment_id, task_id, user_id, size):
+    db.execute(Attachment.__table__.insert().values(
+        Id=attachment_id, TaskId=task_id, UploadedById=user_id, FileName="a.txt", FilePath="/x", FileSize=size
+    ))
+
+def test_usage_counters_track_uploads_and_deletes(monkeypatch):
+    """Test project and user totals move with each upload and delete"""
+    monkeypatch.setattr(quota_service, "PROJECT_STORAGE_QUOTA_BYTES", 100)
+    db = make_session()
+    
+    add_storage_usage(db, "p1", "u1", 30)
+    add_storage_usage(db, "p1", "u2", 20)
+    release_storage_usage(db, "p1", "u1", 30)
+    db.commit()
+    
+    assert get_storage_usage(db, PROJECT_SCOPE, "p1") == {
+        "ScopeType": PROJECT_SCOPE, "ScopeId": "p1", "Bytes": 20, "Files": 1, "QuotaBytes": 100, "RemainingBytes": 80
+    }
+    assert get_storage_usage(db, USER_SCOPE, "u2")["Bytes"] == 20
+    assert get_storage_usage(db, USER_SCOPE, "u1")["QuotaBytes"] is None
+
+def test_upload_over_quota_is_refused_without_charging(monkeypatch):
+    """Test the conditional increment rejects an upload that would overshoot the quota"""
+    monkeypatch.setattr(quota_service, "USER_STORAGE_QUOTA_BYTES", 50)
+    db = make_session()
+    add_storage_usage(db, "p1", "u1", 40)
+    db.commit()
+    
+    with pytest.raises(HTTPException) as error:
+        check_storage_quota(db, "p1", "u1", 11)
+    assert error.value.status_code == 413
+    
+    with pytest.raises(HTTPException):
+        add_storage_usage(db, "p1", "u1", 11)
+    db.rollback()
+    
+    assert get_storage_usage(db, PROJECT_SCOPE, "p1")["Bytes"] == 40
+    assert get_storage_usage(db, USER_SCOPE, "u1")["Bytes"] == 40
+
+def test_repair_recomputes_drifted_and_missing_counters():
+    """Test the repair command rebuilds counters from the attachments"""
+    db = make_session()
+    add_attachment(db, "a1", "t1", "u1", 10)
+    add_attachment(db, "a2", "t2", "u1", 5)
+    add_storage_usage(db, "p1", None, 999)
+    add_storage_usage(db, "p9", None, 1)
+    db.commit()
+    
+    assert repair_storage_usage(db) == 4
+    assert get_storage_usage(db, PROJECT_SCOPE, "p1")["Bytes"] == 10
+    assert get_storage_usage(db, PROJECT_SCOPE, "p2")["Bytes"] == 5
+    assert get_storage_usage(db, PROJECT_SCOPE, "p9")["Files"] == 0
+    assert get_storage_usage(db, USER_SCOPE, "u1")["Files"] == 2
+    assert repair_storage_usage(db) == 0
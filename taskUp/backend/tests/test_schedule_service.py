@@ -0,0 +1,139 @@
+# taskUp/backend/tests/test_schedule_service.py
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.TaskDependency import TaskDependency
+from API.services.schedule_service import ProjectSchedule, DependencyCycleError, dependency_creates_cycle
+
+def make_schedule():
+    # A(3) -> B(2) -> D(1), A -> C(4) -> D, E(2) on its own
+    durations = {"A": 3, "B": 2, "C": 4, "D": 1, "E": 2}
+    dependencies = [("A", "B", 0), ("A", "C", 0), ("B", "D", 0), ("C", "D", 0)]
+    return ProjectSchedule(durations, {}, dependencies)
+
+def snapshot(schedule):
+    return {
+        task_id: (
+            schedule.early_start[task_id], schedule.early_finish[task_id],
+            schedule.late_start[task_id], schedule.late_finish[task_id]
+        )
+        for task_id in schedule.durations
+    }
+
+def test_critical_path_times_and_chain():
+    """Test forward and backward passes give the textbook early/late times"""
+    schedule = make_schedule()
+    
+    assert schedule.project_finish == 8
+    assert (schedule.early_start["D"], schedule.early_finish["D"]) == (7, 8)
+    assert schedule.slack("B") == 2
+    assert schedule.slack("E") == 6
+    assert [task_id for task_id in "ABCDE" if schedule.slack(task_id) == 0] == ["A", "C", "D"]
+    assert schedule.critical_chain() == ["A", "C", "D"]
+
+def test_lag_delays_successor():
+    """Test a lag pushes the successor's start past its predecessor's finish"""
+    schedule = ProjectSchedule({"A": 2, "B": 1}, {}, [("A", "B", 3)])
+    
+    assert schedule.early_start["B"] == 5
+    assert schedule.project_finish == 6
+    assert schedule.critical_chain() == ["A", "B"]
+
+def test_duration_change_only_revisits_affected_tasks():
+    """Test a change off the critical path leaves unrelated tasks alone"""
+    schedule = make_schedule()
+    
+    touched = schedule.set_duration("B", 3)
+    
+    assert "E" not in touched
+    assert schedule.slack("B") == 1
+    assert schedule.project_finish == 8
+
+def test_incremental_updates_match_full_rebuild():
+    """Test random edits applied incrementally agree with rebuilding from scratch"""
+    rng = random.Random(7)
+    task_ids = [f"T{index:03d}" for index in range(60)]
+    durations = {task_id: rng.randint(1, 5) for task_id in task_ids}
+    dependencies = []
+    for index, task_id in enumerate(task_ids[1:], start=1):
+        for predecessor in rng.sample(task_ids[:index], min(index, 2)):
+            dependencies.append((predecessor, task_id, rng.randint(0, 2)))
+    deadlines = {}
+    schedule = ProjectSchedule(durations, deadlines, dependencies)
+    
+    for _ in range(200):
+        task_id = rng.choice(task_ids)
+        action = rng.random()
+        if action < 0.5:
+            durations[task_id] = rng.randint(1, 8)
+            schedule.set_duration(task_id, durations[task_id])
+        elif action < 0.7:
+            deadlines[task_id] = rng.choice([None, rng.randint(5, 60)])
+            schedule.set_deadline(task_id, deadlines[task_id])
+        elif action < 0.85 and dependencies:
+            predecessor, successor, _ = dependencies.pop(rng.randrange(len(dependencies)))
+            schedule.remove_dependency(predecessor, successor)
+        else:
+            predecessor = rng.choice(task_ids)
+            linked = {(pred, succ) for pred, succ, _ in dependencies}
+            if (predecessor, task_id) in linked or schedule.creates_cycle(predecessor, task_id):
+                continue
+            lag = rng.randint(0, 2)
+            dependencies.append((predecessor, task_id, lag))
+            schedule.add_dependency(predecessor, task_id, lag)
+    
+        rebuilt = ProjectSchedule(durations, deadlines, dependencies)
+        assert schedule.project_finish == rebuilt.project_finish
+        assert snapshot(schedule) == snapshot(rebuilt)
+
+def test_missed_deadline_gives_negative_slack():
+    """Test a deadline earlier than the early finish makes the task critical"""
+    schedule = make_schedule()
+    
+    schedule.set_deadline("B", 4)
+    
+    assert schedule.late_finish["B"] == 4
+    assert schedule.slack("B") == -1
+    assert schedule.slack("A") == -1
+
+def test_cycles_are_rejected():
+    """Test a dependency closing a loop is refused and leaves the graph unchanged"""
+    schedule = make_schedule()
+    
+    assert schedule.creates_cycle("D", "A")
+    assert schedule.creates_cycle("B", "B")
+    assert not schedule.creates_cycle("E", "A")
+    with pytest.raises(DependencyCycleError):
+        schedule.add_dependency("D", "A")
+    assert "A" not in schedule.successors["D"]
+    with pytest.raises(DependencyCycleError):
+        ProjectSchedule({"A": 1, "B": 1}, {}, [("A", "B", 0), ("B", "A", 0)])
+
+def test_new_dependency_reorders_tasks():
+    """Test linking a later task ahead of an earlier one keeps the times consistent"""
+    schedule = make_schedule()
+    
+    schedule.add_dependency("E", "A")
+    
+    assert schedule.early_start["A"] == 2
+    assert schedule.project_finish == 10
+    assert schedule.critical_chain() == ["E", "A", "C", "D"]
+
+def test_committed_links_are_checked_for_cycles():
+    """Test the database check catches a loop closed by a concurrent insert"""
+    engine = create_engine("sqlite://")
+    TaskDependency.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for predecessor, successor in [("A", "B"), ("B", "C"), ("C", "D"), ("D", "B")]:
+        db.execute(TaskDependency.__table__.insert().values(
+            Id=predecessor + successor, PredecessorId=predecessor, SuccessorId=successor, LagDays=0
+        ))
+    db.commit()
+    
+    assert dependency_creates_cycle(db, "C", "A")
+    assert dependency_creates_cycle(db, "D", "B")
+    assert not dependency_creates_cycle(db, "A", "D")
+    assert not dependency_creates_cycle(db, "E", "A")
@@ -0,0 +1,60 @@
+# taskUp/backend/tests/test_signed_url_service.py
+import os
+import pytest
+from types import SimpleNamespace
+from fastapi import HTTPException
+
+from API.services.signed_url_service import create_download_link, verify_download_link
+
+SECRET = "test-secret"
+
+def make_attachment(tmp_path):
+    path = tmp_path / "blobs" / "ab" / "cd" / "abcd"
+    os.makedirs(path.parent)
+    path.write_bytes(b"data")
+    return SimpleNamespace(FilePath=str(path), FileName="report.pdf", FileType="application/pdf", ContentHash="abcd")
+
+def verify(tmp_path, link, **overrides):
+    params = {**link["params"], **overrides}
+    return verify_download_link(
+        overrides.get("path", link["path"]), params["expires"], params["name"], params["type"], params["hash"],
+        params["sig"], upload_dir=str(tmp_path), secret=SECRET, now=overrides.get("now")
+    )
+
+def test_signed_link_resolves_to_file_without_database(tmp_path):
+    """Test a freshly minted link verifies and points at the attachment file"""
+    attachment = make_attachment(tmp_path)
+    link = create_download_link(attachment, ttl_seconds=60, upload_dir=str(tmp_path), secret=SECRET)
+    
+    assert link["path"] == "blobs/ab/cd/abcd"
+    assert verify(tmp_path, link) == os.path.realpath(attachment.FilePath)
+
+def test_tampered_link_is_rejected(tmp_path):
+    """Test changing any signed parameter invalidates the link"""
+    attachment = make_attachment(tmp_path)
+    link = create_download_link(attachment, ttl_seconds=60, upload_dir=str(tmp_path), secret=SECRET)
+    
+    for overrides in ({"name": "other.pdf"}, {"expires": link["params"]["expires"] + 3600}, {"path": "blobs/other"}):
+        with pytest.raises(HTTPException) as error:
+            verify(tmp_path, link, **overrides)
+        assert error.value.status_code == 403
+
+def test_expired_link_is_rejected(tmp_path):
+    """Test a link stops working once its expiry has passed"""
+    attachment = make_attachment(tmp_path)
+    link = create_download_link(attachment, ttl_seconds=60, upload_dir=str(tmp_path), secret=SECRET, now=1000)
+    
+    assert verify(tmp_path, link, now=1059)
+    with pytest.raises(HTTPException) as error:
+        verify(tmp_path, link, now=1061)
+    assert error.value.detail == "Download link expired"
+
+def test_files_outside_upload_dir_cannot_be_linked(tmp_path):
+    """Test neither minting nor verifying lets a path escape the upload directory"""
+    outside = SimpleNamespace(FilePath="/etc/passwd", FileName="passwd", FileType=None, ContentHash=None)
+    with pytest.raises(HTTPException):
+        create_download_link(outside, upload_dir=str(tmp_path), secret=SECRET)
+    
+    with pytest.raises(HTTPException) as error:
+        verify_download_link("../../etc/passwd", 10 ** 12, "passwd", None, None, "sig", upload_dir=str(tmp_path), secret=SECRET)
+    assert error.value.status_code == 403
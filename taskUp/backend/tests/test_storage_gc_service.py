@@ -0,0 +1,211 @@
+# taskUp/backend/tests/test_storage_gc_service.py
+import io
+import os
+import pytest
+import time
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.Attachment import Attachment
+from API.Models.AttachmentBlob import AttachmentBlob
+from API.services.storage_service import RELEASED_SUFFIX, store_blob
+from API.services.storage_gc_service import (
+    new_report, reconcile_blob_refcounts, collect_orphan_blob_files, collect_orphan_task_files
+)
+
+def make_session():
+    engine = create_engine("sqlite://")
+    AttachmentBlob.__table__.create(bind=engine)
+    Attachment.__table__.create(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def add_attachment(db, attachment_id, file_path, content_hash=None):
+    db.execute(Attachment.__table__.insert().values(
+        Id=attachment_id, TaskId="t1", UploadedById="u1", FileName="a.txt",
+        FilePath=file_path, FileSize=4, ContentHash=content_hash
+    ))
+    db.commit()
+
+def write_file(path, data=b"data", age=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as target:
+        target.write(data)
+    if age:
+        past = time.time() - age
+        os.utime(path, (past, past))
+
+def test_reconcile_removes_unreferenced_blob_and_fixes_drift(tmp_path):
+    """Test leaked references are corrected and blobs with none left are reclaimed"""
+    db = make_session()
+    kept = store_blob(db, io.BytesIO(b"kept"), blob_dir=str(tmp_path))
+    store_blob(db, io.BytesIO(b"kept"), blob_dir=str(tmp_path))
+    leaked = store_blob(db, io.BytesIO(b"leaked"), blob_dir=str(tmp_path))
+    db.commit()
+    add_attachment(db, "a1", kept["path"], kept["sha256"])
+    
+    report = new_report()
+    reconcile_blob_refcounts(db, report, cutoff=time.time() + 60, batch_size=1, blob_dir=str(tmp_path))
+    
+    blobs = AttachmentBlob.__table__
+    counts = dict(db.execute(select(blobs.c.Hash, blobs.c.RefCount)).all())
+    assert counts == {kept["sha256"]: 1}
+    assert os.path.exists(kept["path"])
+    assert not os.path.exists(leaked["path"])
+    assert report["RefCountsFixed"] == 2
+    assert report["BytesReclaimed"] == len(b"leaked")
+
+def test_reconcile_keeps_the_file_when_the_commit_fails(tmp_path, monkeypatch):
+    """Test a blob whose row delete does not commit keeps its file"""
+    db = make_session()
+    leaked = store_blob(db, io.BytesIO(b"leaked"), blob_dir=str(tmp_path))
+    db.commit()
+    
+    def fail():
+        raise RuntimeError("commit failed")
+    monkeypatch.setattr(db, "commit", fail)
+    
+    report = new_report()
+    with pytest.raises(RuntimeError):
+        reconcile_blob_refcounts(db, report, cutoff=time.time() + 60, blob_dir=str(tmp_path))
+    
+    assert os.path.exists(leaked["path"])
+    assert os.listdir(os.path.dirname(leaked["path"])) == [os.path.basename(leaked["path"])]
+    assert report["FilesRemoved"] == 0
+
+def test_reconcile_spares_blobs_inside_grace_period(tmp_path):
+    """Test a blob whose attachment row may not be committed yet is left alone"""
+    db = make_session()
+    stored = store_blob(db, io.BytesIO(b"fresh"), blob_dir=str(tmp_path))
+    db.commit()
+    
+    report = new_report()
+    reconcile_blob_refcounts(db, report, cutoff=time.time() - 60, blob_dir=str(tmp_path))
+    
+    assert os.path.exists(stored["path"])
+    assert report["RefCountsFixed"] == 0
+
+def test_grace_period_reads_created_at_as_utc(tmp_path, monkeypatch):
+    """Test the grace period does not shift with the server's local time zone"""
+    db = make_session()
+    stored = store_blob(db, io.BytesIO(b"fresh"), blob_dir=str(tmp_path))
+    db.commit()
+    
+    monkeypatch.setenv("TZ", "Etc/GMT-5")
+    time.tzset()
+    try:
+        report = new_report()
+        reconcile_blob_refcounts(db, report, cutoff=time.time() - 60, blob_dir=str(tmp_path))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    
+    assert os.path.exists(stored["path"])
+    assert report["RefCountsFixed"] == 0
+
+def test_collect_orphan_blob_files_removes_only_old_unknown_files(tmp_path):
+    """Test blob files without a row and stale temp files are removed after the grace period"""
+    db = make_session()
+    stored = store_blob(db, io.BytesIO(b"known"), blob_dir=str(tmp_path))
+    db.commit()
+    os.utime(stored["path"], (0, 0))
+    orphan = os.path.join(tmp_path, "ab", "cd", "abcd" + "0" * 60)
+    fresh = os.path.join(tmp_path, "ab", "ef", "abef" + "0" * 60)
+    stale_temp = os.path.join(tmp_path, "tmp", ".upload-old.part")
+    write_file(orphan, age=3600)
+    write_file(fresh)
+    write_file(stale_temp, age=3600)
+    
+    report = new_report()
+    collect_orphan_blob_files(db, report, cutoff=time.time() - 60, blob_dir=str(tmp_path))
+    
+    assert os.path.exists(stored["path"])
+    assert os.path.exists(fresh)
+    assert not os.path.exists(orphan)
+    assert not os.path.exists(stale_temp)
+    assert report["FilesRemoved"] == 2
+
+def test_collect_orphan_blob_files_settles_set_aside_files(tmp_path):
+    """Test a file set aside by a delete that never committed is restored, and other leftovers removed"""
+    db = make_session()
+    kept = store_blob(db, io.BytesIO(b"kept"), blob_dir=str(tmp_path))
+    replaced = store_blob(db, io.BytesIO(b"replaced"), blob_dir=str(tmp_path))
+    db.commit()
+    kept_aside = kept["path"] + RELEASED_SUFFIX + "1"
+    os.replace(kept["path"], kept_aside)
+    replaced_aside = replaced["path"] + RELEASED_SUFFIX + "2"
+    write_file(replaced_aside)
+    released = os.path.join(tmp_path, "ab", "cd", "abcd" + "0" * 60 + RELEASED_SUFFIX + "3")
+    write_file(released)
+    for path in (kept_aside, replaced_aside, released):
+        os.utime(path, (0, 0))
+    
+    report = new_report()
+    collect_orphan_blob_files(db, report, cutoff=time.time() - 60, blob_dir=str(tmp_path))
+    
+    with open(kept["path"], "rb") as blob_file:
+        assert blob_file.read() == b"kept"
+    assert os.path.exists(replaced["path"])
+    assert not any(os.path.exists(path) for path in (kept_aside, replaced_aside, released))
+    assert report["FilesRemoved"] == 2
+
+def test_collect_orphan_task_files_keeps_referenced_and_skipped_dirs(tmp_path):
+    """Test legacy per-task files are removed only when no attachment points at them"""
+    db = make_session()
+    referenced = os.path.join(tmp_path, "t1", "kept.txt")
+    orphan = os.path.join(tmp_path, "t1", "gone.txt")
+    blob_file = os.path.join(tmp_path, "blobs", "ab", "cd", "abcd")
+    for path in (referenced, orphan, blob_file):
+        write_file(path, age=3600)
+    add_attachment(db, "a1", referenced)
+    
+    report = new_report()
+    collect_orphan_task_files(
+        db, report, cutoff=time.time() - 60, dry_run=True,
+        upload_dir=str(tmp_path), skip_dirs=(os.path.join(tmp_path, "blobs"),)
+    )
+    assert os.path.exists(orphan)
+    assert report["FilesRemoved"] == 1
+    
+    collect_orphan_task_files(
+        db, new_report(), cutoff=time.time() - 60,
+        upload_dir=str(tmp_path), skip_dirs=(os.path.join(tmp_path, "blobs"),)
+    )
+    assert os.path.exists(referenced)
+    assert os.path.exists(blob_file)
+    assert not os.path.exists(orphan)
+
+def test_collect_orphan_task_files_matches_real_paths(tmp_path, monkeypatch):
+    """Test relative and symlinked spellings of a stored path still count as references"""
+    real_root = tmp_path / "real"
+    link_root = tmp_path / "link"
+    kept = os.path.join(real_root, "t1", "kept.txt")
+    relative = os.path.join(real_root, "t1", "relative.txt")
+    orphan = os.path.join(real_root, "t1", "gone.txt")
+    for path in (kept, relative, orphan):
+        write_file(path, age=3600)
+    os.symlink(real_root, link_root)
+    monkeypatch.chdir(tmp_path)
+    db = make_session()
+    add_attachment(db, "a1", os.path.join(link_root, "t1", "kept.txt"))
+    add_attachment(db, "a2", os.path.join("real", "t1", "relative.txt"))
+    
+    collect_orphan_task_files(db, new_report(), cutoff=time.time() - 60, upload_dir=str(link_root), skip_dirs=())
+    
+    assert os.path.exists(kept)
+    assert os.path.exists(relative)
+    assert not os.path.exists(orphan)
+
+def test_collect_orphan_task_files_skips_batches_with_no_reference(tmp_path):
+    """Test nothing is removed from a batch when none of its files match an attachment"""
+    db = make_session()
+    files = [os.path.join(tmp_path, "t1", f"file{i}.txt") for i in range(3)]
+    for path in files:
+        write_file(path, age=3600)
+    add_attachment(db, "a1", "/somewhere/else/t1/file0.txt")
+    
+    report = new_report()
+    collect_orphan_task_files(db, report, cutoff=time.time() - 60, upload_dir=str(tmp_path), skip_dirs=())
+    
+    assert all(os.path.exists(path) for path in files)
+    assert report["FilesSkipped"] == 3
+    assert report["FilesRemoved"] == 0
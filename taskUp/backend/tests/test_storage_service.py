@@ -0,0 +1,105 @@
+# taskUp/backend/tests/test_storage_service.py
+import hashlib
+import io
+import os
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.AttachmentBlob import AttachmentBlob
+from API.services.storage_service import stream_to_file, store_blob, release_blob, restore_blob
+
+def test_stream_to_file_reports_size_and_hash(tmp_path):
+    """Test size and SHA-256 are computed while the file is written"""
+    data = os.urandom(5000)
+    dest = os.path.join(tmp_path, "task-1", "file.bin")
+    
+    stored = stream_to_file(io.BytesIO(data), dest, max_size=10000, chunk_size=1024)
+    
+    assert stored["size"] == len(data)
+    assert stored["sha256"] == hashlib.sha256(data).hexdigest()
+    with open(dest, "rb") as written:
+        assert written.read() == data
+
+def test_stream_to_file_rejects_oversized_upload_and_cleans_up(tmp_path):
+    """Test an upload over the limit is aborted without leaving files behind"""
+    dest = os.path.join(tmp_path, "task-1", "file.bin")
+    
+    with pytest.raises(HTTPException) as error:
+        stream_to_file(io.BytesIO(b"x" * 5000), dest, max_size=4096, chunk_size=1024)
+    
+    assert error.value.status_code == 413
+    assert os.listdir(os.path.dirname(dest)) == []
+
+def test_stream_to_file_rejects_declared_size_before_writing(tmp_path):
+    """Test a known oversized upload is rejected before anything is written"""
+    dest = os.path.join(tmp_path, "task-1", "file.bin")
+    
+    with pytest.raises(HTTPException):
+        stream_to_file(io.BytesIO(b""), dest, max_size=10, expected_size=11)
+    
+    assert not os.path.exists(os.path.dirname(dest))
+
+def make_blob_session():
+    engine = create_engine("sqlite://")
+    AttachmentBlob.__table__.create(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def blob_ref_count(db, content_hash):
+    blobs = AttachmentBlob.__table__
+    return db.execute(select(blobs.c.RefCount).where(blobs.c.Hash == content_hash)).scalar()
+
+def test_store_blob_deduplicates_identical_content(tmp_path):
+    """Test the same content is written once and reference counted"""
+    db = make_blob_session()
+    data = b"spec" * 1000
+    
+    first = store_blob(db, io.BytesIO(data), blob_dir=str(tmp_path))
+    second = store_blob(db, io.BytesIO(data), blob_dir=str(tmp_path))
+    db.commit()
+    
+    assert first["path"] == second["path"]
+    assert first["placed"] and not second["placed"]
+    assert blob_ref_count(db, first["sha256"]) == 2
+    assert os.listdir(os.path.join(tmp_path, "tmp")) == []
+
+def test_release_blob_frees_file_only_on_last_reference(tmp_path):
+    """Test the blob file is set aside only with its last reference, and put back on rollback"""
+    db = make_blob_session()
+    stored = store_blob(db, io.BytesIO(b"data"), blob_dir=str(tmp_path))
+    store_blob(db, io.BytesIO(b"data"), blob_dir=str(tmp_path))
+    db.commit()
+    
+    assert release_blob(db, stored["sha256"]) is None
+    db.commit()
+    
+    released = release_blob(db, stored["sha256"])
+    assert released != stored["path"] and os.path.exists(released)
+    assert not os.path.exists(stored["path"])
+    db.rollback()
+    restore_blob(released)
+    assert os.path.exists(stored["path"])
+    assert blob_ref_count(db, stored["sha256"]) == 1
+    
+    released = release_blob(db, stored["sha256"])
+    db.commit()
+    assert blob_ref_count(db, stored["sha256"]) is None
+    os.remove(released)
+    assert not os.path.exists(stored["path"])
+
+def test_upload_between_release_commit_and_removal_keeps_its_file(tmp_path):
+    """Test removing a released blob never deletes the file of a new upload of the same content"""
+    db = make_blob_session()
+    stored = store_blob(db, io.BytesIO(b"data"), blob_dir=str(tmp_path))
+    db.commit()
+    released = release_blob(db, stored["sha256"])
+    db.commit()
+    
+    again = store_blob(db, io.BytesIO(b"data"), blob_dir=str(tmp_path))
+    db.commit()
+    os.remove(released)
+    
+    assert again["placed"]
+    with open(again["path"], "rb") as blob_file:
+        assert blob_file.read() == b"data"
@@ -0,0 +1,106 @@
+# taskUp/backend/tests/test_task_tree_service.py
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.Expense import Expense
+from API.services import task_tree_service
+from API.services.task_tree_service import get_task_tree
+
+def make_session():
+    engine = create_engine("sqlite://")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    Expense.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.execute(text(
+        "CREATE TABLE Task (Id VARCHAR(36) PRIMARY KEY, ParentTaskId VARCHAR(36), Title VARCHAR(100), "
+        "Completed BOOLEAN, BudgetAllocated NUMERIC(12, 2), Deadline DATETIME, CreatedAt DATETIME, IsDeleted BOOLEAN)"
+    ))
+    db.commit()
+    return db, statements
+
+def add_task(db, task_id, parent_id=None, completed=False, budget=0, deleted=False):
+    db.execute(
+        text(
+            "INSERT INTO Task (Id, ParentTaskId, Title, Completed, BudgetAllocated, CreatedAt, IsDeleted) "
+            "VALUES (:id, :parent, :id, :completed, :budget, :created, :deleted)"
+        ),
+        {"id": task_id, "parent": parent_id, "completed": completed, "budget": budget,
+         "created": datetime(2024, 1, 1), "deleted": deleted}
+    )
+
+def add_expense(db, expense_id, task_id, amount):
+    db.execute(Expense.__table__.insert().values(
+        Id=expense_id, TaskId=task_id, Amount=amount, ExpenseDate=datetime(2024, 1, 2), CreatedBy="u1"
+    ))
+
+def test_tree_rolls_up_budget_expenses_and_completion_in_one_query():
+    """Test the nested tree and its totals come from a single statement"""
+    db, statements = make_session()
+    add_task(db, "root", budget=100)
+    add_task(db, "a", "root", completed=True, budget=40)
+    add_task(db, "a1", "a", completed=True, budget=10)
+    add_task(db, "a2", "a", budget=5)
+    add_task(db, "b", "root", budget=20)
+    add_task(db, "gone", "root", completed=True, budget=999, deleted=True)
+    add_task(db, "gone1", "gone", budget=999)
+    add_task(db, "other", budget=7)
+    add_expense(db, "e1", "root", 3)
+    add_expense(db, "e2", "a1", 4)
+    add_expense(db, "e3", "a1", 6)
+    add_expense(db, "e4", "b", 2.5)
+    add_expense(db, "e5", "other", 50)
+    db.commit()
+    statements.clear()
+    
+    tree = get_task_tree(db, "root")
+    
+    assert len(statements) == 1
+    assert [child["TaskId"] for child in tree["Subtasks"]] == ["a", "b"]
+    assert tree["TaskCount"] == 5
+    assert tree["CompletedCount"] == 2
+    assert tree["CompletionPercent"] == 40.0
+    assert tree["TotalBudgetAllocated"] == Decimal("175")
+    assert tree["TotalExpenses"] == Decimal("15.5")
+    
+    branch = tree["Subtasks"][0]
+    assert branch["Depth"] == 1
+    assert branch["ParentTaskId"] == "root"
+    assert [child["TaskId"] for child in branch["Subtasks"]] == ["a1", "a2"]
+    assert branch["TotalBudgetAllocated"] == Decimal("55")
+    assert branch["TotalExpenses"] == Decimal("10")
+    assert branch["CompletionPercent"] == 66.67
+    assert branch["Subtasks"][0]["Expenses"] == Decimal("10")
+
+def test_subtree_of_a_subtask_and_missing_task():
+    """Test a subtask is its own root and unknown or deleted tasks give None"""
+    db, _ = make_session()
+    add_task(db, "root")
+    add_task(db, "a", "root", completed=True)
+    add_task(db, "gone", deleted=True)
+    db.commit()
+    
+    tree = get_task_tree(db, "a")
+    
+    assert tree["ParentTaskId"] is None
+    assert tree["Depth"] == 0
+    assert tree["CompletionPercent"] == 100.0
+    assert tree["Subtasks"] == []
+    assert get_task_tree(db, "missing") is None
+    assert get_task_tree(db, "gone") is None
+
+def test_parent_loop_stops_at_max_depth(monkeypatch):
+    """Test a ParentTaskId cycle neither hangs nor counts a task twice"""
+    monkeypatch.setattr(task_tree_service, "TASK_TREE_MAX_DEPTH", 10)
+    db, _ = make_session()
+    add_task(db, "x", "y", budget=1)
+    add_task(db, "y", "x", budget=2)
+    db.commit()
+    
+    tree = get_task_tree(db, "x")
+    
+    assert tree["TaskCount"] == 2
+    assert tree["TotalBudgetAllocated"] == Decimal("3")
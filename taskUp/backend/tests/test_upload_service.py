@@ -0,0 +1,110 @@
+# taskUp/backend/tests/test_upload_service.py
+import asyncio
+import os
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from API.Models.AttachmentBlob import AttachmentBlob
+from API.services.upload_service import (
+    create_upload_session, get_upload_session, append_upload_chunk, finalize_upload_session,
+    sweep_expired_upload_sessions
+)
+
+async def as_stream(*pieces):
+    for piece in pieces:
+        yield piece
+
+def append(session_dir, session, offset, *pieces):
+    return asyncio.run(append_upload_chunk(
+        session["UploadId"], "task-1", "user-1", offset, as_stream(*pieces), session_dir=session_dir
+    ))
+
+def test_chunks_are_appended_by_offset(tmp_path):
+    """Test chunks advance the offset and a stale offset is refused"""
+    session_dir = str(tmp_path)
+    session = create_upload_session("task-1", "user-1", "spec.pdf", "application/pdf", 10, session_dir)
+    assert session["Offset"] == 0
+    
+    assert append(session_dir, session, 0, b"abc", b"de")["Offset"] == 5
+    
+    with pytest.raises(HTTPException) as error:
+        append(session_dir, session, 0, b"abcde")
+    assert error.value.status_code == 409
+    assert error.value.headers["Upload-Offset"] == "5"
+    
+    assert append(session_dir, session, 5, b"fghij")["Offset"] == 10
+
+def test_chunk_past_declared_size_is_rolled_back(tmp_path):
+    """Test a chunk overrunning the declared size leaves the offset unchanged"""
+    session_dir = str(tmp_path)
+    session = create_upload_session("task-1", "user-1", "a.txt", None, 4, session_dir)
+    append(session_dir, session, 0, b"ab")
+    
+    with pytest.raises(HTTPException) as error:
+        append(session_dir, session, 2, b"cd", b"ef")
+    assert error.value.status_code == 413
+    
+    assert get_upload_session(session["UploadId"], "task-1", "user-1", session_dir)["Offset"] == 2
+
+def test_sessions_are_private_to_their_owner(tmp_path):
+    """Test another user cannot see or write to an upload session"""
+    session_dir = str(tmp_path)
+    session = create_upload_session("task-1", "user-1", "a.txt", None, 4, session_dir)
+    
+    with pytest.raises(HTTPException) as error:
+        get_upload_session(session["UploadId"], "task-1", "user-2", session_dir)
+    assert error.value.status_code == 404
+
+def test_sweeper_removes_only_expired_sessions(tmp_path):
+    """Test abandoned sessions are swept and active ones kept"""
+    session_dir = str(tmp_path)
+    session = create_upload_session("task-1", "user-1", "a.txt", None, 4, session_dir)
+    
+    assert sweep_expired_upload_sessions(session_dir) == 0
+    assert sweep_expired_upload_sessions(session_dir, now=datetime.utcnow() + timedelta(days=2)) == 1
+    assert not os.path.exists(os.path.join(session_dir, session["UploadId"]))
+
+def test_failed_finalize_keeps_the_upload_for_a_retry(tmp_path, monkeypatch):
+    """Test a finalize that fails after the blob is placed leaves the session data intact"""
+    from API.services import task_service, upload_service
+    from API.services.storage_service import place_blob
+    
+    engine = create_engine("sqlite://")
+    AttachmentBlob.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    session_dir = str(tmp_path / "sessions")
+    blob_dir = str(tmp_path / "blobs")
+    os.makedirs(session_dir)
+    session = create_upload_session("task-1", "user-1", "a.txt", None, 4, session_dir)
+    append(session_dir, session, 0, b"abcd")
+    
+    def over_quota(db, task_id, user_id, file_name, file_type, stored):
+        db.rollback()
+        if stored["placed"]:
+            os.remove(stored["path"])
+        raise HTTPException(status_code=413, detail="Storage quota exceeded")
+    
+    monkeypatch.setattr(task_service, "get_task_by_id", lambda db, task_id: object())
+    monkeypatch.setattr(task_service, "create_attachment_record", over_quota)
+    monkeypatch.setattr(
+        upload_service, "place_blob",
+        lambda db, stored, keep_source: place_blob(db, stored, blob_dir, keep_source=keep_source)
+    )
+    
+    with pytest.raises(HTTPException) as error:
+        finalize_upload_session(db, session["UploadId"], "task-1", "user-1", session_dir)
+    assert error.value.status_code == 413
+    
+    retry = get_upload_session(session["UploadId"], "task-1", "user-1", session_dir)
+    assert retry["Offset"] == 4
+    assert db.execute(select(AttachmentBlob.__table__)).all() == []
+    
+    monkeypatch.setattr(task_service, "create_attachment_record", lambda db, *args: args[-1])
+    stored = finalize_upload_session(db, session["UploadId"], "task-1", "user-1", session_dir)
+    
+    with open(stored["path"], "rb") as blob_file:
+        assert blob_file.read() == b"abcd"
+    assert not os.path.exists(os.path.join(session_dir, session["UploadId"]))